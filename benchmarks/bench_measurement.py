@@ -0,0 +1,295 @@
+# Benchmarks for the measurement addon hot paths
+#
+# Run with Blender in background mode from the repository root:
+#
+#     blender --background --factory-startup --python benchmarks/bench_measurement.py -- \
+#         --sizes 1 100 10000 --meshes 20 --polygons 5000 --output bench.json
+#
+# Scenes are generated from a fixed seed, so results are comparable across
+# releases and machines running the same Blender version.
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import measurement  # noqa: E402
+from measurement.constants import NODE_GROUP_NAMES  # noqa: E402
+from measurement.core.asset_index import get_asset_index  # noqa: E402
+from measurement.core.batch import create_measurements  # noqa: E402
+from measurement.core.headless import (  # noqa: E402
+    HeadlessContext,
+    HeadlessView,
+    default_params,
+    make_headless_tool,
+    mouse_event,
+)
+from measurement.core.nodegroup import get_asset_nodegroup  # noqa: E402
+from measurement.core.raycast import scene_raycaster  # noqa: E402
+from measurement.core.evalmesh import evaluated_meshes  # noqa: E402
+from measurement.operators import MOUSE_OT_draw_distance  # noqa: E402
+
+SCENE_EXTENT = 10.0
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Measurement addon benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000],
+                        help="Measurement counts to benchmark")
+    parser.add_argument("--meshes", type=int, default=20, help="Meshes in the scene")
+    parser.add_argument("--polygons", type=int, default=5000,
+                        help="Approximate polygons per mesh")
+    parser.add_argument("--samples", type=int, default=200,
+                        help="Samples for per-call timings")
+    parser.add_argument("--storage", choices=["OBJECTS", "SHEET"], default="OBJECTS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_measurement.json")
+    return parser.parse_args(argv)
+
+
+def summarize(samples):
+    """Timing statistics in milliseconds."""
+    ms = sorted(s * 1000.0 for s in samples)
+    return {
+        "count": len(ms),
+        "min": ms[0],
+        "median": statistics.median(ms),
+        "mean": statistics.fmean(ms),
+        "p95": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        "max": ms[-1],
+    }
+
+
+def time_calls(func, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def time_once(func):
+    start = time.perf_counter()
+    func()
+    return summarize([time.perf_counter() - start])
+
+
+# -- Scene generation -------------------------------------------------------
+
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for mesh in list(bpy.data.meshes):
+        if not mesh.users:
+            bpy.data.meshes.remove(mesh)
+    scene_raycaster.clear()
+    evaluated_meshes.clear()
+
+
+def grid_mesh(name, polygons):
+    """Square grid with about the given number of quads, built with foreach_set."""
+    side = max(1, int(round(polygons ** 0.5)))
+    lin = np.linspace(-0.5, 0.5, side + 1, dtype=np.float32)
+    xs, ys = np.meshgrid(lin, lin)
+    co = np.stack((xs.ravel(), ys.ravel(), np.zeros(xs.size, dtype=np.float32)), axis=1)
+
+    idx = np.arange((side + 1) ** 2, dtype=np.int32).reshape(side + 1, side + 1)
+    quads = np.stack(
+        (idx[:-1, :-1], idx[:-1, 1:], idx[1:, 1:], idx[1:, :-1]), axis=-1
+    ).reshape(-1)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(len(quads))
+    mesh.loops.foreach_set("vertex_index", quads)
+    mesh.polygons.add(side * side)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(quads), 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def build_scene(context, rng, meshes, polygons):
+    """Randomly placed, rotated grids spread over the scene extent."""
+    objects = []
+    for i in range(meshes):
+        obj = bpy.data.objects.new(f"BenchMesh.{i:03d}", grid_mesh(f"BenchMesh.{i:03d}", polygons))
+        obj.location = rng.uniform(-SCENE_EXTENT * 0.5, SCENE_EXTENT * 0.5, 3)
+        obj.location.z *= 0.2
+        obj.rotation_euler = rng.uniform(-0.3, 0.3, 3)
+        obj.scale = (rng.uniform(1.0, 3.0),) * 3
+        context.collection.objects.link(obj)
+        objects.append(obj)
+    context.view_layer.update()
+    return objects
+
+
+def measurement_points(rng, tool_type, count):
+    points = 2 if tool_type == "distance" else 3
+    return rng.uniform(-SCENE_EXTENT * 0.5, SCENE_EXTENT * 0.5, (count, points, 3))
+
+
+# -- Benchmarks -------------------------------------------------------------
+
+
+def bench_asset_nodegroup():
+    """Loading the measurement node groups: present, via the index, full rescan."""
+    results = {}
+    names = list(NODE_GROUP_NAMES.values())
+
+    def remove_groups():
+        for name in names:
+            group = bpy.data.node_groups.get(name)
+            if group is not None and not group.users:
+                bpy.data.node_groups.remove(group)
+
+    def load_all():
+        for name in names:
+            get_asset_nodegroup(name)
+
+    remove_groups()
+    index = get_asset_index()
+    entries = dict(index.entries)
+    index.entries.clear()
+    results["rescan"] = time_once(load_all)
+    index.entries.update(entries)
+
+    remove_groups()
+    results["indexed"] = time_once(load_all)
+    results["loaded"] = time_calls(load_all, [()] * 100)
+    return results
+
+
+def bench_get_location(context, view, samples, rng):
+    """Ray cast + snap for mouse positions spread over the region."""
+    tool = make_headless_tool(MOUSE_OT_draw_distance, context)
+    xs = rng.uniform(0, view.region.width, samples)
+    ys = rng.uniform(0, view.region.height, samples)
+    events = [(context, mouse_event(x, y)) for x, y in zip(xs, ys)]
+    snap_events = [(context, mouse_event(x, y, ctrl=True)) for x, y in zip(xs, ys)]
+
+    results = {}
+    # Without prebuilt BVH trees (as right after the tool starts)
+    scene_raycaster.clear()
+    results["cold"] = time_calls(tool.get_location, events[:1])
+    scene_raycaster.begin(context)
+    scene_raycaster.finish_builds()
+    results["warm"] = time_calls(tool.get_location, events)
+    results["snap_toggled"] = time_calls(tool.get_location, snap_events)
+
+    hits = 0
+    for event_args in events:
+        tool.get_location(*event_args)
+        hits += tool.last_hit is not None
+    results["hit_ratio"] = hits / max(1, len(events))
+    return results
+
+
+def bench_apply_params(context, measurement_obj, samples):
+    """Writing session params to one measurement modifier."""
+    tool = make_headless_tool(MOUSE_OT_draw_distance, context, obj=measurement_obj)
+
+    def write_all():
+        tool.reset_written_values()
+        tool.apply_session_params_to_modifier(context)
+
+    def write_unchanged():
+        tool.apply_session_params_to_modifier(context)
+
+    def write_one():
+        tool.session_params["Offset"] += 0.001
+        tool.apply_session_params_to_modifier(context)
+
+    return {
+        "all_inputs": time_calls(write_all, [()] * samples),
+        "unchanged": time_calls(write_unchanged, [()] * samples),
+        "one_input": time_calls(write_one, [()] * samples),
+    }
+
+
+def bench_evaluation(context, objects, repeat=5):
+    """Re-evaluating every measurement modifier."""
+    def evaluate():
+        for obj in objects:
+            obj.update_tag()
+        context.view_layer.update()
+
+    return time_calls(evaluate, [()] * repeat)
+
+
+def run_size(context, view, args, size):
+    rng = np.random.default_rng(args.seed)
+    clear_scene()
+    build_scene(context, rng, args.meshes, args.polygons)
+
+    params = default_params(context)
+    start = time.perf_counter()
+    objects = create_measurements(
+        context,
+        "distance",
+        measurement_points(rng, "distance", size),
+        params=params,
+        is_relative=False,
+        storage=args.storage,
+    )
+    create_seconds = time.perf_counter() - start
+
+    result = {
+        "create": summarize([create_seconds]),
+        "evaluate": bench_evaluation(context, objects),
+        "get_location": bench_get_location(context, view, args.samples, rng),
+    }
+    if args.storage == "OBJECTS" and objects:
+        result["apply_session_params"] = bench_apply_params(context, objects[0], args.samples)
+    return result
+
+
+def main():
+    args = parse_args()
+    try:
+        measurement.register()
+        registered = True
+    except ValueError:
+        # Already enabled as an installed addon
+        registered = False
+    try:
+        view = HeadlessView()
+        context = HeadlessContext(view)
+
+        report = {
+            "blender": bpy.app.version_string,
+            "addon_version": ".".join(map(str, measurement.bl_info["version"])),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+            "asset_nodegroup": bench_asset_nodegroup(),
+            "sizes": {},
+        }
+        for size in args.sizes:
+            print(f"Benchmarking {size} measurements...")
+            report["sizes"][str(size)] = run_size(context, view, args, size)
+    finally:
+        clear_scene()
+        if registered:
+            measurement.unregister()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
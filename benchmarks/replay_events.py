@@ -0,0 +1,77 @@
+# Replay recorded tool event streams headlessly
+#
+# Record with Preferences > Measure Tools > Record Events, save with
+# "Save Event Recording", then replay against the scene they were made in:
+#
+#     blender --background scene.blend --python benchmarks/replay_events.py -- \
+#         recording.json [more.json ...] --output replay.json --max-deviation 1e-4
+#
+# Exits with status 1 if a replay doesn't finish like the recording did or
+# its geometry deviates from the recorded result by more than --max-deviation.
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import bpy
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import measurement  # noqa: E402
+from measurement.core.replay import load_recording, replay_recording  # noqa: E402
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Replay measurement tool recordings")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Replays per recording (latencies from every run are reported)")
+    parser.add_argument("--max-deviation", type=float, default=None)
+    parser.add_argument("--output", default="replay.json")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    try:
+        measurement.register()
+        registered = True
+    except ValueError:
+        registered = False
+
+    failed = False
+    reports = {}
+    try:
+        for path in args.recordings:
+            recording = load_recording(path)
+            runs = [replay_recording(recording) for _ in range(args.repeat)]
+            reports[path] = runs
+            for run in runs:
+                ok = run["status"] == recording["status"]
+                deviation = run.get("max_deviation")
+                if args.max_deviation is not None and deviation is not None:
+                    ok = ok and deviation <= args.max_deviation
+                failed = failed or not ok
+                print(
+                    f"{path}: {run['status']} "
+                    f"p50 {run['latency'].get('ALL', {}).get('p50', 0.0):.3f} ms "
+                    f"deviation {deviation}"
+                )
+    finally:
+        if registered:
+            measurement.unregister()
+
+    report = {"blender": bpy.app.version_string, "recordings": reports}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
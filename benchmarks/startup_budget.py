@@ -0,0 +1,108 @@
+# Startup cost check for the measurement addon
+#
+# Times importing and registering the addon in a fresh Blender and lists the
+# modules it loads. Run from the repository root:
+#
+#     blender --background --factory-startup --python benchmarks/startup_budget.py -- \
+#         --budget-ms 25 --output startup.json
+#
+# Exits with status 1 if registration takes longer than the budget or loads
+# any module that should only load on first tool use.
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import bpy
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be executed by registration alone
+DEFERRED_MODULES = (
+    "numpy",
+    "gpu_extras",
+    "measurement.core.batch",
+    "measurement.core.blendfile",
+    "measurement.core.drawing",
+    "measurement.core.evalmesh",
+    "measurement.core.export",
+    "measurement.core.headless",
+    "measurement.core.measure_arrays",
+    "measurement.core.nodegroup",
+    "measurement.core.raycast",
+    "measurement.core.replay",
+    "measurement.core.restyle",
+    "measurement.core.screensnap",
+    "measurement.core.sheet",
+    "measurement.core.snapping",
+)
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Measurement addon startup budget")
+    parser.add_argument("--budget-ms", type=float, default=25.0)
+    parser.add_argument("--output", default="startup.json")
+    return parser.parse_args(argv)
+
+
+def is_loaded(module):
+    """False for modules created by lazy_import that haven't been used yet."""
+    return module is not None and type(module).__name__ != "_LazyModule"
+
+
+def main():
+    args = parse_args()
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+    before = {name for name, module in sys.modules.items() if is_loaded(module)}
+
+    start = time.perf_counter()
+    import measurement
+    imported = time.perf_counter()
+    measurement.register()
+    registered = time.perf_counter()
+
+    loaded = sorted(
+        name for name, module in sys.modules.items()
+        if is_loaded(module) and name not in before
+    )
+    deferred_loaded = [
+        name for name in loaded
+        if any(name == d or name.startswith(d + ".") for d in DEFERRED_MODULES)
+    ]
+    measurement.unregister()
+
+    report = {
+        "blender": bpy.app.version_string,
+        "import_ms": (imported - start) * 1000.0,
+        "register_ms": (registered - imported) * 1000.0,
+        "total_ms": (registered - start) * 1000.0,
+        "budget_ms": args.budget_ms,
+        "modules_loaded": loaded,
+        "deferred_modules_loaded": deferred_loaded,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"measurement: import {report['import_ms']:.2f} ms, "
+        f"register {report['register_ms']:.2f} ms "
+        f"(budget {args.budget_ms:.2f} ms), {len(loaded)} modules loaded"
+    )
+    failed = False
+    if report["total_ms"] > args.budget_ms:
+        print("Startup budget exceeded")
+        failed = True
+    if deferred_loaded:
+        print("Loaded at registration: " + ", ".join(deferred_loaded))
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
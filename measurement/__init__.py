@@ -12,15 +12,39 @@ bl_info = {
 
 import bpy
 
-from .preferences import MeasureToolPreferences
-from .operators import MOUSE_OT_draw_distance, MOUSE_OT_draw_angle
+from .core import attach, handlers, keymap, livevalues, prewarm, uistate
+from .preferences import MeasureToolPreferences, get_prefs
+from .properties import MeasureBinding
+from .operators import (
+    MOUSE_OT_draw_distance,
+    MOUSE_OT_draw_angle,
+    MEASURE_OT_import_csv,
+    MEASURE_OT_dump_profile,
+    MEASURE_OT_save_recording,
+    MEASURE_OT_dedupe_nodegroups,
+    MEASURE_OT_restyle,
+    MEASURE_OT_save_style_preset,
+    MEASURE_OT_export_values,
+    menu_func_import,
+    menu_func_export,
+)
+from .panels import VIEW3D_PT_measurement_values
 from .tools import DistanceTool, AngleTool
 
 
 classes = (
     MeasureToolPreferences,
+    MeasureBinding,
     MOUSE_OT_draw_distance,
     MOUSE_OT_draw_angle,
+    MEASURE_OT_import_csv,
+    MEASURE_OT_dump_profile,
+    MEASURE_OT_save_recording,
+    MEASURE_OT_dedupe_nodegroups,
+    MEASURE_OT_restyle,
+    MEASURE_OT_save_style_preset,
+    MEASURE_OT_export_values,
+    VIEW3D_PT_measurement_values,
 )
 
 
@@ -28,13 +52,39 @@ classes = (
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
+    bpy.types.Scene.measure_snap_target = bpy.props.PointerProperty(
+        name="Snap Target",
+        description="Only cast rays against objects in this collection (all visible objects if empty)",
+        type=bpy.types.Collection,
+    )
+    bpy.types.Object.measure_bindings = bpy.props.CollectionProperty(
+        name="Measurement Bindings",
+        description="Measurement points attached to vertices of other objects",
+        type=MeasureBinding,
+    )
     bpy.utils.register_tool(DistanceTool, separator=True)
     bpy.utils.register_tool(AngleTool)
+    keymap.compile_keymaps()
+    handlers.register()
+    uistate.subscribe()
+    bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
+
+    prefs = get_prefs(bpy.context)
+    if prefs and prefs.prewarm_mode == 'ENABLE':
+        prewarm.schedule_prewarm()
 
 
 def unregister():
+    prewarm.cancel_prewarm()
+    bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
+    bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    uistate.unsubscribe()
+    handlers.unregister()
     bpy.utils.unregister_tool(AngleTool)
     bpy.utils.unregister_tool(DistanceTool)
+    del bpy.types.Object.measure_bindings
+    del bpy.types.Scene.measure_snap_target
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
@@ -2,34 +2,61 @@
 
 # Centralized keymap registry: all keybindings in one place
 # Each entry: key, modifiers, description, tools (list of tool types)
-# handler/param fields are optional for implementation reference
+# Entries with events and a handler are compiled by core.keymap into the
+# tools' dispatch tables; the others are only shown by the help overlay.
+#   events: (event type, event value[, handler args...]); value "ANY" matches every value
+#   handler: operator method called as handler(context, event, action)
+#   phase: "idle" or "drawing" to only match in that phase
+#   any_mods: match whatever modifiers are held (e.g. Ctrl to snap)
+#   param: (input name, preference holding the step, "INT" | "FLOAT")
+_SCROLL_EVENTS = [
+    ("WHEELUPMOUSE", "PRESS", 1),
+    ("NUMPAD_PLUS", "PRESS", 1),
+    ("WHEELDOWNMOUSE", "PRESS", -1),
+    ("NUMPAD_MINUS", "PRESS", -1),
+]
+
 KEYMAP_REGISTRY = [
     # Mouse actions
-    {"key": "LMB", "mods": "", "desc": "Set start point", "tools": ["distance"], "phase": "idle"},
-    {"key": "LMB", "mods": "", "desc": "Confirm endpoint", "tools": ["distance"], "phase": "drawing"},
-    {"key": "LMB", "mods": "", "desc": "Set vertex", "tools": ["angle"], "phase": "idle"},
-    {"key": "LMB", "mods": "", "desc": "Set next vertex", "tools": ["angle"], "phase": "drawing"},
+    {"key": "LMB", "mods": "", "desc": "Set start point", "tools": ["distance"], "phase": "idle",
+     "events": [("LEFTMOUSE", "PRESS")], "any_mods": True, "handler": "set_start_point"},
+    {"key": "LMB", "mods": "", "desc": "Confirm endpoint", "tools": ["distance"], "phase": "drawing",
+     "events": [("LEFTMOUSE", "PRESS")], "any_mods": True, "handler": "confirm_endpoint"},
+    {"key": "LMB", "mods": "", "desc": "Set vertex", "tools": ["angle"], "phase": "idle",
+     "events": [("LEFTMOUSE", "PRESS")], "any_mods": True, "handler": "set_vertex"},
+    {"key": "LMB", "mods": "", "desc": "Set next vertex", "tools": ["angle"], "phase": "drawing",
+     "events": [("LEFTMOUSE", "PRESS")], "any_mods": True, "handler": "set_next_vertex"},
     {"key": "Mouse Move", "mods": "", "desc": "Preview position", "tools": ["distance", "angle"]},
     
     # Keyboard - common
-    {"key": "Esc / RMB", "mods": "", "desc": "Cancel", "tools": ["distance", "angle"]},
-    {"key": "H", "mods": "Ctrl+Alt", "desc": "Toggle help", "tools": ["distance", "angle"], "handler": "toggle_help"},
+    {"key": "Esc / RMB", "mods": "", "desc": "Cancel", "tools": ["distance", "angle"],
+     "events": [("ESC", "ANY"), ("RIGHTMOUSE", "ANY")], "any_mods": True, "handler": "cancel_tool"},
+    {"key": "H", "mods": "Ctrl+Alt", "desc": "Toggle help", "tools": ["distance", "angle"],
+     "events": [("H", "PRESS")], "handler": "toggle_help"},
     
     # Keyboard - distance specific
-    {"key": "E", "mods": "", "desc": "Align to surface", "tools": ["distance"], "handler": "align_to_geometry"},
+    {"key": "E", "mods": "", "desc": "Align to surface", "tools": ["distance"],
+     "events": [("E", "PRESS")], "any_mods": True, "handler": "align_endpoint"},
     
     # Keyboard - angle specific
-    {"key": "Backspace", "mods": "", "desc": "Remove last point", "tools": ["angle"], "handler": "remove_point"},
+    {"key": "Backspace", "mods": "", "desc": "Remove last point", "tools": ["angle"],
+     "events": [("BACK_SPACE", "PRESS")], "any_mods": True, "handler": "remove_point"},
     
     # Scroll bindings - Distance
-    {"key": "Scroll", "mods": "Ctrl", "desc": "Adjust Rotation", "tools": ["distance"], "param": ("Rotation", 5, "INT")},
-    {"key": "Scroll", "mods": "Shift", "desc": "Adjust Text Rotation", "tools": ["distance"], "param": ("Text Rotation", 5, "INT")},
-    {"key": "Scroll", "mods": "Alt", "desc": "Adjust Offset", "tools": ["distance"], "param": ("Offset", 0.01, "FLOAT")},
+    {"key": "Scroll", "mods": "Ctrl", "desc": "Adjust Rotation", "tools": ["distance"],
+     "events": _SCROLL_EVENTS, "handler": "adjust_param", "param": ("Rotation", "angle_increment", "INT")},
+    {"key": "Scroll", "mods": "Shift", "desc": "Adjust Text Rotation", "tools": ["distance"],
+     "events": _SCROLL_EVENTS, "handler": "adjust_param", "param": ("Text Rotation", "angle_increment", "INT")},
+    {"key": "Scroll", "mods": "Alt", "desc": "Adjust Offset", "tools": ["distance"],
+     "events": _SCROLL_EVENTS, "handler": "adjust_param", "param": ("Offset", "distance_increment", "FLOAT")},
     
     # Scroll bindings - Angle
-    {"key": "Scroll", "mods": "Ctrl", "desc": "Adjust Radius", "tools": ["angle"], "param": ("Radius", 0.01, "FLOAT")},
-    {"key": "Scroll", "mods": "Shift", "desc": "Adjust Text Rotation", "tools": ["angle"], "param": ("Text Rotation", 5, "INT")},
-    {"key": "Scroll", "mods": "Alt", "desc": "Adjust Offset", "tools": ["angle"], "param": ("Offset", 0.01, "FLOAT")},
+    {"key": "Scroll", "mods": "Ctrl", "desc": "Adjust Radius", "tools": ["angle"],
+     "events": _SCROLL_EVENTS, "handler": "adjust_param", "param": ("Radius", "distance_increment", "FLOAT")},
+    {"key": "Scroll", "mods": "Shift", "desc": "Adjust Text Rotation", "tools": ["angle"],
+     "events": _SCROLL_EVENTS, "handler": "adjust_param", "param": ("Text Rotation", "angle_increment", "INT")},
+    {"key": "Scroll", "mods": "Alt", "desc": "Adjust Offset", "tools": ["angle"],
+     "events": _SCROLL_EVENTS, "handler": "adjust_param", "param": ("Offset", "distance_increment", "FLOAT")},
 ]
 
 
@@ -48,6 +75,102 @@ INT_TYPES = {
 }
 
 
-def get_bindings_for_tool(tool_type):
-    """Filter registry for given tool type."""
-    return [b for b in KEYMAP_REGISTRY if tool_type in b["tools"]]
+def get_bindings_for_tool(tool_type, registry=KEYMAP_REGISTRY):
+    """Filter registry for given tool type (core.keymap caches the result)."""
+    return [b for b in registry if tool_type in b["tools"]]
+
+
+# Sockets whose values are lengths, scaled by the measured length in relative mode
+LENGTH_SCALED_SOCKETS = {
+    "Offset",
+    "Text Size",
+    "Text Gap",
+    "Radius",
+    "Line Thickness",
+    "Ref Line Thickness",
+    "Conn Line Thickness",
+    "Arrowhead Width",
+    "Arrowhead Length",
+    "Point Radius",
+    "Text Thickness",
+}
+
+# Reference angles for different socket groups to maintain perfect proportions
+ANGLE_REF_SOCKETS = {
+    "Radius": 90.0,
+    "Arrowhead Length": 90.0,
+    "Offset": 75.0,
+    "Arrowhead Width": 75.0,
+    "Line Thickness": 75.0,
+    "Ref Line Thickness": 75.0,
+    "Conn Line Thickness": 75.0,
+    "Text Thickness": 75.0,
+    "Point Radius": 75.0,
+    "Text Size": 60.0,
+    "Text Gap": 60.0,
+}
+
+# Enum indices used when a modifier doesn't expose its menu items
+ENUM_FALLBACKS = {
+    "Output Type": {
+        "Grease Pencil": 2,
+        "Mesh": 3,
+    },
+    "Unit_Distance": {
+        "Meter": 2,
+        "Foot": 3,
+        "Inch": 4,
+        "Foot-Inch": 5,
+        "Vector": 6,
+    },
+    "Unit_Angle": {
+        "Degree": 2,
+        "Radian": 3,
+    },
+}
+
+
+# Modifier input socket -> addon preference holding its default value
+SOCKET_TO_PREF = {
+    "Output Type": "default_output_type",
+    "Precision": "default_precision",
+    "Offset": "default_offset",
+    "Substitute Text": "default_substitute_text",
+    "Text Size": "default_text_size",
+    "Text Gap": "default_text_gap",
+    "Text Rotation": "default_text_rotation",
+    "Scale": "default_scale",
+    "Radius": "default_radius",
+    "Rotation": "default_rotation",
+    "Line Thickness": "default_line_thickness",
+    "Ref Line Thickness": "default_ref_line_thickness",
+    "Conn Line Thickness": "default_conn_line_thickness",
+    "Arrowhead Width": "default_arrowhead_width",
+    "Arrowhead Length": "default_arrowhead_length",
+    "Point Radius": "default_point_radius",
+    "Flip Text": "default_flip_text",
+    "Text Thickness": "default_text_thickness",
+    "Outer Angle": "default_outer_angle",
+    # Colors
+    "Arrow Color": "default_arrow_color",
+    "GP Arc Color": "default_arrow_color",
+    "Ref Line Color": "default_ref_line_color",
+    "GP Ref Line Color": "default_ref_line_color",
+    "Conn Line Color": "default_conn_line_color",
+    "GP Main Line Color": "default_conn_line_color",
+}
+
+# Node group used by each measurement type
+NODE_GROUP_NAMES = {
+    "distance": "Distance Measurement",
+    "angle": "Angle Measurement",
+}
+
+# Number of points defining each measurement type
+POINT_COUNTS = {
+    "distance": 2,
+    "angle": 3,
+}
+
+# Rows read from a CSV file before the measurements are created
+CSV_CHUNK_SIZE = 1024
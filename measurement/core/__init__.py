@@ -1,12 +1,22 @@
 # Core module initialization
-from .drawing import draw_callback_px, draw_help_overlay
-from .nodegroup import create_wrapper_modifier, get_asset_nodegroup
-from .snapping import apply_snapping
-
-__all__ = [
-    "draw_callback_px",
-    "draw_help_overlay",
-    "create_wrapper_modifier",
-    "get_asset_nodegroup",
-    "apply_snapping",
-]
+#
+# The re-exported functions are resolved on first access, so importing a
+# core submodule doesn't load the drawing, node group and snapping code.
+from importlib import import_module
+
+_EXPORTS = {
+    "draw_callback_px": ".drawing",
+    "draw_help_overlay": ".drawing",
+    "create_wrapper_modifier": ".nodegroup",
+    "get_asset_nodegroup": ".nodegroup",
+    "apply_snapping": ".snapping",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
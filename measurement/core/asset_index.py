@@ -0,0 +1,129 @@
+# Persistent index of the node groups found in .blend files
+
+import json
+import os
+
+import bpy
+
+from .blendfile import BlendFileError, list_asset_node_groups
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "asset_index.json"
+
+
+def get_index_path():
+    """Return the path of the index file in the user config directory."""
+    config_dir = bpy.utils.user_resource("CONFIG", path="measurement", create=True)
+    return os.path.join(config_dir, INDEX_FILENAME)
+
+
+def stat_key(blend_path):
+    """Return (mtime, size) for a file, or None if it cannot be read."""
+    try:
+        st = os.stat(blend_path)
+    except OSError:
+        return None
+    return st.st_mtime, st.st_size
+
+
+def list_node_groups(blend_path):
+    """Return the asset node group names stored in a .blend file."""
+    try:
+        return list_asset_node_groups(blend_path)
+    except BlendFileError:
+        pass
+    # Fall back to Blender's reader for files the header scanner can't parse
+    with bpy.data.libraries.load(blend_path, assets_only=True) as (data_from, _):
+        return list(data_from.node_groups)
+
+
+class AssetIndex:
+    """Maps .blend files to the node groups they contain.
+
+    Entries are keyed by path and validated against the file's mtime and
+    size, so only files that changed since the last crawl are re-read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.entries = data.get("files", {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": self.entries}, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Could not write asset index {self.path}: {e}")
+
+    def is_fresh(self, blend_path, key=None):
+        entry = self.entries.get(blend_path)
+        if entry is None:
+            return False
+        if key is None:
+            key = stat_key(blend_path)
+        return key is not None and (entry["mtime"], entry["size"]) == key
+
+    def get_node_groups(self, blend_path):
+        """Return node group names for a file, re-reading it only if stale."""
+        key = stat_key(blend_path)
+        if key is None:
+            self.forget(blend_path)
+            return []
+        if self.is_fresh(blend_path, key):
+            return self.entries[blend_path]["node_groups"]
+
+        try:
+            names = list_node_groups(blend_path)
+        except Exception as e:
+            print(f"Could not read {blend_path}: {e}")
+            names = []
+
+        self.entries[blend_path] = {
+            "mtime": key[0],
+            "size": key[1],
+            "node_groups": names,
+        }
+        self.dirty = True
+        return names
+
+    def lookup(self, group_name):
+        """Yield indexed files that still contain the given node group."""
+        for blend_path, entry in list(self.entries.items()):
+            if group_name not in entry["node_groups"]:
+                continue
+            if self.is_fresh(blend_path):
+                yield blend_path
+            else:
+                self.forget(blend_path)
+
+    def forget(self, blend_path):
+        if self.entries.pop(blend_path, None) is not None:
+            self.dirty = True
+
+
+_asset_index = None
+
+
+def get_asset_index():
+    """Return the shared index, loading it from disk on first use."""
+    global _asset_index
+    if _asset_index is None:
+        _asset_index = AssetIndex(get_index_path())
+        _asset_index.load()
+    return _asset_index
@@ -0,0 +1,269 @@
+# Measurement points attached to vertices of other objects
+#
+# A binding (Object.measure_bindings) ties one measurement point to a vertex
+# of a source object's evaluated mesh, plus an offset in the source's local
+# space. A reverse index maps each source object to the measurements bound
+# to it, so a depsgraph update only moves the measurements whose sources
+# changed.
+
+import bpy
+import mathutils
+
+from .handlers import depsgraph_callback, load_callback, undo_callback
+from .lazy import lazy_import
+
+evalmesh = lazy_import(".evalmesh", __package__)
+snapping = lazy_import(".snapping", __package__)
+
+_dependents = {}    # source pointer -> set of measurement pointers
+_sources = {}       # measurement pointer -> set of source pointers
+_measurements = {}  # measurement pointer -> measurement
+_index_built = False
+
+# Object-space positions of the bound vertices of each source's evaluated
+# mesh: source pointer -> {vertex index: Vector}. Kept while only the
+# source's transform changes; dropped when its geometry is updated.
+_source_cos = {}
+
+# Meshes the last callback wrote. They are evaluated in the next depsgraph
+# pass, where the update of the measurements using them is skipped.
+_moved = set()
+
+
+# -- Binding ------------------------------------------------------------------
+
+
+def nearest_vertex(obj, world_loc, depsgraph):
+    """Return (vertex index, local offset) of the evaluated vertex of obj
+    nearest world_loc, or None.
+
+    Uses the cached evaluated geometry the ray cast and snapping work on, so
+    the vertex is one of the mesh that was hit, modifiers included.
+    """
+    geometry = evalmesh.evaluated_meshes.get_object(obj, depsgraph)
+    if geometry is None:
+        return None
+    local = obj.matrix_world.inverted_safe() @ mathutils.Vector(world_loc)
+    found = snapping.nearest_vertex(geometry, local)
+    if found is None:
+        return None
+    index, co = found
+    return index, local - co
+
+
+def find_binding(hit, world_loc, depsgraph=None):
+    """Binding target (source, vertex index, offset) for a ray cast hit, or None.
+
+    hit is the (hit, location, normal, index, object, matrix) tuple of the
+    ray cast the point was placed with.
+    """
+    if not hit or not hit[0]:
+        return None
+    obj = hit[4]
+    if obj is None or obj.type != "MESH":
+        return None
+    if hit[5] is not None and hit[5] != obj.matrix_world:
+        # An instance of obj's geometry; it has no vertices to bind to
+        return None
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+    found = nearest_vertex(obj, world_loc, depsgraph)
+    if found is None:
+        return None
+    return (obj,) + found
+
+
+def bind_points(measurement, bindings):
+    """Attach measurement points: bindings maps point index -> (source, vertex, offset)."""
+    measurement.measure_bindings.clear()
+    for point_index, (source, vertex_index, offset) in sorted(bindings.items()):
+        binding = measurement.measure_bindings.add()
+        binding.point_index = point_index
+        binding.source = source
+        binding.vertex_index = vertex_index
+        binding.offset = offset
+    _index(measurement)
+
+
+def unbind(measurement):
+    measurement.measure_bindings.clear()
+    _unindex(measurement.as_pointer())
+
+
+def dependents(source):
+    """Return the measurement objects bound to source."""
+    _ensure_index()
+    return [_measurements[key] for key in _dependents.get(source.as_pointer(), ())]
+
+
+# -- Reverse index ------------------------------------------------------------
+
+
+def _index(measurement):
+    if not _index_built:
+        return
+    key = measurement.as_pointer()
+    _unindex(key)
+    sources = set()
+    for binding in measurement.measure_bindings:
+        if binding.source is not None:
+            source_key = binding.source.as_pointer()
+            _dependents.setdefault(source_key, set()).add(key)
+            sources.add(source_key)
+            # The cached positions may not include the new vertex
+            _source_cos.pop(source_key, None)
+    if sources:
+        _sources[key] = sources
+        _measurements[key] = measurement
+
+
+def _unindex(key):
+    _measurements.pop(key, None)
+    for source_key in _sources.pop(key, ()):
+        bound = _dependents.get(source_key)
+        if bound is not None:
+            bound.discard(key)
+            if not bound:
+                del _dependents[source_key]
+
+
+def _ensure_index():
+    global _index_built
+    if _index_built:
+        return
+    _index_built = True
+    for obj in bpy.data.objects:
+        if getattr(obj, "measure_bindings", None):
+            _index(obj)
+
+
+def clear_index():
+    global _index_built
+    _dependents.clear()
+    _sources.clear()
+    _measurements.clear()
+    _source_cos.clear()
+    _moved.clear()
+    _index_built = False
+
+
+# -- Updates ------------------------------------------------------------------
+
+
+def _read_positions(source, depsgraph):
+    """Object-space positions of the evaluated vertices bound on source."""
+    indices = set()
+    for key in _dependents.get(source.as_pointer(), ()):
+        measurement = _valid_measurement(key)
+        if measurement is None:
+            continue
+        for binding in measurement.measure_bindings:
+            if binding.source == source:
+                indices.add(binding.vertex_index)
+
+    source_eval = source.evaluated_get(depsgraph)
+    try:
+        mesh = source_eval.to_mesh()
+    except RuntimeError:
+        return {}
+    if mesh is None:
+        return {}
+    try:
+        verts = mesh.vertices
+        return {i: verts[i].co.copy() for i in indices if i < len(verts)}
+    finally:
+        source_eval.to_mesh_clear()
+
+
+def _bound_positions(source, depsgraph):
+    key = source.as_pointer()
+    positions = _source_cos.get(key)
+    if positions is None:
+        positions = _source_cos[key] = _read_positions(source, depsgraph)
+    return positions
+
+
+def update_measurement(measurement, depsgraph):
+    """Move the bound points of a measurement to their sources. Returns True if moved.
+
+    Positions come from the evaluated sources, so edit mode changes and
+    modifiers are followed. This runs from depsgraph_update_post and writes
+    the measurement's mesh, which causes one more depsgraph pass; the
+    callback skips the measurements whose mesh it wrote in the pass before.
+    """
+    mesh = measurement.data
+    inv = measurement.matrix_world.inverted_safe()
+    moved = False
+    for binding in measurement.measure_bindings:
+        source = binding.source
+        if source is None or source.type != "MESH":
+            continue
+        co = _bound_positions(source, depsgraph).get(binding.vertex_index)
+        if co is None or binding.point_index >= len(mesh.vertices):
+            continue
+        local_src = co + mathutils.Vector(binding.offset)
+        co = inv @ (source.matrix_world @ local_src)
+        point = mesh.vertices[binding.point_index]
+        if (point.co - co).length_squared > 1e-12:
+            point.co = co
+            moved = True
+    if moved:
+        mesh.update()
+    return moved
+
+
+@depsgraph_callback
+def update_attached_measurements(scene, depsgraph):
+    global _moved
+    moved, _moved = _moved, set()
+    _ensure_index()
+
+    stale = set()
+    for update in depsgraph.updates:
+        if not (update.is_updated_geometry or update.is_updated_transform):
+            continue
+        id_data = update.id.original
+        if not isinstance(id_data, bpy.types.Object):
+            continue
+        key = id_data.as_pointer()
+        if key not in _sources and getattr(id_data, "measure_bindings", None):
+            # Not indexed yet, e.g. duplicated from a bound measurement
+            _index(id_data)
+        if key in _sources and id_data.data.as_pointer() not in moved:
+            # Moving a measurement itself re-applies its bindings
+            stale.add(key)
+        if key in _dependents:
+            if update.is_updated_geometry:
+                _source_cos.pop(key, None)
+            stale.update(_dependents[key])
+
+    for key in stale:
+        measurement = _valid_measurement(key)
+        if measurement is None:
+            _unindex(key)
+            continue
+        mesh_key = measurement.data.as_pointer()
+        if mesh_key in _moved:
+            # Linked duplicates share a mesh; only one of them can place it
+            continue
+        if update_measurement(measurement, depsgraph):
+            measurement.update_tag()
+            _moved.add(mesh_key)
+
+
+def _valid_measurement(key):
+    """Return the indexed measurement object, or None if it was removed."""
+    measurement = _measurements.get(key)
+    try:
+        if measurement is None or measurement.name not in bpy.data.objects:
+            return None
+    except ReferenceError:
+        return None
+    return measurement
+
+
+@load_callback
+@undo_callback
+def reset_attach_index():
+    """Undo and file load replace the objects; rebuild the index on next use."""
+    clear_index()
@@ -0,0 +1,196 @@
+# Batch creation of measurements from arrays of points
+#
+# Usable from scripts, including `blender --background`:
+#
+#     from measurement.core.batch import create_distance_measurements
+#     create_distance_measurements(bpy.context, starts, ends)
+
+import csv
+
+import bpy
+import mathutils
+import numpy as np
+
+from ..constants import CSV_CHUNK_SIZE, NODE_GROUP_NAMES, POINT_COUNTS
+from ..preferences import get_prefs
+from .nodegroup import create_wrapper_modifier, get_asset_nodegroup
+from .params import apply_params_to_modifier, session_params_from_prefs
+from .sheet import add_measurements, get_sheet
+
+
+def resolve_storage(context, storage=None):
+    """Return 'OBJECTS' or 'SHEET', defaulting to the addon preference."""
+    if storage is not None:
+        return storage
+    prefs = get_prefs(context)
+    return prefs.storage_mode if prefs else 'OBJECTS'
+
+
+def resolve_params(context, params=None, is_relative=None):
+    """Fill in session params and relative mode from the addon preferences."""
+    if params is not None and is_relative is not None:
+        return params, is_relative
+    prefs = get_prefs(context)
+    if params is None:
+        params = session_params_from_prefs(prefs) if prefs else {}
+    if is_relative is None:
+        is_relative = prefs.measurement_mode == 'RELATIVE' if prefs else False
+    return params, is_relative
+
+
+def build_measurement_mesh(name, points):
+    """Create a polyline mesh through points (K, 3) using foreach_set."""
+    count = len(points)
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(count)
+    mesh.edges.add(count - 1)
+    mesh.vertices.foreach_set("co", points.ravel())
+    edges = np.repeat(np.arange(count, dtype=np.int32), 2)[1:-1]
+    mesh.edges.foreach_set("vertices", edges)
+    mesh.update()
+    return mesh
+
+
+def create_measurements(
+    context,
+    tool_type,
+    points,
+    params=None,
+    is_relative=None,
+    collection=None,
+    update=True,
+    storage=None,
+    node_group=None,
+):
+    """Create one measurement object per row of points.
+
+    points is array-like with shape (N, 2, 3) for "distance" or (N, 3, 3)
+    for "angle", in world space. params defaults to the preference defaults.
+    With storage="SHEET" the measurements are appended to the scene's
+    measurement sheet instead; storage defaults to the preference.
+    node_group is the measurement node group to wrap, looked up by name if
+    None. Returns the list of created objects (the sheet, in sheet mode).
+    """
+    count = POINT_COUNTS[tool_type]
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim != 3 or points.shape[1:] != (count, 3):
+        raise ValueError(
+            f"{tool_type} measurements need points of shape (N, {count}, 3), "
+            f"got {points.shape}"
+        )
+
+    params, is_relative = resolve_params(context, params, is_relative)
+
+    if resolve_storage(context, storage) == 'SHEET':
+        sheet = get_sheet(context, collection)
+        if sheet is not None:
+            add_measurements(sheet, tool_type, points, params, is_relative)
+            if update:
+                context.view_layer.update()
+            return [sheet]
+        print("Measurement sheet unavailable, creating separate objects.")
+
+    name = NODE_GROUP_NAMES[tool_type]
+    target_group = node_group if node_group is not None else get_asset_nodegroup(name)
+    if collection is None:
+        collection = context.collection
+
+    objects = []
+    for row in points:
+        mesh = build_measurement_mesh(name, row)
+        obj = bpy.data.objects.new(name, mesh)
+        collection.objects.link(obj)
+        if target_group:
+            mod = create_wrapper_modifier(obj, target_group)
+            world = [mathutils.Vector(p) for p in row.tolist()]
+            apply_params_to_modifier(mod, params, tool_type, world, is_relative)
+        objects.append(obj)
+
+    if update:
+        context.view_layer.update()
+    return objects
+
+
+def create_distance_measurements(context, starts, ends, **kwargs):
+    """Create distance measurements between matching rows of starts and ends."""
+    points = np.stack((np.asarray(starts), np.asarray(ends)), axis=1)
+    return create_measurements(context, "distance", points, **kwargs)
+
+
+def create_angle_measurements(context, first, vertices, last, **kwargs):
+    """Create angle measurements first -> vertex (apex) -> last."""
+    points = np.stack(
+        (np.asarray(first), np.asarray(vertices), np.asarray(last)), axis=1
+    )
+    return create_measurements(context, "angle", points, **kwargs)
+
+
+def iter_csv_points(file, chunk_size=CSV_CHUNK_SIZE):
+    """Stream (tool_type, points) chunks from a CSV file object.
+
+    Each row holds 6 values (x0, y0, z0, x1, y1, z1) for a distance or 9
+    values for an angle (first point, apex, last point). Rows that aren't
+    numeric, such as a header, are skipped.
+    """
+    sizes = {count * 3: tool_type for tool_type, count in POINT_COUNTS.items()}
+    buffers = {tool_type: [] for tool_type in POINT_COUNTS}
+
+    for row in csv.reader(file):
+        values = [v for v in row if v.strip()]
+        tool_type = sizes.get(len(values))
+        if tool_type is None:
+            continue
+        try:
+            buffers[tool_type].append([float(v) for v in values])
+        except ValueError:
+            continue
+        if len(buffers[tool_type]) >= chunk_size:
+            yield tool_type, _to_points(tool_type, buffers[tool_type])
+            buffers[tool_type] = []
+
+    for tool_type, rows in buffers.items():
+        if rows:
+            yield tool_type, _to_points(tool_type, rows)
+
+
+def _to_points(tool_type, rows):
+    return np.array(rows, dtype=np.float32).reshape(-1, POINT_COUNTS[tool_type], 3)
+
+
+def import_measurements_csv(
+    context,
+    filepath,
+    params=None,
+    is_relative=None,
+    collection=None,
+    chunk_size=CSV_CHUNK_SIZE,
+    storage=None,
+):
+    """Create measurements for every row of a CSV file.
+
+    The node groups and session params are resolved once and the view layer
+    is updated once at the end. Returns the number of measurements created.
+    """
+    params, is_relative = resolve_params(context, params, is_relative)
+    storage = resolve_storage(context, storage)
+
+    node_groups = {}  # tool type -> node group, looked up on its first chunk
+    created = 0
+    with open(filepath, newline="", encoding="utf-8") as f:
+        for tool_type, points in iter_csv_points(f, chunk_size):
+            if storage != 'SHEET' and tool_type not in node_groups:
+                node_groups[tool_type] = get_asset_nodegroup(NODE_GROUP_NAMES[tool_type])
+            create_measurements(
+                context,
+                tool_type,
+                points,
+                params=params,
+                is_relative=is_relative,
+                collection=collection,
+                update=False,
+                storage=storage,
+                node_group=node_groups.get(tool_type),
+            )
+            created += len(points)
+    context.view_layer.update()
+    return created
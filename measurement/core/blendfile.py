@@ -0,0 +1,255 @@
+# Minimal .blend file reader for listing node groups without bpy
+#
+# Only block headers and the SDNA catalogue are parsed. Uncompressed files
+# are read in place through a memory map; compressed files are decompressed
+# to memory first. This module must not import bpy so it can be used (and
+# tested) outside Blender.
+
+import gzip
+import mmap
+import struct
+from collections import namedtuple
+
+NodeTreeInfo = namedtuple("NodeTreeInfo", ["name", "idname", "is_asset"])
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+CODE_ENDB = b"ENDB"
+CODE_DNA1 = b"DNA1"
+CODE_NODETREE = b"NT\x00\x00"
+
+
+class BlendFileError(Exception):
+    """Raised when a file is not a .blend file this reader understands."""
+
+
+def _decompress_zstd(data):
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd.decompress(data)
+    except ImportError:
+        pass
+    try:
+        import zstandard  # Bundled with Blender
+    except ImportError:
+        raise BlendFileError("zstd-compressed file and no zstd module available")
+    reader = zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True)
+    return reader.read()
+
+
+class _Layout:
+    """File header information needed to decode block headers."""
+
+    def __init__(self, buf):
+        if len(buf) < 12 or bytes(buf[:7]) != b"BLENDER":
+            raise BlendFileError("Not a .blend file")
+
+        if chr(buf[7]).isdigit():
+            # Blender 5.0+: "BLENDER" + header size + '-' + format + 'v' + version
+            header_size = int(bytes(buf[7:9]))
+            file_format = int(bytes(buf[10:12]))
+            if file_format != 1:
+                raise BlendFileError(f"Unsupported file format version {file_format}")
+            self.header_size = header_size
+            self.pointer_size = 8
+            self.endian = "<" if buf[12:13] == b"v" else ">"
+            # code, SDNAnr, old pointer, len, nr
+            self.bhead = struct.Struct(self.endian + "4siQqq")
+            self.bhead_fields = (0, 3, 1)
+        else:
+            self.header_size = 12
+            self.pointer_size = 8 if buf[7:8] == b"-" else 4
+            self.endian = "<" if buf[8:9] == b"v" else ">"
+            ptr = "Q" if self.pointer_size == 8 else "I"
+            # code, len, old pointer, SDNAnr, nr
+            self.bhead = struct.Struct(self.endian + "4si" + ptr + "ii")
+            self.bhead_fields = (0, 1, 3)
+
+    def iter_blocks(self, buf):
+        """Yield (code, data_offset, length, sdna_index) for every block."""
+        offset = self.header_size
+        size = len(buf)
+        bhead = self.bhead
+        i_code, i_len, i_sdna = self.bhead_fields
+        while offset + bhead.size <= size:
+            fields = bhead.unpack_from(buf, offset)
+            code = fields[i_code]
+            if code == CODE_ENDB:
+                return
+            length = fields[i_len]
+            data_offset = offset + bhead.size
+            if length < 0 or data_offset + length > size:
+                raise BlendFileError("Truncated block")
+            yield code, data_offset, length, fields[i_sdna]
+            offset = data_offset + length
+        # Every complete file ends with an ENDB block
+        raise BlendFileError("Truncated file")
+
+
+class _SDNA:
+    """Struct catalogue from the DNA1 block, used to find member offsets."""
+
+    def __init__(self, buf, offset, length, layout):
+        end = offset + length
+        endian = layout.endian
+        self.pointer_size = layout.pointer_size
+
+        def expect(tag, pos):
+            # Sections are 4-byte aligned relative to the start of the block
+            pos = offset + ((pos - offset + 3) & ~3)
+            if bytes(buf[pos:pos + 4]) != tag:
+                raise BlendFileError(f"Malformed SDNA: expected {tag!r}")
+            return pos + 4
+
+        def read_strings(pos):
+            (count,) = struct.unpack_from(endian + "i", buf, pos)
+            pos += 4
+            strings = []
+            for _ in range(count):
+                stop = buf.find(b"\x00", pos, end)
+                if stop < 0:
+                    raise BlendFileError("Malformed SDNA string table")
+                strings.append(bytes(buf[pos:stop]).decode("ascii", "replace"))
+                pos = stop + 1
+            return strings, pos
+
+        if bytes(buf[offset:offset + 4]) != b"SDNA":
+            raise BlendFileError("Malformed SDNA header")
+        pos = expect(b"NAME", offset + 4)
+        self.names, pos = read_strings(pos)
+        pos = expect(b"TYPE", pos)
+        self.types, pos = read_strings(pos)
+        pos = expect(b"TLEN", pos)
+        self.type_lengths = struct.unpack_from(
+            f"{endian}{len(self.types)}h", buf, pos
+        )
+        pos += 2 * len(self.types)
+        pos = expect(b"STRC", pos)
+        (count,) = struct.unpack_from(endian + "i", buf, pos)
+        pos += 4
+
+        self.structs = []
+        self.struct_by_type = {}
+        for index in range(count):
+            type_index, field_count = struct.unpack_from(endian + "hh", buf, pos)
+            pos += 4
+            fields = struct.unpack_from(f"{endian}{2 * field_count}h", buf, pos)
+            pos += 4 * field_count
+            self.structs.append((type_index, fields))
+            self.struct_by_type[self.types[type_index]] = index
+
+    def field_size(self, type_index, name):
+        if name.startswith("*") or name.startswith("(*"):
+            size = self.pointer_size
+        else:
+            size = self.type_lengths[type_index]
+        count = 1
+        for part in name.split("[")[1:]:
+            count *= int(part.rstrip("]"))
+        return size * count
+
+    def offsets(self, struct_name):
+        """Return {member name without array suffix: (offset, size)}."""
+        index = self.struct_by_type.get(struct_name)
+        if index is None:
+            raise BlendFileError(f"Struct {struct_name} missing from SDNA")
+        _, fields = self.structs[index]
+        result = {}
+        offset = 0
+        for i in range(0, len(fields), 2):
+            type_index, name_index = fields[i], fields[i + 1]
+            name = self.names[name_index]
+            size = self.field_size(type_index, name)
+            key = name.split("[")[0]
+            result[key] = (offset, size)
+            offset += size
+        return result
+
+
+def _read_cstring(buf, offset, size):
+    raw = bytes(buf[offset:offset + size])
+    return raw.split(b"\x00", 1)[0].decode("utf-8", "replace")
+
+
+def _scan_buffer(buf):
+    layout = _Layout(buf)
+    tree_blocks = []
+    sdna = None
+    for code, data_offset, length, _ in layout.iter_blocks(buf):
+        if code == CODE_NODETREE:
+            tree_blocks.append((data_offset, length))
+        elif code == CODE_DNA1:
+            sdna = _SDNA(buf, data_offset, length, layout)
+
+    if not tree_blocks:
+        return []
+    if sdna is None:
+        raise BlendFileError("No SDNA block found")
+
+    # bNodeTree starts with its ID, so ID member offsets apply directly
+    id_fields = sdna.offsets("ID")
+    tree_fields = sdna.offsets("bNodeTree")
+    name_offset, name_size = id_fields["name"]
+    asset_field = id_fields.get("*asset_data")
+    idname_field = tree_fields.get("idname")
+    ptr_format = layout.endian + ("Q" if layout.pointer_size == 8 else "I")
+
+    trees = []
+    for data_offset, length in tree_blocks:
+        if length < name_offset + name_size:
+            continue
+        # Skip the two-character ID code prefix ("NT")
+        name = _read_cstring(buf, data_offset + name_offset, name_size)[2:]
+        is_asset = False
+        if asset_field is not None:
+            (asset_ptr,) = struct.unpack_from(
+                ptr_format, buf, data_offset + asset_field[0]
+            )
+            is_asset = asset_ptr != 0
+        idname = ""
+        if idname_field is not None and length >= sum(idname_field):
+            idname = _read_cstring(buf, data_offset + idname_field[0], idname_field[1])
+        trees.append(NodeTreeInfo(name, idname, is_asset))
+    return trees
+
+
+def _scan(buf):
+    try:
+        return _scan_buffer(buf)
+    except (struct.error, ValueError, IndexError) as e:
+        raise BlendFileError(f"Malformed file: {e}")
+
+
+def read_node_trees(filepath):
+    """List the node group IDs stored in a .blend file.
+
+    Handles uncompressed, gzip and zstd compressed files. Raises
+    BlendFileError if the file cannot be parsed.
+    """
+    with open(filepath, "rb") as f:
+        magic = f.read(4)
+        f.seek(0)
+        if magic[:2] == GZIP_MAGIC:
+            try:
+                with gzip.GzipFile(fileobj=f) as gz:
+                    data = gz.read()
+            except (OSError, EOFError) as e:
+                raise BlendFileError(f"Corrupt gzip stream: {e}")
+            return _scan(data)
+        if magic == ZSTD_MAGIC:
+            return _scan(_decompress_zstd(f.read()))
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise BlendFileError("Empty file")
+        try:
+            return _scan(mapped)
+        finally:
+            mapped.close()
+
+
+def list_asset_node_groups(filepath):
+    """Return the names of node groups marked as assets in a .blend file."""
+    return [tree.name for tree in read_node_trees(filepath) if tree.is_asset]
@@ -3,9 +3,12 @@
 import bpy
 import blf
 import gpu
+from bpy_extras import view3d_utils
 from gpu_extras.batch import batch_for_shader
 
-from ..constants import get_bindings_for_tool
+from . import keymap, uistate
+from .measure import actual_length, angle_info, world_points
+from .units import format_angle, format_length
 
 
 # Global list of registered draw handlers to prevent leaks during undo/redo/cancellation
@@ -82,6 +85,77 @@ def draw_callback_px(self, context):
         print(f"Draw Error: {e}")
 
 
+def get_preview_label(self, points):
+    """Text shown by the drag preview overlay."""
+    params = self.session_params
+    substitute = params.get("Substitute Text")
+    if substitute:
+        return substitute
+    precision = int(params.get("Precision", 2))
+    if self.tool_type == "angle":
+        angle, _ = angle_info(points)
+        if params.get("Outer Angle"):
+            angle = 360.0 - angle
+        return format_angle(angle, params.get("Unit_Angle", "Degree"), precision)
+    length = actual_length(points, self.tool_type) * params.get("Scale", 1.0)
+    return format_length(length, params.get("Unit_Distance", "Meter"), precision)
+
+
+def draw_preview_overlay(self, context):
+    """Draw a cheap line-and-value preview while the node group is hidden."""
+    try:
+        _ = self.bl_idname
+    except ReferenceError:
+        cleanup_dead_handlers(self)
+        return
+    obj = self.obj
+    if not obj or len(obj.data.vertices) < 2:
+        return
+    region = context.region
+    rv3d = context.region_data
+    if not rv3d:
+        return
+
+    try:
+        points = world_points(obj)
+        coords = [view3d_utils.location_3d_to_region_2d(region, rv3d, p) for p in points]
+        if any(c is None for c in coords):
+            return
+
+        shader = gpu.shader.from_builtin("UNIFORM_COLOR")
+        batch = batch_for_shader(
+            shader, "LINE_STRIP", {"pos": [(c.x, c.y, 0.0) for c in coords]}
+        )
+        gpu.state.blend_set("ALPHA")
+        gpu.state.line_width_set(2.0)
+        shader.bind()
+        shader.uniform_float("color", (1.0, 0.5, 0.0, 0.9))
+        batch.draw(shader)
+        gpu.state.line_width_set(1.0)
+        gpu.state.blend_set("NONE")
+
+        # Label at the line midpoint (distance) or the apex (angle)
+        anchor = coords[1] if self.tool_type == "angle" else (coords[0] + coords[1]) / 2
+        label = get_preview_label(self, points)
+        font_id = 0
+        blf.size(font_id, 16)
+        blf.color(font_id, 1.0, 1.0, 1.0, 1.0)
+        width, _ = blf.dimensions(font_id, label)
+        blf.position(font_id, anchor.x - width / 2, anchor.y + 10, 0)
+        blf.draw(font_id, label)
+    except Exception as e:
+        print(f"Preview Draw Error: {e}")
+
+
+def draw_profile_line(profiler, x, y, font_size):
+    """Draw the tool phase timings on one line."""
+    font_id = 0
+    blf.size(font_id, font_size - 2)
+    blf.color(font_id, 0.55, 0.9, 0.55, 1.0)
+    blf.position(font_id, x, y, 0)
+    blf.draw(font_id, profiler.overlay_text())
+
+
 def draw_help_overlay(self, context):
     """Draw help text overlay showing keybindings for active tool."""
     try:
@@ -97,37 +171,26 @@ def draw_help_overlay(self, context):
         cleanup_dead_handlers(self)
         return
     
-    # Get position settings from addon preferences
-    prefs = context.preferences.addons.get("measurement")
-    if prefs:
-        prefs = prefs.preferences
-        pos_x = prefs.help_pos_x
-        pos_y = prefs.help_pos_y
-        show_help = prefs.show_help_overlay
-    else:
-        pos_x = 20
-        pos_y = 20  # Bottom-left default
-        show_help = True
-    
-    if not show_help:
-        return
+    # Position settings from the cached addon preferences
+    prefs = uistate.prefs_snapshot(context)
+    pos_x = prefs.help_pos_x
+    pos_y = prefs.help_pos_y
+    show_help = prefs.show_help_overlay
     
     font_id = 0
     font_size = 14
     line_height = 22
     key_col_width = 130
+
+    profiler = getattr(self, "profiler", None)
+    if not show_help:
+        if profiler:
+            draw_profile_line(profiler, pos_x, pos_y, font_size)
+        return
     
-    # Get bindings for current tool
-    bindings = get_bindings_for_tool(self.tool_type)
-    
-    # Deduplicate entries with same key+mods (keep first occurrence)
-    seen = set()
-    unique_bindings = []
-    for b in bindings:
-        key_id = (b["key"], b["mods"])
-        if key_id not in seen:
-            seen.add(key_id)
-            unique_bindings.append(b)
+    # Bindings for current tool, deduplicated by key+mods, from the
+    # same compiled keymap the tool dispatches events with
+    unique_bindings = keymap.get_keymap(self.tool_type).help
     
     # Calculate total height (draw from bottom up)
     total_lines = len(unique_bindings) + 2  # +2 for header and separator
@@ -135,6 +198,9 @@ def draw_help_overlay(self, context):
     
     # Start position (bottom-left by default)
     y_start = pos_y + total_height
+
+    if profiler:
+        draw_profile_line(profiler, pos_x, y_start + line_height * 1.2, font_size)
     
     # Draw header
     blf.size(font_id, font_size + 2)
@@ -0,0 +1,153 @@
+# Evaluated geometry of snap and ray cast targets
+#
+# Modifiers and geometry nodes (including instances) change what is drawn
+# in the viewport, so snapping must use the evaluated mesh rather than
+# obj.data. Converting an evaluated object with to_mesh() is expensive, so
+# its arrays are kept per object (or per instanced geometry) until the
+# object's geometry is updated again.
+
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from .handlers import depsgraph_callback, load_callback
+
+
+class EvaluatedMesh:
+    """Object-space arrays of an evaluated mesh.
+
+    The BVH tree (indices are loop triangles, mapped back with tri_polys) and
+    the snap tree are built on first use.
+    """
+
+    def __init__(self, mesh):
+        nv = len(mesh.vertices)
+        ne = len(mesh.edges)
+        nf = len(mesh.polygons)
+
+        self.co = np.empty(nv * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", self.co)
+        self.co.shape = (nv, 3)
+
+        self.edge_verts = np.empty(ne * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", self.edge_verts)
+        self.edge_verts.shape = (ne, 2)
+
+        self.centers = np.empty(nf * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("center", self.centers)
+        self.centers.shape = (nf, 3)
+
+        if hasattr(mesh, "calc_loop_triangles"):
+            mesh.calc_loop_triangles()
+        nt = len(mesh.loop_triangles)
+        self.tris = np.empty(nt * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", self.tris)
+        self.tris.shape = (nt, 3)
+        self.tri_polys = np.empty(nt, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("polygon_index", self.tri_polys)
+
+        self._bvh = None
+        self.snap_tree = None
+
+    @classmethod
+    def from_object(cls, obj_eval):
+        """Convert an evaluated object; None if it has no mesh geometry."""
+        try:
+            mesh = obj_eval.to_mesh()
+        except RuntimeError:
+            return None
+        if mesh is None:
+            return None
+        try:
+            return cls(mesh)
+        finally:
+            obj_eval.to_mesh_clear()
+
+    def bound_corners(self):
+        """(8, 3) corners of the object-space bounding box."""
+        if not len(self.co):
+            return np.zeros((8, 3))
+        lo = self.co.min(axis=0)
+        hi = self.co.max(axis=0)
+        return np.array(
+            [(x, y, z) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])],
+            dtype=np.float64,
+        )
+
+    @property
+    def bvh(self):
+        if self._bvh is None:
+            self._bvh = BVHTree.FromPolygons(self.co.tolist(), self.tris.tolist())
+        return self._bvh
+
+    def ray_cast(self, origin, direction):
+        """BVH ray cast; returns (location, normal, polygon index) or None."""
+        loc, normal, index, _ = self.bvh.ray_cast(origin, direction)
+        if loc is None:
+            return None
+        return loc, normal, int(self.tri_polys[index])
+
+
+class EvaluatedMeshCache:
+    """EvaluatedMeshes keyed by object name, or (instancer name, geometry) for instances."""
+
+    def __init__(self):
+        self._meshes = {}
+        self._data_names = {}  # object name -> mesh datablock name
+
+    @staticmethod
+    def owner(key):
+        return key[0] if isinstance(key, tuple) else key
+
+    def get(self, key, obj_eval=None):
+        """Return the cached geometry for key, converting obj_eval on a miss."""
+        entry = self._meshes.get(key)
+        if entry is None and obj_eval is not None:
+            entry = EvaluatedMesh.from_object(obj_eval)
+            if entry is not None:
+                self._meshes[key] = entry
+                data = getattr(obj_eval.original, "data", None)
+                if not isinstance(key, tuple) and data is not None:
+                    self._data_names[key] = data.name
+        return entry
+
+    def get_object(self, obj, depsgraph):
+        """Evaluated geometry of a scene object."""
+        entry = self._meshes.get(obj.name)
+        if entry is None:
+            entry = self.get(obj.name, obj.evaluated_get(depsgraph))
+        return entry
+
+    def invalidate(self, obj_name):
+        """Drop an object's geometry and the geometry it instances."""
+        for key in [k for k in self._meshes if self.owner(k) == obj_name]:
+            del self._meshes[key]
+        self._data_names.pop(obj_name, None)
+
+    def invalidate_data(self, data_name):
+        for obj_name in [o for o, d in self._data_names.items() if d == data_name]:
+            self.invalidate(obj_name)
+
+    def clear(self):
+        self._meshes.clear()
+        self._data_names.clear()
+
+
+evaluated_meshes = EvaluatedMeshCache()
+
+
+@depsgraph_callback
+def invalidate_evaluated_meshes(scene, depsgraph):
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        id_data = update.id.original
+        id_type = getattr(id_data, "id_type", None)
+        if id_type == "OBJECT":
+            evaluated_meshes.invalidate(id_data.name)
+        elif id_type in {"MESH", "CURVE"}:
+            evaluated_meshes.invalidate_data(id_data.name)
+
+
+@load_callback
+def clear_evaluated_meshes():
+    evaluated_meshes.clear()
@@ -0,0 +1,81 @@
+# Event scheduling for the modal measurement operators
+
+import time
+from collections import namedtuple
+
+EventSnapshot = namedtuple(
+    "EventSnapshot",
+    ["type", "value", "ctrl", "shift", "alt", "oskey", "mouse_x", "mouse_y"],
+)
+
+
+def snapshot_event(event):
+    """Copy the fields the tools read from a (short-lived) bpy event."""
+    return EventSnapshot(
+        event.type,
+        event.value,
+        event.ctrl,
+        event.shift,
+        event.alt,
+        event.oskey,
+        event.mouse_x,
+        event.mouse_y,
+    )
+
+
+class MoveScheduler:
+    """Coalesces bursts of MOUSEMOVE events into the latest position.
+
+    In COALESCED mode at most max_rate moves per second are processed; moves
+    arriving in between replace the pending one, which is delivered by a
+    window manager timer once the interval has elapsed.
+    """
+
+    def __init__(self, mode="IMMEDIATE", max_rate=60):
+        self.interval = 1.0 / max_rate if mode == "COALESCED" and max_rate > 0 else 0.0
+        self.pending = None
+        self.last_time = 0.0
+        self._timer = None
+
+    def push(self, context, event):
+        """Register a move; return the snapshot to process now, or None."""
+        move = snapshot_event(event)
+        now = time.perf_counter()
+        if now - self.last_time >= self.interval:
+            self.pending = None
+            self.last_time = now
+            return move
+        self.pending = move
+        self._ensure_timer(context)
+        return None
+
+    def pop_due(self, context):
+        """On a timer tick, return the pending move if its slot has come."""
+        if self.pending is None:
+            self.remove_timer(context)
+            return None
+        now = time.perf_counter()
+        if now - self.last_time < self.interval:
+            return None
+        self.last_time = now
+        return self.flush(context)
+
+    def flush(self, context):
+        """Return the pending move (if any) immediately."""
+        move, self.pending = self.pending, None
+        self.remove_timer(context)
+        return move
+
+    def _ensure_timer(self, context):
+        if self._timer is None and context.window:
+            self._timer = context.window_manager.event_timer_add(
+                self.interval, window=context.window
+            )
+
+    def remove_timer(self, context):
+        if self._timer is not None:
+            try:
+                context.window_manager.event_timer_remove(self._timer)
+            except Exception:
+                pass
+            self._timer = None
@@ -0,0 +1,187 @@
+# Measured values of existing measurements, computed from their vertices
+#
+# Lengths and angles are computed with numpy from the measurement points
+# (read with foreach_get), the same way as actual_length and angle_info,
+# without evaluating the node groups. Values are converted to the unit set
+# on each measurement's modifier.
+#
+#     from measurement.core.export import export_values
+#     export_values(bpy.context, "values.csv")
+
+import csv
+import json
+
+import numpy as np
+
+from ..constants import NODE_GROUP_NAMES, POINT_COUNTS
+from .nodegroup import find_wrapper_modifier
+from .restyle import iter_measurement_objects, measurement_tool_type
+from .measure_arrays import measure_angles, measure_lengths
+from .sheet import ID_ATTRIBUTE, TYPE_ATTRIBUTE, TYPE_INDEX, is_sheet_object, shared_input_name
+from .sockets import get_socket_map
+from .units import angle_factor, length_factor
+
+FIELDS = ("name", "type", "value", "outer_value", "unit")
+
+DEFAULT_UNITS = {"distance": "Meter", "angle": "Degree"}
+
+
+def _unit_name(mod, tool_type, socket_name="Unit"):
+    """Unit item selected on a modifier input, or the default unit."""
+    default = DEFAULT_UNITS[tool_type]
+    socket_map = get_socket_map(mod) if mod else None
+    if socket_map is None:
+        return default
+    info = socket_map.by_name.get(socket_name)
+    if info is None or mod.get(info.identifier) is None:
+        return default
+    fallback_key = "Unit_Distance" if tool_type == "distance" else "Unit_Angle"
+    return socket_map.enum_name(info, mod[info.identifier], fallback_key, default)
+
+
+class MeasurementSet:
+    """World-space points, names and units of measurements of one type."""
+
+    def __init__(self, tool_type):
+        self.tool_type = tool_type
+        self.points = []
+        self.names = []
+        self.units = []
+
+    def add(self, points, names, unit):
+        self.points.append(points)
+        self.names.extend(names)
+        self.units.extend([unit] * len(names))
+
+    def __len__(self):
+        return len(self.names)
+
+    def values(self):
+        """Return (values, outer values or None) converted to each unit."""
+        count = POINT_COUNTS[self.tool_type]
+        points = np.concatenate(self.points).reshape(-1, count, 3)
+        if self.tool_type == "distance":
+            factors = np.array([length_factor(u) for u in self.units])
+            return measure_lengths(points) * factors, None
+        factors = np.array([angle_factor(u) for u in self.units])
+        angles = measure_angles(points)
+        return angles * factors, (360.0 - angles) * factors
+
+
+def _object_points(objects):
+    """Return (N, K, 3) world-space points of measurement objects with K vertices."""
+    counts = np.array([len(obj.data.vertices) for obj in objects])
+    co = np.empty(counts.sum() * 3, dtype=np.float32)
+    start = 0
+    for obj, count in zip(objects, counts):
+        obj.data.vertices.foreach_get("co", co[start:start + count * 3])
+        start += count * 3
+    local = co.reshape(len(objects), -1, 3).astype(np.float64)
+    mats = np.array([obj.matrix_world for obj in objects])
+    return np.einsum("nij,nkj->nki", mats[:, :3, :3], local) + mats[:, None, :3, 3]
+
+
+def _add_sheet(sets, sheet):
+    mesh = sheet.data
+    n = len(mesh.vertices)
+    id_attr = mesh.attributes.get(ID_ATTRIBUTE)
+    type_attr = mesh.attributes.get(TYPE_ATTRIBUTE)
+    if not n or id_attr is None or type_attr is None:
+        return
+    ids = np.empty(n, dtype=np.int32)
+    types = np.empty(n, dtype=np.int32)
+    id_attr.data.foreach_get("value", ids)
+    type_attr.data.foreach_get("value", types)
+    co = np.empty(n * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    mw = np.array(sheet.matrix_world)
+    world = co.reshape(-1, 3).astype(np.float64) @ mw[:3, :3].T + mw[:3, 3]
+
+    order = np.argsort(ids, kind="stable")
+    uniq, starts, counts = np.unique(ids[order], return_index=True, return_counts=True)
+    first_types = types[order][starts]
+    mod = find_wrapper_modifier(sheet)
+
+    for tool_type, type_index in TYPE_INDEX.items():
+        count = POINT_COUNTS[tool_type]
+        selected = (counts == count) & (first_types == type_index)
+        if not selected.any():
+            continue
+        vert_index = order[starts[selected][:, None] + np.arange(count)]
+        unit = _unit_name(mod, tool_type, shared_input_name(tool_type, "Unit"))
+        names = [f"{sheet.name}:{i}" for i in uniq[selected].tolist()]
+        sets[tool_type].add(world[vert_index], names, unit)
+
+
+def collect_measurements(objects):
+    """Group measurement objects and sheets into {tool_type: MeasurementSet}."""
+    sets = {tool_type: MeasurementSet(tool_type) for tool_type in NODE_GROUP_NAMES}
+    by_key = {}
+    for obj in objects:
+        if is_sheet_object(obj):
+            _add_sheet(sets, obj)
+            continue
+        tool_type = measurement_tool_type(obj)
+        if tool_type is None or len(obj.data.vertices) != POINT_COUNTS[tool_type]:
+            continue
+        unit = _unit_name(find_wrapper_modifier(obj), tool_type)
+        by_key.setdefault((tool_type, unit), []).append(obj)
+
+    for (tool_type, unit), objs in by_key.items():
+        sets[tool_type].add(_object_points(objs), [o.name for o in objs], unit)
+    return sets
+
+
+def iter_value_rows(objects):
+    """Yield one dict with the FIELDS per measurement."""
+    for tool_type, mset in collect_measurements(objects).items():
+        if not len(mset):
+            continue
+        values, outer = mset.values()
+        values = values.tolist()
+        outer = outer.tolist() if outer is not None else [None] * len(values)
+        for name, value, outer_value, unit in zip(mset.names, values, outer, mset.units):
+            yield {
+                "name": name,
+                "type": tool_type,
+                "value": value,
+                "outer_value": outer_value,
+                "unit": unit,
+            }
+
+
+def write_csv(rows, f):
+    writer = csv.DictWriter(f, fieldnames=FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(rows, f):
+    """Write rows as a JSON list, one record per line."""
+    count = 0
+    f.write("[")
+    for row in rows:
+        f.write(",\n" if count else "\n")
+        f.write(json.dumps(row))
+        count += 1
+    f.write("\n]\n")
+    return count
+
+
+def export_values(context, filepath, objects=None, file_format=None, selected_only=False):
+    """Write the measured values to a CSV or JSON file.
+
+    file_format is 'CSV' or 'JSON' and defaults from the file extension.
+    Foot-Inch values are written in inches. Returns the number of rows.
+    """
+    if objects is None:
+        objects = iter_measurement_objects(context, selected_only)
+    if file_format is None:
+        file_format = 'JSON' if str(filepath).lower().endswith(".json") else 'CSV'
+    writer = write_json if file_format == 'JSON' else write_csv
+    with open(filepath, "w", newline="", encoding="utf-8") as f:
+        return writer(iter_value_rows(objects), f)
@@ -0,0 +1,76 @@
+# Application handlers shared by the measurement caches
+
+import bpy
+from bpy.app.handlers import persistent
+
+_depsgraph_callbacks = []
+_load_callbacks = []
+_undo_callbacks = []
+
+
+def depsgraph_callback(func):
+    """Decorator: call func(scene, depsgraph) after every depsgraph update."""
+    if func not in _depsgraph_callbacks:
+        _depsgraph_callbacks.append(func)
+    return func
+
+
+def load_callback(func):
+    """Decorator: call func() after a new file is loaded."""
+    if func not in _load_callbacks:
+        _load_callbacks.append(func)
+    return func
+
+
+def undo_callback(func):
+    """Decorator: call func() after undo or redo restores an earlier state."""
+    if func not in _undo_callbacks:
+        _undo_callbacks.append(func)
+    return func
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    for callback in _depsgraph_callbacks:
+        try:
+            callback(scene, depsgraph)
+        except Exception as e:
+            print(f"Measurement depsgraph callback {callback.__name__} failed: {e}")
+
+
+@persistent
+def on_load_post(*args):
+    for callback in _load_callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Measurement load callback {callback.__name__} failed: {e}")
+
+
+@persistent
+def on_undo_redo(*args):
+    for callback in _undo_callbacks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"Measurement undo callback {callback.__name__} failed: {e}")
+
+
+def register():
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+    for handler_list in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if on_undo_redo not in handler_list:
+            handler_list.append(on_undo_redo)
+
+
+def unregister():
+    for handler_list in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if on_undo_redo in handler_list:
+            handler_list.remove(on_undo_redo)
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
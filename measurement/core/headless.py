@@ -0,0 +1,214 @@
+# Running the measurement tools without a window
+#
+# Under `blender --background` there is no 3D view, region or event loop.
+# HeadlessView stands in for a VIEW_3D area with a perspective camera, and
+# make_headless_tool builds a plain class hierarchy mirroring an operator
+# class, so its methods can be called directly (bpy operators can't be
+# instantiated from Python).
+
+import math
+import types
+from types import SimpleNamespace
+
+import bpy
+import mathutils
+
+from ..preferences import MeasureToolPreferences, get_prefs
+from .events import EventSnapshot
+from .params import session_params_from_prefs
+
+
+def perspective_matrix(fov, aspect, near, far):
+    """OpenGL style projection matrix (fov in radians, vertical)."""
+    f = 1.0 / math.tan(fov * 0.5)
+    return mathutils.Matrix((
+        (f / aspect, 0.0, 0.0, 0.0),
+        (0.0, f, 0.0, 0.0),
+        (0.0, 0.0, (far + near) / (near - far), 2.0 * far * near / (near - far)),
+        (0.0, 0.0, -1.0, 0.0),
+    ))
+
+
+class HeadlessRegionData:
+    """Subset of RegionView3D used by view3d_utils and the tools."""
+
+    def __init__(self, view_matrix, window_matrix):
+        self.is_perspective = True
+        self.view_perspective = "PERSP"
+        self.set_view(view_matrix, window_matrix)
+
+    def set_view(self, view_matrix, window_matrix):
+        self.view_matrix = view_matrix.copy()
+        self.window_matrix = window_matrix.copy()
+        self.perspective_matrix = window_matrix @ view_matrix
+        self.view_rotation = view_matrix.inverted().to_quaternion()
+        self.view_location = view_matrix.inverted().translation
+
+
+class HeadlessRegion:
+    def __init__(self, width, height, data):
+        self.type = "WINDOW"
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.data = data
+
+    def tag_redraw(self):
+        pass
+
+
+class HeadlessArea:
+    def __init__(self, region):
+        self.type = "VIEW_3D"
+        self.x = region.x
+        self.y = region.y
+        self.width = region.width
+        self.height = region.height
+        self.regions = [region]
+
+    def tag_redraw(self):
+        pass
+
+
+class HeadlessView:
+    """A VIEW_3D area looking from eye at target."""
+
+    def __init__(
+        self,
+        width=1920,
+        height=1080,
+        eye=(0.0, -10.0, 6.0),
+        target=(0.0, 0.0, 0.0),
+        fov=math.radians(50.0),
+        clip_start=0.01,
+        clip_end=1000.0,
+    ):
+        self.fov = fov
+        self.clip_start = clip_start
+        self.clip_end = clip_end
+        self.rv3d = HeadlessRegionData(mathutils.Matrix(), mathutils.Matrix())
+        self.region = HeadlessRegion(width, height, self.rv3d)
+        self.area = HeadlessArea(self.region)
+        self.look_at(eye, target)
+
+    def look_at(self, eye, target):
+        eye = mathutils.Vector(eye)
+        direction = mathutils.Vector(target) - eye
+        rot = direction.to_track_quat("-Z", "Y").to_matrix().to_4x4()
+        view_matrix = (mathutils.Matrix.Translation(eye) @ rot).inverted()
+        self.set_view_matrix(view_matrix)
+
+    def set_view_matrix(self, view_matrix):
+        window_matrix = perspective_matrix(
+            self.fov,
+            self.region.width / self.region.height,
+            self.clip_start,
+            self.clip_end,
+        )
+        self.rv3d.set_view(view_matrix, window_matrix)
+
+
+class HeadlessContext:
+    """bpy.context with the area, region and region data of a HeadlessView."""
+
+    def __init__(self, view, context=None):
+        self._view = view
+        self._context = context or bpy.context
+
+    @property
+    def area(self):
+        return self._view.area
+
+    @property
+    def region(self):
+        return self._view.region
+
+    @property
+    def region_data(self):
+        return self._view.rv3d
+
+    @property
+    def workspace(self):
+        # No workspace tool to compare against, so tool switches aren't checked
+        return None
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+def mouse_event(x, y, type="MOUSEMOVE", value="NOTHING", ctrl=False, shift=False, alt=False):
+    """Event at region coordinates (x, y) of a HeadlessView."""
+    return EventSnapshot(type, value, ctrl, shift, alt, False, int(x), int(y))
+
+
+def default_params(context=None):
+    """Session params from the addon preferences, or their defaults when
+    the addon isn't enabled (e.g. imported from a script)."""
+    prefs = get_prefs(context or bpy.context)
+    if prefs is None:
+        prefs = SimpleNamespace(**{
+            name: prop.keywords.get("default")
+            for name, prop in MeasureToolPreferences.__annotations__.items()
+            if hasattr(prop, "keywords")
+        })
+    return session_params_from_prefs(prefs)
+
+
+def _mirror_function(func, mirror):
+    """func, with zero-argument super() resolving against mirror."""
+    code = getattr(func, "__code__", None)
+    if code is None or "__class__" not in code.co_freevars:
+        return func
+    closure = tuple(
+        types.CellType(mirror) if name == "__class__" else cell
+        for name, cell in zip(code.co_freevars, func.__closure__)
+    )
+    mirrored = types.FunctionType(
+        code, func.__globals__, func.__name__, func.__defaults__, closure
+    )
+    mirrored.__kwdefaults__ = func.__kwdefaults__
+    mirrored.__qualname__ = func.__qualname__
+    mirrored.__doc__ = func.__doc__
+    return mirrored
+
+
+def _mirror_class(klass, base):
+    """Plain subclass of base with klass's attributes."""
+    namespace = {
+        name: value for name, value in vars(klass).items() if not name.startswith("__")
+    }
+    mirror = type(f"Headless{klass.__name__}", (base,), namespace)
+    for name, value in namespace.items():
+        if isinstance(value, (classmethod, staticmethod)):
+            setattr(mirror, name, type(value)(_mirror_function(value.__func__, mirror)))
+        else:
+            setattr(mirror, name, _mirror_function(value, mirror))
+    return mirror
+
+
+def make_headless_tool(tool_cls, context=None, **attrs):
+    """Return an instance of a plain class hierarchy mirroring tool_cls.
+
+    Each measurement class in tool_cls's MRO becomes a plain subclass of the
+    previous one; the bpy base classes are skipped. Methods using super()
+    resolve against the mirrored classes, so they run as in the operator.
+    report() prints instead of reporting. The state is initialized with
+    init_state(), as invoke() would.
+    """
+    package = __package__.rsplit(".", 1)[0]
+    mirror = object
+    for klass in reversed(tool_cls.__mro__):
+        if klass.__module__.startswith(package):
+            mirror = _mirror_class(klass, mirror)
+    mirror.report = lambda self, level, message: print(
+        f"{'/'.join(sorted(level))}: {message}"
+    )
+
+    tool = mirror()
+    tool.init_state(context or bpy.context)
+    if not hasattr(tool, "session_params"):
+        tool.session_params = default_params(context)
+    for name, value in attrs.items():
+        setattr(tool, name, value)
+    return tool
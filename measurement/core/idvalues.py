@@ -0,0 +1,15 @@
+# Comparison of modifier input values as stored in IDProperties
+
+import math
+
+
+def values_equal(a, b):
+    """Compare input values, allowing for the float32 storage of IDProperties."""
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(values_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        try:
+            return math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-7)
+        except TypeError:
+            return False
+    return a == b
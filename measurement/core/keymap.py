@@ -0,0 +1,99 @@
+# Dispatch tables compiled from constants.KEYMAP_REGISTRY
+#
+# Each tool gets one table mapping (event type, event value, modifier mask)
+# to the registry action per phase, so the modal handlers find the action
+# of an event with one dictionary lookup. "ANY" values and any_mods entries
+# are expanded when compiling. The help overlay lists the same entries, so
+# what it shows is what the tools handle.
+
+from collections import namedtuple
+
+from ..constants import KEYMAP_REGISTRY, get_bindings_for_tool
+
+MOD_SHIFT = 1
+MOD_CTRL = 2
+MOD_ALT = 4
+ALL_MODS = tuple(range(8))
+
+MOD_NAMES = {"Shift": MOD_SHIFT, "Ctrl": MOD_CTRL, "Alt": MOD_ALT}
+
+# Event values an "ANY" registry value expands to
+EVENT_VALUES = ("PRESS", "RELEASE", "CLICK", "DOUBLE_CLICK", "CLICK_DRAG", "NOTHING")
+
+# handler: operator method name; args: extra values of the registry event
+# (e.g. the scroll direction); binding: the registry entry
+Action = namedtuple("Action", ["handler", "args", "binding"])
+
+
+def modifier_mask(event):
+    return (
+        (MOD_SHIFT if event.shift else 0)
+        | (MOD_CTRL if event.ctrl else 0)
+        | (MOD_ALT if event.alt else 0)
+    )
+
+
+def parse_mods(mods):
+    """Modifier mask of a registry "mods" string such as "Ctrl+Alt"."""
+    mask = 0
+    for name in mods.split("+"):
+        name = name.strip()
+        if name:
+            mask |= MOD_NAMES[name]
+    return mask
+
+
+class ToolKeymap:
+    """Dispatch table and help entries of one tool type."""
+
+    def __init__(self, tool_type, registry=KEYMAP_REGISTRY):
+        self.tool_type = tool_type
+        self.bindings = get_bindings_for_tool(tool_type, registry)
+        self.table = {}  # (type, value, mask) -> {phase or None: Action}
+
+        # Help rows: one per key + modifiers, first description wins
+        seen = set()
+        self.help = []
+        for b in self.bindings:
+            key_id = (b["key"], b["mods"])
+            if key_id not in seen:
+                seen.add(key_id)
+                self.help.append(b)
+
+        for b in self.bindings:
+            handler = b.get("handler")
+            if not handler or not b.get("events"):
+                continue
+            masks = ALL_MODS if b.get("any_mods") else (parse_mods(b["mods"]),)
+            for event_type, value, *args in b["events"]:
+                values = EVENT_VALUES if value == "ANY" else (value,)
+                action = Action(handler, tuple(args), b)
+                for v in values:
+                    for mask in masks:
+                        phases = self.table.setdefault((event_type, v, mask), {})
+                        phases.setdefault(b.get("phase"), action)
+
+    def lookup(self, event, phase=None):
+        """Action bound to the event in the given phase, or None."""
+        phases = self.table.get((event.type, event.value, modifier_mask(event)))
+        if phases is None:
+            return None
+        action = phases.get(phase)
+        return action if action is not None else phases.get(None)
+
+
+_keymaps = {}  # tool type -> ToolKeymap
+
+
+def compile_keymaps(tool_types=("distance", "angle")):
+    """Build the dispatch tables; called when the addon is registered."""
+    _keymaps.clear()
+    for tool_type in tool_types:
+        _keymaps[tool_type] = ToolKeymap(tool_type)
+
+
+def get_keymap(tool_type):
+    keymap = _keymaps.get(tool_type)
+    if keymap is None:
+        keymap = _keymaps[tool_type] = ToolKeymap(tool_type)
+    return keymap
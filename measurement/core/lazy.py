@@ -0,0 +1,29 @@
+# Deferred module imports
+#
+# Modules returned by lazy_import are only executed when one of their
+# attributes is first used, so importing the addon at startup doesn't pay
+# for numpy, the GPU drawing code or the geometry caches.
+
+import importlib.util
+import sys
+
+
+def lazy_import(name, package=None):
+    """Return the module name, executed on first attribute access.
+
+    Relative names are resolved against package, as with importlib.
+    """
+    fullname = importlib.util.resolve_name(name, package)
+    module = sys.modules.get(fullname)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(fullname)
+    if spec is None:
+        raise ImportError(f"No module named {fullname!r}", name=fullname)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[fullname] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,127 @@
+# Registry of the current measured values, kept up to date incrementally
+#
+# The registry is built from the scene the first time it is read. After
+# that, the depsgraph callback only records which objects had their
+# geometry or transform updated, and those are measured again on the next
+# read, so reading costs O(changed) rather than a walk over every object.
+#
+#     from measurement.core import livevalues
+#     for value in livevalues.live_values():
+#         print(value.name, value.value, value.unit)
+
+from collections import namedtuple
+
+import bpy
+
+from .handlers import depsgraph_callback, load_callback, undo_callback
+from .lazy import lazy_import
+
+# Loaded on the first read, not when the addon is enabled
+export = lazy_import(".export", __package__)
+restyle = lazy_import(".restyle", __package__)
+sheet = lazy_import(".sheet", __package__)
+
+LiveValue = namedtuple("LiveValue", ["name", "type", "value", "outer_value", "unit"])
+
+_objects = {}  # object pointer -> object
+_values = {}   # object pointer -> [LiveValue] (several for a sheet)
+_dirty = {}    # object pointer -> object, updated since the last read
+_built = False
+
+
+def _measure(obj):
+    if not (sheet.is_sheet_object(obj) or restyle.measurement_tool_type(obj)):
+        return None
+    return [LiveValue(**row) for row in export.iter_value_rows([obj])]
+
+
+def _store(obj):
+    key = obj.as_pointer()
+    values = _measure(obj)
+    if values is None:
+        _objects.pop(key, None)
+        _values.pop(key, None)
+    else:
+        _objects[key] = obj
+        _values[key] = values
+
+
+def _is_valid(obj):
+    """False once the object has been removed."""
+    try:
+        return obj.name in bpy.data.objects
+    except ReferenceError:
+        return False
+
+
+def _refresh(context=None):
+    global _built
+    if not _built:
+        scene = (context or bpy.context).scene
+        if scene is None:
+            return
+        for obj in restyle.iter_measurement_objects(context or bpy.context):
+            _store(obj)
+        _dirty.clear()
+        _built = True
+        return
+
+    dirty = list(_dirty.items())
+    _dirty.clear()
+    for key, obj in dirty:
+        if _is_valid(obj):
+            _store(obj)
+        else:
+            _objects.pop(key, None)
+            _values.pop(key, None)
+
+
+def live_values(context=None):
+    """Return the LiveValues of every measurement in the scene."""
+    _refresh(context)
+    return [value for values in _values.values() for value in values]
+
+
+def live_value(obj):
+    """Return the LiveValues of one measurement object or sheet."""
+    _refresh()
+    key = obj.as_pointer()
+    if key not in _values:
+        # Not seen by the depsgraph yet (e.g. created without an update)
+        _store(obj)
+    return list(_values.get(key, ()))
+
+
+def clear_live_values():
+    global _built
+    _objects.clear()
+    _values.clear()
+    _dirty.clear()
+    _built = False
+
+
+@depsgraph_callback
+def track_live_values(scene, depsgraph):
+    if not _built:
+        return
+    relinked = False
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            if update.is_updated_geometry or update.is_updated_transform:
+                _dirty[id_data.as_pointer()] = id_data
+        elif isinstance(id_data, (bpy.types.Collection, bpy.types.Scene)):
+            relinked = True
+
+    if relinked:
+        # Objects may have been unlinked; check the tracked ones only
+        for key, obj in _objects.items():
+            if not _is_valid(obj):
+                _dirty[key] = obj
+
+
+@load_callback
+@undo_callback
+def reset_live_values():
+    """Undo and file load replace the objects; rebuild on the next read."""
+    clear_live_values()
@@ -0,0 +1,48 @@
+# Measured values computed from measurement vertices
+
+import math
+
+
+def world_points(obj):
+    """Return the world-space positions of an object's vertices."""
+    mw = obj.matrix_world
+    return [mw @ v.co for v in obj.data.vertices]
+
+
+def actual_length(points, tool_type):
+    """Length of a distance measurement, or mean leg length of an angle."""
+    if len(points) < 2:
+        return 1.0
+    v0, v1 = points[0], points[1]
+    if tool_type == "angle" and len(points) >= 3:
+        d1 = (v0 - v1).length
+        d2 = (points[2] - v1).length
+        return (d1 + d2) / 2.0
+    return (v1 - v0).length
+
+
+def angle_info(points):
+    """Returns the angle (in degrees) and the shorter leg length of the angle."""
+    if len(points) < 2:
+        return 0.0, 1.0
+
+    w0 = points[0]
+    w1 = points[1]  # Corner/Vertex
+
+    if len(points) < 3:
+        return 0.0, (w1 - w0).length
+
+    u = w0 - w1
+    v = points[2] - w1
+
+    u_len = u.length
+    v_len = v.length
+
+    if u_len < 0.0001 or v_len < 0.0001:
+        return 0.0, 0.0
+
+    cos_angle = u.dot(v) / (u_len * v_len)
+    cos_angle = max(-1.0, min(1.0, cos_angle))
+    angle_deg = math.degrees(math.acos(cos_angle))
+
+    return angle_deg, min(u_len, v_len)
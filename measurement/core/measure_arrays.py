@@ -0,0 +1,26 @@
+# Vectorized measured values, computed like actual_length and angle_info
+#
+# Operates on numpy arrays of world-space points only, so it can be used
+# (and tested) without Blender.
+
+import numpy as np
+
+# Legs shorter than this give an angle of 0, as in angle_info
+MIN_LEG_LENGTH = 0.0001
+
+
+def measure_lengths(points):
+    """Lengths of (N, 2, 3) distance points."""
+    return np.linalg.norm(points[:, 1] - points[:, 0], axis=1)
+
+
+def measure_angles(points):
+    """Angles in degrees at the apex of (N, 3, 3) angle points."""
+    u = points[:, 0] - points[:, 1]
+    v = points[:, 2] - points[:, 1]
+    u_len = np.linalg.norm(u, axis=1)
+    v_len = np.linalg.norm(v, axis=1)
+    valid = (u_len >= MIN_LEG_LENGTH) & (v_len >= MIN_LEG_LENGTH)
+    denom = np.where(valid, u_len * v_len, 1.0)
+    cos_angle = np.clip(np.einsum("ij,ij->i", u, v) / denom, -1.0, 1.0)
+    return np.where(valid, np.degrees(np.arccos(cos_angle)), 0.0)
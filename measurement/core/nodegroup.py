@@ -1,8 +1,39 @@
 # Node group utilities for geometry nodes
 
+import re
+
 import bpy
 from pathlib import Path
 
+from ..constants import NODE_GROUP_NAMES
+from ..preferences import get_prefs
+from .asset_index import get_asset_index
+from .blendfile import BlendFileError, read_node_trees
+from .handlers import load_callback
+
+# Prefix identifying the geometry nodes modifiers created by the tools
+WRAPPER_PREFIX = "Wrap_"
+
+# Suffix Blender adds to make ID names unique, e.g. "Trim Curves.001"
+DUPLICATE_SUFFIX = re.compile(r"^(.*)\.\d{3,}$")
+
+# Bundled library holding the measurement node groups
+BUNDLED_LIBRARY = Path(__file__).parent.parent / "measurement.blend"
+
+
+def is_wrapper_modifier(mod):
+    return mod.type == "NODES" and mod.name.startswith(WRAPPER_PREFIX)
+
+
+def find_wrapper_modifier(obj):
+    """Return the measurement modifier of an object, or None."""
+    return next((m for m in obj.modifiers if is_wrapper_modifier(m)), None)
+
+
+def is_measurement_object(obj):
+    """True if the object carries a Wrap_ measurement modifier."""
+    return any(is_wrapper_modifier(m) for m in obj.modifiers)
+
 
 def create_wrapper_modifier(obj, target_group):
     """Create a modifier for a geometry node group."""
@@ -13,17 +44,14 @@ def create_wrapper_modifier(obj, target_group):
         return None
 
     # Use Wrap_ prefix to identify measurement modifiers
-    mod = obj.modifiers.new(name=f"Wrap_{target_group_name}", type="NODES")
+    mod = obj.modifiers.new(name=f"{WRAPPER_PREFIX}{target_group_name}", type="NODES")
     mod.node_group = target_group
 
     return mod
 
 
-def get_asset_nodegroup(group_name):
-    """Load a node group from asset libraries."""
-    if group_name in bpy.data.node_groups:
-        return bpy.data.node_groups[group_name]
-
+def iter_search_files():
+    """Yield resolved .blend paths to search, in priority order."""
     search_locations = []
     if bpy.data.filepath:
         current_dir = Path(bpy.data.filepath).parent
@@ -52,17 +80,207 @@ def get_asset_nodegroup(group_name):
             if blend_path_str in checked_files:
                 continue
             checked_files.add(blend_path_str)
-            try:
-                with bpy.data.libraries.load(blend_path_str, assets_only=True) as (
-                    data_from,
-                    data_to,
-                ):
-                    if group_name in data_from.node_groups:
-                        data_to.node_groups = [group_name]
-                if data_to.node_groups:
-                    return data_to.node_groups[0]
-            except Exception as e:
-                print(f"Could not read {blend_path_str}: {e}")
+            yield blend_path_str
+
+
+def load_nodegroup_from_file(blend_path_str, group_name, link=False):
+    """Append (or link) a node group from a .blend file, returning None on failure."""
+    try:
+        with bpy.data.libraries.load(
+            blend_path_str, link=link, assets_only=not link
+        ) as (data_from, data_to):
+            if group_name in data_from.node_groups:
+                data_to.node_groups = [group_name]
+        if data_to.node_groups:
+            return data_to.node_groups[0]
+    except Exception as e:
+        print(f"Could not read {blend_path_str}: {e}")
+    return None
+
+
+def get_link_mode():
+    prefs = get_prefs(bpy.context)
+    return prefs.nodegroup_link_mode if prefs else 'APPEND'
+
+
+def get_library_path():
+    """Resolved path of the configured node group library (or the bundled one)."""
+    prefs = get_prefs(bpy.context)
+    if prefs and prefs.library_path:
+        return str(Path(bpy.path.abspath(prefs.library_path)).resolve())
+    return str(BUNDLED_LIBRARY.resolve())
+
+
+def base_name(name):
+    """Name without Blender's duplicate suffix."""
+    match = DUPLICATE_SUFFIX.match(name)
+    return match.group(1) if match else name
+
+
+def is_from_library(group, library_path):
+    if group.library is None:
+        return False
+    lib_path = Path(bpy.path.abspath(group.library.filepath, library=group.library.library))
+    return str(lib_path.resolve()) == library_path
+
+
+def find_linked_nodegroup(group_name, library_path):
+    return next(
+        (
+            g
+            for g in bpy.data.node_groups
+            if g.name == group_name and is_from_library(g, library_path)
+        ),
+        None,
+    )
+
+
+_library_names = {}  # library path -> (stat key, node tree names)
+
+
+def library_group_names(library_path):
+    """Names of all node trees in a library, nested groups included."""
+    try:
+        st = Path(library_path).stat()
+    except OSError:
+        return set()
+    key = (st.st_mtime, st.st_size)
+    cached = _library_names.get(library_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        names = {tree.name for tree in read_node_trees(library_path)}
+    except BlendFileError as e:
+        print(f"Could not read {library_path}: {e}")
+        names = set()
+    _library_names[library_path] = (key, names)
+    return names
+
+
+def _canonical_group(base, groups, library_path, link):
+    if link:
+        return next((g for g in groups if g.name == base and is_from_library(g, library_path)), None)
+    local = [g for g in groups if g.library is None]
+    if not local:
+        return None
+    return next((g for g in local if g.name == base), min(local, key=lambda g: g.name))
+
+
+def dedupe_nodegroups(library_path=None, link=None):
+    """Merge duplicate copies of the library's node groups.
+
+    Groups are matched by name without the ".001" style suffix. In link mode
+    every local copy is remapped to the linked group; otherwise all copies
+    are remapped to the unsuffixed local group. Local copies left without
+    users are removed. Returns the number of groups remapped.
+    """
+    if library_path is None:
+        library_path = get_library_path()
+    if link is None:
+        link = get_link_mode() == 'LINK'
+    names = library_group_names(library_path) | set(NODE_GROUP_NAMES.values())
+
+    by_base = {}
+    for group in bpy.data.node_groups:
+        base = base_name(group.name)
+        if base in names:
+            by_base.setdefault(base, []).append(group)
+
+    merged = 0
+    canonical_groups = set()
+    for base, groups in by_base.items():
+        canonical = _canonical_group(base, groups, library_path, link)
+        if canonical is None:
+            continue
+        canonical_groups.add(canonical.name_full)
+        for group in groups:
+            if group is canonical or group.library is not None:
+                continue
+            group.user_remap(canonical)
+            merged += 1
+
+    # Removing a copy can orphan the nested groups it used, so repeat
+    removed = True
+    while removed:
+        removed = False
+        for group in list(bpy.data.node_groups):
+            if (
+                group.library is None
+                and group.users == 0
+                and group.name_full not in canonical_groups
+                and base_name(group.name) in by_base
+            ):
+                bpy.data.node_groups.remove(group)
+                removed = True
+    return merged
+
+
+_deduped = False
+
+
+def link_nodegroup(group_name, library_path=None):
+    """Return the group linked from the library, linking it on first use.
+
+    The first call per file also merges appended copies into the link.
+    """
+    global _deduped
+    if library_path is None:
+        library_path = get_library_path()
+    group = find_linked_nodegroup(group_name, library_path)
+    if group is None:
+        group = load_nodegroup_from_file(library_path, group_name, link=True)
+    if group is not None and not _deduped:
+        dedupe_nodegroups(library_path, link=True)
+        _deduped = True
+    return group
+
+
+@load_callback
+def reset_dedupe():
+    global _deduped
+    _deduped = False
+
+
+def get_asset_nodegroup(group_name):
+    """Load a node group from asset libraries."""
+    if get_link_mode() == 'LINK':
+        group = link_nodegroup(group_name)
+        if group is not None:
+            return group
+        print(f"Could not link '{group_name}' from {get_library_path()}, appending instead.")
+
+    if group_name in bpy.data.node_groups:
+        return bpy.data.node_groups[group_name]
+
+    index = get_asset_index()
+    current_file = (
+        str(Path(bpy.data.filepath).resolve()) if bpy.data.filepath else None
+    )
+
+    try:
+        search_files = list(iter_search_files())
+
+        # Fast path: files already known to contain the group, limited to the
+        # files still searched and in search order
+        indexed = set(index.lookup(group_name))
+        indexed.discard(current_file)
+        for blend_path_str in search_files:
+            if blend_path_str not in indexed:
+                continue
+            group = load_nodegroup_from_file(blend_path_str, group_name)
+            if group:
+                return group
+
+        # Crawl, re-reading only files whose index entry is stale
+        for blend_path_str in search_files:
+            if blend_path_str in indexed:
+                continue
+            if group_name in index.get_node_groups(blend_path_str):
+                group = load_nodegroup_from_file(blend_path_str, group_name)
+                if group:
+                    return group
+    finally:
+        index.save()
 
     print(f"Target node group '{group_name}' not found.")
     return None
@@ -0,0 +1,140 @@
+# Session parameters: preference defaults and their application to modifiers
+
+from ..constants import SOCKET_TO_PREF
+from .idvalues import values_equal
+from .measure import actual_length, angle_info
+from .sockets import get_socket_map
+
+# Smallest angle (degrees) used when scaling angle measurement styling
+MIN_SCALE_ANGLE = 10.0
+
+
+def session_params_from_prefs(prefs):
+    """Snapshot the default modifier inputs from the addon preferences."""
+    params = {}
+    for socket_name, pref_attr in SOCKET_TO_PREF.items():
+        if hasattr(prefs, pref_attr):
+            val = getattr(prefs, pref_attr)
+            if hasattr(val, "to_list"):
+                val = val.to_list()
+            elif hasattr(val, "__len__") and not isinstance(val, str):
+                val = list(val)
+            params[socket_name] = val
+
+    # Unit special cases
+    params["Unit_Distance"] = prefs.default_unit_distance
+    params["Unit_Angle"] = prefs.default_unit_angle
+    return params
+
+
+def measurement_metrics(points, tool_type):
+    """Return (length, angle in degrees, shorter leg) used to scale params."""
+    length = max(0.001, actual_length(points, tool_type) if points else 1.0)
+    angle_deg, shorter_len = 0.0, length
+    if tool_type == "angle":
+        angle_deg, shorter_len = angle_info(points)
+    return length, angle_deg, shorter_len
+
+
+def scale_param_value(info, val, tool_type, is_relative, length, angle_deg, shorter_len):
+    """Apply relative-mode and angle-proportion scaling to one input value."""
+    # If relative mode, scale length-dependent properties
+    if is_relative and info.length_scaled:
+        if isinstance(val, (int, float)):
+            val = val * length
+
+    # Angle-specific scaling and constraints
+    if tool_type == "angle":
+        if info.ref_angle is not None:
+            ref_angle = info.ref_angle
+            clamped_angle = max(MIN_SCALE_ANGLE, min(ref_angle, angle_deg))
+            angle_scale = clamped_angle / ref_angle
+            if isinstance(val, (int, float)):
+                val = val * angle_scale
+        if info.name == "Radius":
+            val = min(val, shorter_len)
+    return val
+
+
+def resolve_param(socket_map, info, params, is_distance, name=None):
+    """Return the value params hold for an input, or None if unset.
+
+    name is the measurement socket name the input stands for; it defaults to
+    the input's own name. Enum inputs are mapped to their stored index.
+    """
+    socket_name = name or info.name
+
+    # Unit special cases
+    if socket_name == "Unit":
+        if is_distance:
+            val_str = params.get("Unit_Distance", "Meter")
+            return socket_map.enum_value(info, val_str, "Unit_Distance", 2)
+        val_str = params.get("Unit_Angle", "Degree")
+        return socket_map.enum_value(info, val_str, "Unit_Angle", 2)
+    if socket_name == "Output Type":
+        val_str = params.get("Output Type", "Grease Pencil")
+        return socket_map.enum_value(info, val_str, "Output Type", 2)
+    return params.get(socket_name)
+
+
+def compute_modifier_values(mod, params, tool_type, points, is_relative):
+    """Yield (SocketInfo, value) for every input set by the session params.
+
+    points are the measurement's world-space vertices; they drive relative
+    scaling and the angle-dependent proportions.
+    """
+    length, angle_deg, shorter_len = measurement_metrics(points, tool_type)
+
+    socket_map = get_socket_map(mod)
+    is_distance_group = "Distance" in mod.node_group.name
+
+    for info in socket_map.inputs:
+        val = resolve_param(socket_map, info, params, is_distance_group)
+        if val is None:
+            continue
+
+        val = scale_param_value(
+            info, val, tool_type, is_relative, length, angle_deg, shorter_len
+        )
+
+        # Handle color tuple conversion if needed
+        if info.socket_type == 'NodeSocketColor':
+            val = list(val)
+
+        yield info, val
+
+
+def read_modifier_values(mod):
+    """Return {identifier: value} for the inputs currently set on a modifier."""
+    values = {}
+    for info in get_socket_map(mod).inputs:
+        val = mod.get(info.identifier)
+        if val is None:
+            continue
+        if hasattr(val, "to_list"):
+            val = val.to_list()
+        values[info.identifier] = val
+    return values
+
+
+def apply_params_to_modifier(mod, params, tool_type, points, is_relative, written=None):
+    """Write session params to a measurement modifier.
+
+    written maps socket identifiers to the values last written; inputs whose
+    value is unchanged are skipped. Returns True if anything was written.
+    The caller is responsible for tagging the object for update.
+    """
+    if written is None:
+        written = {}
+    changed = False
+    for info, val in compute_modifier_values(mod, params, tool_type, points, is_relative):
+        # Only write values that changed since the last call
+        if values_equal(written.get(info.identifier), val):
+            continue
+        try:
+            mod[info.identifier] = val
+            written[info.identifier] = val
+            changed = True
+        except Exception as e:
+            print(f"Failed to set modifier parameter {info.name}: {e}")
+    return changed
@@ -0,0 +1,116 @@
+# Loading and first evaluation of the measurement node groups ahead of use
+#
+# The first measurement otherwise pays for finding and appending the node
+# groups and for building their geometry nodes evaluator, inside the modal
+# handler. A timer task does both in advance: it loads the groups, evaluates
+# one scratch measurement of each type and removes the scratch objects again
+# before the viewport redraws.
+
+import bpy
+
+from ..constants import NODE_GROUP_NAMES, POINT_COUNTS
+from ..preferences import get_prefs
+from .handlers import load_callback
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Delay (seconds) before prewarming, so it runs after startup/file load
+PREWARM_DELAY = 0.5
+
+# Scratch measurement points per type: a unit distance and a right angle
+SCRATCH_POINTS = {
+    "distance": ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0)),
+    "angle": ((1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 1.0, 0.0)),
+}
+
+_scheduled = False
+_done = False
+
+
+def schedule_prewarm(delay=PREWARM_DELAY):
+    """Queue the prewarm task unless it already ran for this file."""
+    global _scheduled
+    if _scheduled or _done:
+        return
+    _scheduled = True
+    bpy.app.timers.register(_prewarm_timer, first_interval=delay)
+
+
+def cancel_prewarm():
+    global _scheduled
+    if bpy.app.timers.is_registered(_prewarm_timer):
+        bpy.app.timers.unregister(_prewarm_timer)
+    _scheduled = False
+
+
+def _prewarm_timer():
+    global _scheduled, _done
+    _scheduled = False
+    try:
+        # Not done on failure (e.g. a missing library), so the next tool
+        # invoke schedules it again
+        _done = prewarm(bpy.context)
+    except Exception as e:
+        print(f"Measurement prewarm failed: {e}")
+    return None
+
+
+def prewarm(context):
+    """Load the node groups and evaluate each once on a scratch object.
+
+    Returns False if the node groups or the scene are unavailable.
+    """
+    # Imported here so enabling the addon doesn't pull in the batch code
+    from .batch import create_measurements
+    from .nodegroup import get_asset_nodegroup
+    from .sheet import get_sheet_group
+
+    groups = [get_asset_nodegroup(name) for name in NODE_GROUP_NAMES.values()]
+    if not all(groups):
+        return False
+
+    prefs = get_prefs(context)
+    if prefs and prefs.storage_mode == 'SHEET':
+        get_sheet_group()
+
+    scene = context.scene
+    if scene is None:
+        return False
+
+    objects = []
+    try:
+        for tool_type, points in SCRATCH_POINTS.items():
+            rows = np.array(points, dtype=np.float32).reshape(1, POINT_COUNTS[tool_type], 3)
+            objects += create_measurements(
+                context,
+                tool_type,
+                rows,
+                collection=scene.collection,
+                update=False,
+                storage='OBJECTS',
+            )
+        for obj in objects:
+            obj.hide_render = True
+        depsgraph = context.evaluated_depsgraph_get()
+        for obj in objects:
+            obj.evaluated_get(depsgraph)
+    finally:
+        # Removed within the same timer call, so the objects are never drawn
+        for obj in objects:
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if mesh is not None and not mesh.users:
+                bpy.data.meshes.remove(mesh)
+    return True
+
+
+@load_callback
+def reset_prewarm():
+    """A new file has its own node groups; prewarm again when enabled."""
+    global _done
+    cancel_prewarm()
+    _done = False
+    prefs = get_prefs(bpy.context)
+    if prefs and prefs.prewarm_mode == 'ENABLE':
+        schedule_prewarm()
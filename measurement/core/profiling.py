@@ -0,0 +1,109 @@
+# Opt-in timing of the modal operator phases
+#
+# The tools hold a Profiler only while profiling is enabled and guard every
+# measurement with `if prof:`, so disabled profiling costs one attribute
+# check per phase.
+
+import csv
+import json
+from collections import deque
+from time import perf_counter
+
+# Samples kept per phase for the rolling percentiles
+ROLLING_WINDOW = 256
+
+# Phases shown in the overlay line, in order
+OVERLAY_PHASES = ("modal", "raycast", "snap", "mesh", "params")
+
+
+class PhaseStats:
+    """Rolling window of durations (seconds) for one phase."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+    def summary(self):
+        """Statistics in milliseconds; percentiles cover the rolling window."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count * 1000.0 if self.count else 0.0,
+            "p50": self.percentile(50) * 1000.0,
+            "p95": self.percentile(95) * 1000.0,
+            "p99": self.percentile(99) * 1000.0,
+            "max": max(self.samples) * 1000.0 if self.samples else 0.0,
+        }
+
+
+class Profiler:
+    """Per-phase timings shared by the measurement tools."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.phases = {}
+
+    def record(self, name, seconds):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(self.window)
+        stats.add(seconds)
+
+    def lap(self, name, start):
+        """Record the time since start under name; return the current time."""
+        now = perf_counter()
+        self.record(name, now - start)
+        return now
+
+    def clear(self):
+        self.phases.clear()
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self.phases.items()}
+
+    def overlay_text(self):
+        """One line of p50/p95 milliseconds per phase."""
+        parts = []
+        for name in OVERLAY_PHASES:
+            stats = self.phases.get(name)
+            if stats and stats.samples:
+                parts.append(
+                    f"{name} {stats.percentile(50) * 1000.0:.2f}/"
+                    f"{stats.percentile(95) * 1000.0:.2f}"
+                )
+        if not parts:
+            return "profiling: no samples"
+        return "ms p50/p95  " + "  ".join(parts)
+
+    def dump(self, filepath):
+        """Write the summary as CSV or JSON, chosen by the file extension."""
+        summary = self.summary()
+        if filepath.lower().endswith(".csv"):
+            with open(filepath, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for name, s in summary.items():
+                    writer.writerow(
+                        [name, s["count"], s["mean"], s["p50"], s["p95"], s["p99"], s["max"]]
+                    )
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump({"window": self.window, "phases": summary}, f, indent=2)
+
+
+_profiler = Profiler()
+
+
+def get_profiler():
+    return _profiler
@@ -0,0 +1,449 @@
+# Scoped ray casting for measurement tools
+#
+# Replaces scene.ray_cast with a cast limited to an optional snap target
+# collection, prefiltered by each object's screen-space bounding rectangle
+# and accelerated with per-object BVH trees built in timer slices. Instances
+# (collection instances, geometry nodes instances) are cast against their
+# evaluated geometry with the instance matrix.
+
+import time
+from collections import deque
+
+import bpy
+import mathutils
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from .evalmesh import evaluated_meshes
+from .handlers import depsgraph_callback, load_callback
+from .nodegroup import is_measurement_object
+
+# Object types that can be hit by the ray
+RAYCAST_TYPES = {"MESH", "CURVE", "SURFACE", "META", "FONT"}
+
+# Time budget (seconds) per timer slice when building BVH trees
+BUILD_SLICE_SECONDS = 0.004
+
+# Extra margin (pixels) around screen rectangles
+RECT_MARGIN_PX = 2.0
+
+
+def get_snap_target(context):
+    """Return the user-chosen snap target collection, if any."""
+    return getattr(context.scene, "measure_snap_target", None)
+
+
+class SceneRaycaster:
+    """Ray caster over the visible, non-measurement objects of a scene."""
+
+    def __init__(self):
+        self._trees = {}  # object name -> BVHTree
+        self._pending = deque()
+        self._timer_registered = False
+        self._ignored = set()
+
+        # Candidate objects and their world-space bounding box corners. For
+        # instances, the geometry key and instance matrix are set as well.
+        self._names = None
+        self._corners = None
+        self._keys = None
+        self._matrices = None
+        self._rows = {}             # name -> row indices (the object's and its instances')
+        self._object_matrices = {}  # candidate/instancer name -> matrix its rows were built with
+        self._membership = None     # names of the candidates and instancers
+        # Incremented whenever the candidates may have changed
+        self.generation = 0
+
+        # Evaluated geometry key and matrix of the last hit (None, None for
+        # a hit on a scene object itself)
+        self.hit_key = None
+        self.hit_matrix = None
+
+        # Screen rectangles (N, 4) for the view they were projected in
+        self._rects = None
+        self._rects_key = None
+
+    # -- Candidates ---------------------------------------------------------
+
+    def iter_candidates(self, context):
+        target = get_snap_target(context)
+        objects = target.all_objects if target else context.view_layer.objects
+        for obj in objects:
+            if obj.type not in RAYCAST_TYPES or obj.name in self._ignored:
+                continue
+            if not obj.visible_get() or is_measurement_object(obj):
+                continue
+            yield obj
+
+    def iter_instancers(self, context):
+        """Visible collection instance empties; only their instances can be hit."""
+        target = get_snap_target(context)
+        objects = target.all_objects if target else context.view_layer.objects
+        for obj in objects:
+            if obj.type != "EMPTY" or obj.instance_type != "COLLECTION":
+                continue
+            if obj.instance_collection is None or obj.name in self._ignored:
+                continue
+            if obj.visible_get():
+                yield obj
+
+    def membership(self, context):
+        """Names of the candidates and collection instancers, to detect changes."""
+        return frozenset(
+            obj.name
+            for objects in (self.iter_candidates(context), self.iter_instancers(context))
+            for obj in objects
+        )
+
+    def _ensure_candidates(self, context):
+        if self._names is not None:
+            return
+        names = []
+        corners = []
+        keys = []
+        matrices = []
+        object_matrices = {}
+        for obj in self.iter_candidates(context):
+            corners.append(self._object_corners(obj))
+            names.append(obj.name)
+            keys.append(None)
+            matrices.append(None)
+            object_matrices[obj.name] = obj.matrix_world.copy()
+
+        instancers = set(names)
+        for obj in self.iter_instancers(context):
+            instancers.add(obj.name)
+            object_matrices[obj.name] = obj.matrix_world.copy()
+
+        for name, key, matrix, geometry in self._iter_instances(context, instancers):
+            mw = np.array(matrix, dtype=np.float64)
+            local = geometry.bound_corners()
+            corners.append((local @ mw[:3, :3].T + mw[:3, 3]).tolist())
+            names.append(name)
+            keys.append(key)
+            matrices.append(matrix)
+
+        self._names = names
+        self._corners = np.array(corners, dtype=np.float64).reshape(-1, 8, 3)
+        self._keys = keys
+        self._matrices = matrices
+        self._rows = {}
+        for i, name in enumerate(names):
+            self._rows.setdefault(name, []).append(i)
+        self._object_matrices = object_matrices
+        self._membership = frozenset(object_matrices)
+        self._rects = None
+
+    @staticmethod
+    def _object_corners(obj):
+        mw = np.array(obj.matrix_world, dtype=np.float64)
+        local = np.array(obj.bound_box, dtype=np.float64)
+        return (local @ mw[:3, :3].T + mw[:3, 3]).tolist()
+
+    def _iter_instances(self, context, instancers):
+        """Yield (instancer name, geometry key, matrix, EvaluatedMesh) per instance
+        of a candidate object or collection instance empty.
+
+        Instance data is only valid while iterating object_instances, so the
+        geometry is converted (once per key) here.
+        """
+        if not instancers:
+            return
+        depsgraph = context.evaluated_depsgraph_get()
+        for inst in depsgraph.object_instances:
+            if not inst.is_instance or inst.parent is None:
+                continue
+            parent = inst.parent.original
+            if parent.name not in instancers:
+                continue
+            obj_eval = inst.object
+            if obj_eval.type not in RAYCAST_TYPES:
+                continue
+            source = obj_eval.original
+            if source is not None and source.name != parent.name:
+                # An instanced object: same geometry as the object itself
+                key = source.name
+            else:
+                key = (parent.name, obj_eval.data.as_pointer())
+            geometry = evaluated_meshes.get(key, obj_eval)
+            if geometry is None or not len(geometry.tris):
+                continue
+            yield parent.name, key, inst.matrix_world.copy(), geometry
+
+    def _ensure_rects(self, region, rv3d):
+        key = (
+            tuple(tuple(row) for row in rv3d.perspective_matrix),
+            region.width,
+            region.height,
+        )
+        if self._rects is not None and self._rects_key == key:
+            return
+
+        persp = np.array(rv3d.perspective_matrix, dtype=np.float64)
+        corners = self._corners
+        clip = corners @ persp[:3, :3].T + persp[:3, 3]
+        w = corners @ persp[3, :3] + persp[3, 3]
+        behind = (w <= 1e-6).any(axis=1)
+        w = np.where(w <= 1e-6, 1.0, w)
+
+        half = np.array((region.width * 0.5, region.height * 0.5))
+        screen = (clip[..., :2] / w[..., None] + 1.0) * half
+        rects = np.empty((len(corners), 4))
+        rects[:, :2] = screen.min(axis=1) - RECT_MARGIN_PX
+        rects[:, 2:] = screen.max(axis=1) + RECT_MARGIN_PX
+        # Objects crossing the view plane can't be bounded on screen
+        rects[behind] = (-np.inf, -np.inf, np.inf, np.inf)
+
+        self._rects = rects
+        self._rects_key = key
+
+    def iter_geometry(self, context, region, rv3d):
+        """Yield (object, matrix, EvaluatedMesh) for every candidate, instances
+        included, whose bounding box is on screen in region."""
+        self._ensure_candidates(context)
+        if not self._names:
+            return
+        self._ensure_rects(region, rv3d)
+        rects = self._rects
+        on_screen = (
+            (rects[:, 2] >= 0) & (rects[:, 0] <= region.width)
+            & (rects[:, 3] >= 0) & (rects[:, 1] <= region.height)
+        )
+        depsgraph = context.evaluated_depsgraph_get()
+        for i in np.flatnonzero(on_screen):
+            obj = bpy.data.objects.get(self._names[i])
+            if obj is None:
+                continue
+            key = self._keys[i]
+            if key is None:
+                geometry = evaluated_meshes.get_object(obj, depsgraph)
+                matrix = obj.matrix_world
+            else:
+                geometry = evaluated_meshes.get(key)
+                matrix = self._matrices[i]
+            if geometry is not None:
+                yield obj, matrix, geometry
+
+    def invalidate_candidates(self):
+        self.generation += 1
+        self._names = None
+        self._corners = None
+        self._keys = None
+        self._matrices = None
+        self._rows = {}
+        self._object_matrices = {}
+        self._membership = None
+        self._rects = None
+
+    def is_candidate(self, name):
+        return name in self._object_matrices
+
+    def update_membership(self, context):
+        """Rebuild the candidates if objects were added, removed, hidden or shown."""
+        if self._names is not None and self.membership(context) != self._membership:
+            self.invalidate_candidates()
+
+    def update_transform(self, obj):
+        """Move the rows of a candidate (and of its instances) to its new matrix."""
+        old = self._object_matrices.get(obj.name)
+        if old is None or self._names is None:
+            return
+        new = obj.matrix_world.copy()
+        delta = new @ old.inverted_safe()
+        d = np.array(delta, dtype=np.float64)
+        for i in self._rows.get(obj.name, ()):
+            if self._keys[i] is None:
+                self._corners[i] = self._object_corners(obj)
+            else:
+                self._corners[i] = self._corners[i] @ d[:3, :3].T + d[:3, 3]
+                self._matrices[i] = delta @ self._matrices[i]
+        self._object_matrices[obj.name] = new
+        self.generation += 1
+        self._rects = None
+
+    def is_instanced(self, name):
+        """True if instance rows use the geometry of the named object."""
+        return any(key == name for key in self._keys or ())
+
+    def has_instances(self, name):
+        return any(self._keys[i] is not None for i in self._rows.get(name, ()))
+
+    # -- BVH trees ----------------------------------------------------------
+
+    def begin(self, context):
+        """Start building BVH trees for the current candidates in the background."""
+        self._ignored.clear()
+        self.invalidate_candidates()
+        self._pending = deque(
+            obj.name
+            for obj in self.iter_candidates(context)
+            if obj.name not in self._trees
+        )
+        if self._pending and not self._timer_registered:
+            bpy.app.timers.register(self._build_slice, first_interval=0.0)
+            self._timer_registered = True
+
+    def ignore(self, obj):
+        """Exclude an object (e.g. the one being drawn) from ray casts."""
+        self._ignored.add(obj.name)
+        if obj.name in self._object_matrices:
+            self.invalidate_candidates()
+
+    def is_ignored(self, name):
+        return name in self._ignored
+
+    def _build_slice(self):
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        deadline = time.perf_counter() + BUILD_SLICE_SECONDS
+        while self._pending and time.perf_counter() < deadline:
+            name = self._pending.popleft()
+            obj = bpy.data.objects.get(name)
+            if obj is None or name in self._trees:
+                continue
+            try:
+                self._trees[name] = BVHTree.FromObject(obj, depsgraph)
+            except Exception as e:
+                print(f"Could not build BVH for {name}: {e}")
+        if self._pending:
+            return 0.01
+        self._timer_registered = False
+        return None
+
+    def finish_builds(self):
+        """Build all pending trees now (timers don't run in background mode)."""
+        while self._pending:
+            self._build_slice()
+
+    def invalidate_tree(self, name):
+        self._trees.pop(name, None)
+
+    def clear(self):
+        self._trees.clear()
+        self._pending.clear()
+        self._ignored.clear()
+        self.invalidate_candidates()
+
+    # -- Query --------------------------------------------------------------
+
+    def ray_cast(self, context, region, rv3d, coord, origin, direction):
+        """Same return value as scene.ray_cast:
+        (hit, location, normal, index, object, matrix).
+
+        For a hit on an instance, object is the instancer, matrix the
+        instance's world matrix and index a polygon of the evaluated
+        geometry; hit_key then holds the geometry's evaluated_meshes key.
+        """
+        self.hit_key = None
+        self.hit_matrix = None
+        self._ensure_candidates(context)
+        miss = (False, mathutils.Vector(), mathutils.Vector(), -1, None, None)
+        if not self._names:
+            return miss
+        self._ensure_rects(region, rv3d)
+
+        x, y = coord
+        rects = self._rects
+        mask = (
+            (rects[:, 0] <= x) & (x <= rects[:, 2])
+            & (rects[:, 1] <= y) & (y <= rects[:, 3])
+        )
+
+        depsgraph = context.view_layer.depsgraph
+        best = None
+        best_dist = float("inf")
+        best_key = None
+        for i in np.flatnonzero(mask):
+            name = self._names[i]
+            obj = bpy.data.objects.get(name)
+            if obj is None:
+                continue
+            key = self._keys[i]
+            mw = obj.matrix_world if key is None else self._matrices[i]
+            inv = mw.inverted_safe()
+            origin_local = inv @ origin
+            direction_local = inv.to_3x3() @ direction
+
+            if key is not None:
+                geometry = evaluated_meshes.get(key)
+                found = geometry.ray_cast(origin_local, direction_local) if geometry else None
+                if found is None:
+                    continue
+                loc, normal, index = found
+            elif name in self._trees:
+                loc, normal, index, _ = self._trees[name].ray_cast(origin_local, direction_local)
+                if loc is None:
+                    continue
+            else:
+                # Tree still pending: cast against the evaluated object
+                try:
+                    result, loc, normal, index = obj.ray_cast(
+                        origin_local, direction_local, depsgraph=depsgraph
+                    )
+                except RuntimeError:
+                    # No evaluated mesh (e.g. an unbeveled curve)
+                    continue
+                if not result:
+                    continue
+
+            world_loc = mw @ loc
+            dist = (world_loc - origin).length
+            if dist < best_dist:
+                world_normal = (inv.transposed().to_3x3() @ normal).normalized()
+                best_dist = dist
+                best = (True, world_loc, world_normal, index, obj, mw.copy())
+                best_key = key
+
+        self.hit_key = best_key
+        self.hit_matrix = best[5] if best is not None and best_key is not None else None
+        return best if best is not None else miss
+
+
+scene_raycaster = SceneRaycaster()
+
+
+@depsgraph_callback
+def invalidate_raycast_cache(scene, depsgraph):
+    relinked = False
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        id_type = getattr(id_data, "id_type", None)
+        if id_type in {"COLLECTION", "SCENE"}:
+            relinked = True
+            continue
+        if id_type != "OBJECT" or scene_raycaster.is_ignored(id_data.name):
+            continue
+        if is_measurement_object(id_data):
+            # Restyling, attach moves and edits of measurements never affect
+            # the candidates
+            continue
+        if update.is_updated_geometry:
+            scene_raycaster.invalidate_tree(id_data.name)
+        if not scene_raycaster.is_candidate(id_data.name):
+            if scene_raycaster.is_instanced(id_data.name):
+                # An object of an instanced collection: its instances moved or changed
+                scene_raycaster.invalidate_candidates()
+            elif id_data.type in RAYCAST_TYPES or id_data.type == "EMPTY":
+                # May have been added or unhidden
+                relinked = True
+            continue
+        if not (update.is_updated_geometry or update.is_updated_transform):
+            # e.g. hidden or shown
+            relinked = True
+            continue
+        if update.is_updated_geometry:
+            if scene_raycaster.has_instances(id_data.name) or any(
+                m.type == "NODES" for m in id_data.modifiers
+            ):
+                # The instances it generates may have changed
+                scene_raycaster.invalidate_candidates()
+                continue
+        scene_raycaster.update_transform(id_data)
+
+    if relinked:
+        # Only rebuild when collection membership or visibility changed
+        scene_raycaster.update_membership(bpy.context)
+
+
+@load_callback
+def clear_raycast_cache():
+    scene_raycaster.clear()
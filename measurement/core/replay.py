@@ -0,0 +1,196 @@
+# Recording and headless replay of the drawing tools' event streams
+#
+# A recording holds the view the tool was used in (region size and view
+# and window matrices), the snapping settings, the session params and every
+# modal event with region-relative mouse coordinates. Replaying it against
+# a HeadlessView reproduces the interaction in `blender --background`,
+# timing each event and reporting the measurement it produced.
+
+import json
+from collections import deque
+from time import perf_counter
+
+import bpy
+import mathutils
+
+from .events import EventSnapshot, snapshot_event
+from .measure import world_points
+
+RECORDING_VERSION = 1
+
+# Finished recordings kept in memory for saving
+MAX_RECORDINGS = 16
+
+_recordings = deque(maxlen=MAX_RECORDINGS)
+
+
+def get_recordings():
+    return _recordings
+
+
+def _window_region(context):
+    region = context.region
+    if region is not None and region.type == "WINDOW":
+        return region
+    return next((r for r in context.area.regions if r.type == "WINDOW"), None)
+
+
+def _matrix_to_list(matrix):
+    return [list(row) for row in matrix]
+
+
+class EventRecorder:
+    """Collects the events of one tool run."""
+
+    def __init__(self, tool, context):
+        region = _window_region(context)
+        rv3d = region.data if region else context.region_data
+        self.region_offset = (region.x, region.y) if region else (0, 0)
+        tool_settings = context.tool_settings
+        self.data = {
+            "version": RECORDING_VERSION,
+            "tool": tool.tool_type,
+            "region": [region.width, region.height] if region else [0, 0],
+            "view_matrix": _matrix_to_list(rv3d.view_matrix),
+            "window_matrix": _matrix_to_list(rv3d.window_matrix),
+            "is_perspective": rv3d.is_perspective,
+            "use_snap": tool_settings.use_snap,
+            "snap_elements": sorted(tool_settings.snap_elements),
+            "params": dict(tool.session_params),
+            "events": [],
+            "status": None,
+            "result": None,
+        }
+        self.start = perf_counter()
+
+    def add(self, event):
+        # Timer ticks only deliver coalesced moves, which replay doesn't need
+        if event.type == "TIMER":
+            return
+        snap = snapshot_event(event)
+        x = snap.mouse_x - self.region_offset[0]
+        y = snap.mouse_y - self.region_offset[1]
+        self.data["events"].append(
+            [round(perf_counter() - self.start, 6)] + list(snap._replace(mouse_x=x, mouse_y=y))
+        )
+
+    def set_result(self, obj):
+        if obj is not None and obj.type == "MESH":
+            self.data["result"] = [p.to_tuple() for p in world_points(obj)]
+
+    def finish(self, status):
+        self.data["status"] = sorted(status)[0]
+        _recordings.append(self.data)
+
+
+def save_recording(recording, filepath):
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(recording, f)
+
+
+def load_recording(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version in {filepath}")
+    return recording
+
+
+def _summarize(latencies):
+    if not latencies:
+        return {}
+    ms = sorted(t * 1000.0 for t in latencies)
+    return {
+        "count": len(ms),
+        "mean": sum(ms) / len(ms),
+        "p50": ms[len(ms) // 2],
+        "p95": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        "max": ms[-1],
+    }
+
+
+def replay_recording(recording, context=None, keep_result=False):
+    """Replay a recording headlessly; return a report dict.
+
+    The report lists the latency of every event, latency statistics per
+    event type, the final measurement points and their largest deviation
+    from the recorded result. The created measurement is removed unless
+    keep_result is set.
+    """
+    from ..operators import MOUSE_OT_draw_angle, MOUSE_OT_draw_distance
+    from .events import MoveScheduler
+    from .headless import HeadlessContext, HeadlessView, make_headless_tool
+    from .raycast import scene_raycaster
+
+    tool_cls = {"distance": MOUSE_OT_draw_distance, "angle": MOUSE_OT_draw_angle}[
+        recording["tool"]
+    ]
+
+    width, height = recording["region"]
+    view = HeadlessView(width, height)
+    view.rv3d.is_perspective = recording.get("is_perspective", True)
+    view.rv3d.set_view(
+        mathutils.Matrix(recording["view_matrix"]),
+        mathutils.Matrix(recording["window_matrix"]),
+    )
+    context = HeadlessContext(view, context)
+
+    tool_settings = context.tool_settings
+    saved_snap = (tool_settings.use_snap, set(tool_settings.snap_elements))
+    tool_settings.use_snap = recording["use_snap"]
+    tool_settings.snap_elements = set(recording["snap_elements"])
+
+    events = [
+        (row[0], EventSnapshot(*row[1:])) for row in recording["events"]
+    ]
+    report = {"tool": recording["tool"], "events": [], "status": None}
+    try:
+        tool = make_headless_tool(tool_cls, context)
+        tool.session_params = dict(recording["params"])
+        tool.recorder = None
+        # Every recorded move is replayed; there is no timer to deliver deferred ones
+        tool.move_scheduler = MoveScheduler("IMMEDIATE")
+
+        scene_raycaster.begin(context)
+        scene_raycaster.finish_builds()
+
+        result = {"RUNNING_MODAL"}
+        points = None
+        for i, (_, event) in enumerate(events):
+            start = perf_counter()
+            if i == 0:
+                tool.get_location(context, event)
+            else:
+                result = tool.modal(context, event)
+            latency = perf_counter() - start
+            report["events"].append(
+                {"type": event.type, "value": event.value, "latency_ms": latency * 1000.0}
+            )
+            if tool.obj is not None:
+                points = [p.to_tuple() for p in world_points(tool.obj)]
+            if result & {"FINISHED", "CANCELLED"}:
+                break
+
+        report["status"] = sorted(result)[0]
+        report["result"] = points
+        by_type = {}
+        for entry in report["events"]:
+            by_type.setdefault(entry["type"], []).append(entry["latency_ms"] / 1000.0)
+        report["latency"] = {t: _summarize(v) for t, v in by_type.items()}
+        report["latency"]["ALL"] = _summarize(
+            [e["latency_ms"] / 1000.0 for e in report["events"]]
+        )
+
+        expected = recording.get("result")
+        if expected and points and len(expected) == len(points):
+            report["max_deviation"] = max(
+                (mathutils.Vector(a) - mathutils.Vector(b)).length
+                for a, b in zip(expected, points)
+            )
+
+        if not keep_result and tool.obj is not None:
+            bpy.data.objects.remove(tool.obj, do_unlink=True)
+            tool.obj = None
+    finally:
+        tool_settings.use_snap, tool_settings.snap_elements = saved_snap
+    return report
@@ -0,0 +1,107 @@
+# Restyling existing measurements from preferences or a saved preset
+#
+# New measurements take their inputs from the preferences when the tool
+# starts; restyle_measurements re-applies a parameter set to measurements
+# that already exist. Each modifier is diffed against its current inputs so
+# only changed values are written, and the view layer is updated once.
+# Placement inputs, which the tools adjust per measurement with the scroll
+# wheel, are left alone unless include_placement is set.
+#
+#     from measurement.core.restyle import load_style_preset, restyle_measurements
+#     params, is_relative = load_style_preset("drawing_standard.json")
+#     restyle_measurements(bpy.context, params, is_relative=is_relative)
+
+import json
+
+from ..constants import KEYMAP_REGISTRY, NODE_GROUP_NAMES
+from .batch import resolve_params
+from .measure import world_points
+from .nodegroup import base_name, find_wrapper_modifier
+from .params import apply_params_to_modifier, read_modifier_values
+from .sheet import is_sheet_object, restyle_sheet
+
+PRESET_VERSION = 1
+
+# Node group name -> tool type
+_TOOL_TYPES = {name: tool_type for tool_type, name in NODE_GROUP_NAMES.items()}
+
+# Inputs the tools adjust per measurement (Rotation, Offset, ...)
+PLACEMENT_SOCKETS = frozenset(b["param"][0] for b in KEYMAP_REGISTRY if b.get("param"))
+
+
+def measurement_tool_type(obj):
+    """Return "distance" or "angle" for a measurement object, else None."""
+    mod = find_wrapper_modifier(obj)
+    if mod is None or mod.node_group is None:
+        return None
+    return _TOOL_TYPES.get(base_name(mod.node_group.name))
+
+
+def iter_measurement_objects(context, selected_only=False):
+    """Yield measurement and sheet objects in the scene or the selection."""
+    objects = context.selected_objects if selected_only else context.scene.objects
+    for obj in objects:
+        if is_sheet_object(obj) or measurement_tool_type(obj) is not None:
+            yield obj
+
+
+def restyle_measurements(
+    context, params=None, objects=None, is_relative=None, update=True,
+    include_placement=False,
+):
+    """Apply params to existing measurements.
+
+    objects defaults to every measurement in the scene; params and
+    is_relative default to the preferences. The PLACEMENT_SOCKETS keep
+    their per-measurement values unless include_placement is True.
+    Returns the number of objects whose inputs changed.
+    """
+    params, is_relative = resolve_params(context, params, is_relative)
+    keep = ()
+    if not include_placement:
+        params = {k: v for k, v in params.items() if k not in PLACEMENT_SOCKETS}
+        keep = PLACEMENT_SOCKETS
+    if objects is None:
+        objects = iter_measurement_objects(context)
+
+    changed = 0
+    for obj in objects:
+        if is_sheet_object(obj):
+            if restyle_sheet(obj, params, is_relative, keep):
+                changed += 1
+            continue
+
+        tool_type = measurement_tool_type(obj)
+        if tool_type is None:
+            continue
+        mod = find_wrapper_modifier(obj)
+        written = read_modifier_values(mod)
+        if apply_params_to_modifier(
+            mod, params, tool_type, world_points(obj), is_relative, written
+        ):
+            obj.update_tag()
+            changed += 1
+
+    if update and changed:
+        context.view_layer.update()
+    return changed
+
+
+def save_style_preset(filepath, params, is_relative=False):
+    """Write a parameter set to a JSON preset file."""
+    preset = {
+        "version": PRESET_VERSION,
+        "relative": bool(is_relative),
+        "params": params,
+    }
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(preset, f, indent=2)
+
+
+def load_style_preset(filepath):
+    """Read a preset file. Returns (params, is_relative)."""
+    with open(filepath, encoding="utf-8") as f:
+        preset = json.load(f)
+    if not isinstance(preset, dict) or not isinstance(preset.get("params"), dict):
+        raise ValueError(f"{filepath} is not a measurement style preset")
+    return preset["params"], bool(preset.get("relative", False))
@@ -0,0 +1,138 @@
+# Screen-space snapping to vertices, edge midpoints and face centers
+#
+# The elements of every candidate object on screen are projected once per
+# view (and scene) change and sorted into square pixel buckets. A snap is
+# then a lookup of the cursor's bucket and its eight neighbors, so it costs
+# the same whatever is under the cursor, and it also finds wire edges,
+# edges seen edge-on and loose points that a ray can't hit. Elements are
+# not tested for occlusion.
+
+import mathutils
+import numpy as np
+
+from .snapping import (
+    SNAP_EDGE_MIDPOINT,
+    SNAP_FACE_CENTER,
+    SNAP_RADIUS_PX,
+    SNAP_VERTEX,
+    get_snap_kinds,
+)
+
+# Bucket size (pixels); the 3x3 neighborhood covers the snap radius
+BUCKET_PX = SNAP_RADIUS_PX
+
+# w below which a point counts as behind the view
+MIN_CLIP_W = 1e-6
+
+
+def element_points(geometry, kinds):
+    """Object-space snap points of an EvaluatedMesh for the given kinds."""
+    points = [np.empty((0, 3), dtype=np.float32)]
+    if SNAP_VERTEX in kinds:
+        points.append(geometry.co)
+    if SNAP_EDGE_MIDPOINT in kinds and len(geometry.edge_verts):
+        ev = geometry.edge_verts
+        points.append((geometry.co[ev[:, 0]] + geometry.co[ev[:, 1]]) * 0.5)
+    if SNAP_FACE_CENTER in kinds and len(geometry.centers):
+        points.append(geometry.centers)
+    return np.concatenate(points).astype(np.float64)
+
+
+class ScreenSnapGrid:
+    """Projected snap points of one view, bucketed by screen position."""
+
+    def __init__(self, view, items, kinds):
+        persp = np.array(view.perspective, dtype=np.float64)
+        half = np.array((view.width * 0.5, view.height * 0.5))
+        margin = SNAP_RADIUS_PX
+
+        worlds, screens, depths = [], [], []
+        for _, matrix, geometry in items:
+            local = element_points(geometry, kinds)
+            if not len(local):
+                continue
+            mw = np.array(matrix, dtype=np.float64)
+            world = local @ mw[:3, :3].T + mw[:3, 3]
+            clip = world @ persp[:3, :3].T + persp[:3, 3]
+            w = world @ persp[3, :3] + persp[3, 3]
+            front = w > MIN_CLIP_W
+            screen = (clip[front, :2] / w[front, None] + 1.0) * half
+            inside = (
+                (screen[:, 0] >= -margin) & (screen[:, 0] <= view.width + margin)
+                & (screen[:, 1] >= -margin) & (screen[:, 1] <= view.height + margin)
+            )
+            worlds.append(world[front][inside])
+            screens.append(screen[inside])
+            depths.append(w[front][inside])
+
+        if worlds:
+            world = np.concatenate(worlds)
+            screen = np.concatenate(screens)
+            depth = np.concatenate(depths)
+        else:
+            world = np.empty((0, 3))
+            screen = np.empty((0, 2))
+            depth = np.empty(0)
+
+        # Buckets are numbered row by row; one spare column on each side
+        self.columns = int(view.width // BUCKET_PX) + 3
+        ids = self._bucket_ids(screen)
+        order = np.argsort(ids, kind="stable")
+        self.ids = ids[order]
+        self.world = world[order]
+        self.screen = screen[order]
+        self.depth = depth[order]
+
+    def _bucket_ids(self, screen):
+        cells = np.floor(screen / BUCKET_PX).astype(np.int64) + 1
+        return cells[:, 1] * self.columns + cells[:, 0]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, coord, radius=SNAP_RADIUS_PX):
+        """World location of the nearest point within radius pixels of coord, or None."""
+        if not len(self.ids):
+            return None
+        center = self._bucket_ids(np.array([coord], dtype=np.float64))[0]
+        # Each row of the 3x3 neighborhood is a contiguous id range
+        starts = np.array([center - 1 - self.columns, center - 1, center - 1 + self.columns])
+        lo = np.searchsorted(self.ids, starts, side="left")
+        hi = np.searchsorted(self.ids, starts + 2, side="right")
+        index = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)])
+        if not len(index):
+            return None
+
+        d2 = ((self.screen[index] - coord) ** 2).sum(axis=1)
+        near = d2 <= radius * radius
+        if not near.any():
+            return None
+        index, d2 = index[near], d2[near]
+        # Closest on screen, then closest to the viewer
+        best = index[np.lexsort((self.depth[index], d2))[0]]
+        return mathutils.Vector(self.world[best].tolist())
+
+
+_grid = None
+_grid_key = None
+
+
+def get_grid(context, view, raycaster, kinds):
+    """Return the grid for the view, rebuilding it when the view, the scene
+    candidates or the snap kinds changed."""
+    global _grid, _grid_key
+    key = (view.key, raycaster.generation, frozenset(kinds))
+    if _grid is None or _grid_key != key:
+        items = raycaster.iter_geometry(context, view.region, view.rv3d)
+        _grid = ScreenSnapGrid(view, items, kinds)
+        _grid_key = key
+    return _grid
+
+
+def snap_to_screen_grid(context, view, coord, snap_elements, raycaster):
+    """Snap region coordinates to the nearest projected element, or None."""
+    kinds = get_snap_kinds(snap_elements)
+    if not kinds:
+        return None
+    return get_grid(context, view, raycaster, kinds).find(coord)
+
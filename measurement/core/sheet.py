@@ -0,0 +1,456 @@
+# Measurement sheets: many measurements stored in one mesh object
+#
+# Every measurement is a polyline (2 points for a distance, 3 for an angle)
+# in the sheet mesh. Point attributes record the measurement it belongs to,
+# its type and its numeric style inputs. A generated node group splits the
+# mesh per measurement and evaluates the distance or angle group for each
+# piece in a For Each Element zone. Menu, color and text inputs are shared
+# by the whole sheet and live on its modifier.
+
+import bpy
+import mathutils
+import numpy as np
+
+from ..constants import (
+    ANGLE_REF_SOCKETS,
+    FLOAT_TYPES,
+    INT_TYPES,
+    LENGTH_SCALED_SOCKETS,
+    NODE_GROUP_NAMES,
+    POINT_COUNTS,
+)
+from .measure import world_points
+from .nodegroup import create_wrapper_modifier, find_wrapper_modifier, get_asset_nodegroup
+from .params import measurement_metrics, resolve_param, scale_param_value, values_equal
+from .sockets import SocketInfo, get_socket_map
+
+SHEET_NAME = "Measurement Sheet"
+
+# Custom property marking sheet objects, and the next free measurement id
+SHEET_FLAG = "measure_sheet"
+NEXT_ID_PROP = "measure_next_id"
+
+ID_ATTRIBUTE = "measurement_id"
+TYPE_ATTRIBUTE = "measurement_type"
+STYLE_PREFIX = "style_"
+
+TYPE_INDEX = {"distance": 0, "angle": 1}
+
+# Inputs stored per measurement as point attributes
+STYLE_SOCKET_TYPES = FLOAT_TYPES | INT_TYPES | {"NodeSocketBool"}
+
+
+def iter_group_inputs(group):
+    for item in group.interface.items_tree:
+        if item.item_type == "SOCKET" and item.in_out == "INPUT":
+            yield item
+
+
+def is_style_input(item):
+    return item.socket_type in STYLE_SOCKET_TYPES
+
+
+def style_attribute_name(socket_name):
+    return STYLE_PREFIX + socket_name.lower().replace(" ", "_")
+
+
+def shared_input_name(tool_type, socket_name):
+    """Sheet modifier input standing for a measurement group input."""
+    return f"{NODE_GROUP_NAMES[tool_type].split()[0]} {socket_name}"
+
+
+def supports_sheets():
+    """Sheets need the For Each Element zone (Blender 4.3+)."""
+    return hasattr(bpy.types, "GeometryNodeForeachGeometryElementInput")
+
+
+# -- Node group -------------------------------------------------------------
+
+
+def _socket_of_type(sockets, socket_type, last=False):
+    matches = [s for s in sockets if s.type == socket_type]
+    if not matches:
+        return None
+    return matches[-1] if last else matches[0]
+
+
+def _socket_by_identifier(sockets, identifier):
+    return next((s for s in sockets if s.identifier == identifier), None)
+
+
+def _named_attribute(nodes, name, data_type, location):
+    node = nodes.new("GeometryNodeInputNamedAttribute")
+    node.data_type = data_type
+    node.inputs["Name"].default_value = name
+    node.location = location
+    return node
+
+
+def _attribute_mean(nodes, links, geometry, name, location):
+    """Mean of a float point attribute over geometry (one value per piece)."""
+    attr = _named_attribute(nodes, name, "FLOAT", location)
+    stat = nodes.new("GeometryNodeAttributeStatistic")
+    stat.data_type = "FLOAT"
+    stat.domain = "POINT"
+    stat.location = (location[0] + 200, location[1])
+    links.new(geometry, stat.inputs["Geometry"])
+    links.new(attr.outputs["Attribute"], stat.inputs["Attribute"])
+    return stat.outputs["Mean"]
+
+
+def build_sheet_group(groups):
+    """Generate the sheet node group around the distance and angle groups."""
+    tree = bpy.data.node_groups.new(SHEET_NAME, "GeometryNodeTree")
+    interface = tree.interface
+    interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+
+    nodes, links = tree.nodes, tree.links
+    group_in = nodes.new("NodeGroupInput")
+    group_in.location = (-1000, 0)
+    group_out = nodes.new("NodeGroupOutput")
+    group_out.location = (1400, 0)
+
+    # One instance per measurement
+    id_attr = _named_attribute(nodes, ID_ATTRIBUTE, "INT", (-1000, -200))
+    split = nodes.new("GeometryNodeSplitToInstances")
+    split.domain = "POINT"
+    split.location = (-800, 0)
+    links.new(_socket_of_type(group_in.outputs, "GEOMETRY"), split.inputs["Geometry"])
+    links.new(id_attr.outputs["Attribute"], split.inputs["Group ID"])
+
+    zone_in = nodes.new("GeometryNodeForeachGeometryElementInput")
+    zone_in.location = (-600, 0)
+    zone_out = nodes.new("GeometryNodeForeachGeometryElementOutput")
+    zone_out.location = (1200, 0)
+    zone_in.pair_with_output(zone_out)
+    zone_out.domain = "INSTANCE"
+    links.new(split.outputs["Instances"], _socket_of_type(zone_in.inputs, "GEOMETRY"))
+
+    realize = nodes.new("GeometryNodeRealizeInstances")
+    realize.location = (-400, 0)
+    links.new(_socket_of_type(zone_in.outputs, "GEOMETRY"), realize.inputs["Geometry"])
+    element = realize.outputs["Geometry"]
+
+    # Distance or angle group, chosen by the measurement type
+    type_mean = _attribute_mean(nodes, links, element, TYPE_ATTRIBUTE, (-200, 300))
+    compare = nodes.new("FunctionNodeCompare")
+    compare.data_type = "FLOAT"
+    compare.operation = "GREATER_THAN"
+    compare.inputs["B"].default_value = 0.5
+    compare.location = (200, 300)
+    links.new(type_mean, compare.inputs["A"])
+
+    switch = nodes.new("GeometryNodeSwitch")
+    switch.input_type = "GEOMETRY"
+    switch.location = (1000, 0)
+    links.new(compare.outputs["Result"], switch.inputs["Switch"])
+
+    means = {}
+    y = 0
+    for tool_type, slot in (("distance", "False"), ("angle", "True")):
+        group = groups[tool_type]
+        node = nodes.new("GeometryNodeGroup")
+        node.node_tree = group
+        node.location = (700, y)
+        y -= 600
+
+        for item in iter_group_inputs(group):
+            sock = _socket_by_identifier(node.inputs, item.identifier)
+            if sock is None:
+                continue
+            if item.socket_type == "NodeSocketGeometry":
+                links.new(element, sock)
+            elif is_style_input(item):
+                if item.name not in means:
+                    means[item.name] = _attribute_mean(
+                        nodes,
+                        links,
+                        element,
+                        style_attribute_name(item.name),
+                        (200, -200 * (len(means) + 1)),
+                    )
+                links.new(means[item.name], sock)
+            else:
+                shared = interface.new_socket(
+                    shared_input_name(tool_type, item.name),
+                    in_out="INPUT",
+                    socket_type=item.socket_type,
+                )
+                if hasattr(item, "default_value"):
+                    try:
+                        shared.default_value = item.default_value
+                    except Exception:
+                        pass
+                links.new(_socket_by_identifier(group_in.outputs, shared.identifier), sock)
+
+        links.new(_socket_of_type(node.outputs, "GEOMETRY"), switch.inputs[slot])
+
+    links.new(switch.outputs["Output"], _socket_of_type(zone_out.inputs, "GEOMETRY"))
+    links.new(
+        _socket_of_type(zone_out.outputs, "GEOMETRY", last=True),
+        _socket_of_type(group_out.inputs, "GEOMETRY"),
+    )
+    return tree
+
+
+def get_measurement_groups():
+    """Return {tool_type: node group}, or None if one can't be loaded."""
+    groups = {}
+    for tool_type, name in NODE_GROUP_NAMES.items():
+        group = get_asset_nodegroup(name)
+        if group is None:
+            return None
+        groups[tool_type] = group
+    return groups
+
+
+def get_sheet_group():
+    """Return the sheet node group, generating it on first use."""
+    group = bpy.data.node_groups.get(SHEET_NAME)
+    if group is not None:
+        return group
+    if not supports_sheets():
+        print("Measurement sheets need Blender 4.3 or newer.")
+        return None
+    groups = get_measurement_groups()
+    if groups is None:
+        return None
+    return build_sheet_group(groups)
+
+
+# -- Sheet objects ----------------------------------------------------------
+
+
+def is_sheet_object(obj):
+    return obj is not None and bool(obj.get(SHEET_FLAG))
+
+
+def find_sheet(context):
+    """Return the active sheet, else the first sheet in the scene."""
+    active = context.view_layer.objects.active
+    if is_sheet_object(active):
+        return active
+    return next((o for o in context.scene.objects if is_sheet_object(o)), None)
+
+
+def get_sheet(context, collection=None):
+    """Return the scene's sheet object, creating it (and its modifier) if needed."""
+    sheet = find_sheet(context)
+    if sheet is not None:
+        return sheet
+
+    group = get_sheet_group()
+    if group is None:
+        return None
+
+    mesh = bpy.data.meshes.new(SHEET_NAME)
+    sheet = bpy.data.objects.new(SHEET_NAME, mesh)
+    sheet[SHEET_FLAG] = True
+    sheet[NEXT_ID_PROP] = 0
+    (collection or context.collection).objects.link(sheet)
+    create_wrapper_modifier(sheet, group)
+    return sheet
+
+
+def _write_point_attribute(mesh, name, attr_type, values, start):
+    """Write values to points [start:] of an attribute, creating it if needed."""
+    attr = mesh.attributes.get(name)
+    if attr is None:
+        attr = mesh.attributes.new(name, attr_type, "POINT")
+    dtype = np.int32 if attr_type == "INT" else np.float32
+    data = np.empty(len(mesh.vertices), dtype=dtype)
+    attr.data.foreach_get("value", data)
+    data[start:] = values
+    attr.data.foreach_set("value", data)
+
+
+def _read_point_attribute(mesh, name, dtype):
+    attr = mesh.attributes.get(name)
+    if attr is None:
+        return None
+    data = np.empty(len(mesh.vertices), dtype=dtype)
+    attr.data.foreach_get("value", data)
+    return data
+
+
+def style_values(group, tool_type, points, params, is_relative):
+    """Return {attribute name: (N,) values} for the group's style inputs.
+
+    Inputs not set by params keep the group's default; relative and angle
+    scaling are applied per measurement as for separate objects.
+    """
+    infos = []
+    for item in iter_group_inputs(group):
+        if not is_style_input(item):
+            continue
+        info = SocketInfo(
+            item.name,
+            item.identifier,
+            item.socket_type,
+            None,
+            item.name in LENGTH_SCALED_SOCKETS,
+            ANGLE_REF_SOCKETS.get(item.name),
+        )
+        default = params.get(item.name, getattr(item, "default_value", 0))
+        infos.append((info, default))
+
+    values = {style_attribute_name(info.name): np.empty(len(points)) for info, _ in infos}
+    for i, row in enumerate(points):
+        world = [mathutils.Vector(p) for p in row.tolist()]
+        metrics = measurement_metrics(world, tool_type)
+        for info, default in infos:
+            val = scale_param_value(info, default, tool_type, is_relative, *metrics)
+            values[style_attribute_name(info.name)][i] = float(val)
+    return values
+
+
+def add_measurements(sheet, tool_type, points, params, is_relative):
+    """Append measurements to a sheet.
+
+    points is an (N, 2, 3) or (N, 3, 3) array in world space. Returns the ids
+    given to the new measurements.
+    """
+    count = POINT_COUNTS[tool_type]
+    points = np.asarray(points, dtype=np.float64).reshape(-1, count, 3)
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int32)
+
+    mesh = sheet.data
+    inv = np.array(sheet.matrix_world.inverted_safe())
+    local = points @ inv[:3, :3].T + inv[:3, 3]
+
+    v_start = len(mesh.vertices)
+    e_start = len(mesh.edges)
+    mesh.vertices.add(n * count)
+    mesh.edges.add(n * (count - 1))
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co[v_start * 3:] = local.ravel()
+    mesh.vertices.foreach_set("co", co)
+
+    first = v_start + np.arange(n, dtype=np.int32)[:, None] * count
+    steps = np.arange(count - 1, dtype=np.int32)
+    new_edges = np.stack((first + steps, first + steps + 1), axis=-1)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    edges[e_start * 2:] = new_edges.ravel()
+    mesh.edges.foreach_set("vertices", edges)
+
+    next_id = sheet.get(NEXT_ID_PROP, 0)
+    ids = np.arange(next_id, next_id + n, dtype=np.int32)
+    sheet[NEXT_ID_PROP] = next_id + n
+    _write_point_attribute(mesh, ID_ATTRIBUTE, "INT", np.repeat(ids, count), v_start)
+    _write_point_attribute(mesh, TYPE_ATTRIBUTE, "INT", TYPE_INDEX[tool_type], v_start)
+
+    group = get_asset_nodegroup(NODE_GROUP_NAMES[tool_type])
+    if group is not None:
+        for name, values in style_values(group, tool_type, points, params, is_relative).items():
+            _write_point_attribute(mesh, name, "FLOAT", np.repeat(values, count), v_start)
+
+    mesh.update()
+    apply_shared_params(sheet, params)
+    sheet.update_tag()
+    return ids
+
+
+def add_object(sheet, obj, tool_type, params, is_relative):
+    """Append a measurement object's points to a sheet. Doesn't delete obj."""
+    points = np.array([p.to_tuple() for p in world_points(obj)])
+    return add_measurements(sheet, tool_type, points[None], params, is_relative)
+
+
+def apply_shared_params(sheet, params):
+    """Write the shared (menu, color, text) inputs of a sheet's modifier.
+
+    These apply to every measurement on the sheet; the last values written
+    win. Returns True if anything changed.
+    """
+    mod = find_wrapper_modifier(sheet)
+    if not mod or not mod.node_group:
+        return False
+    socket_map = get_socket_map(mod)
+
+    changed = False
+    for tool_type, group_name in NODE_GROUP_NAMES.items():
+        group = bpy.data.node_groups.get(group_name)
+        if group is None:
+            continue
+        for item in iter_group_inputs(group):
+            if item.socket_type == "NodeSocketGeometry" or is_style_input(item):
+                continue
+            info = socket_map.by_name.get(shared_input_name(tool_type, item.name))
+            if info is None:
+                continue
+            val = resolve_param(
+                socket_map, info, params, tool_type == "distance", name=item.name
+            )
+            if val is None:
+                continue
+            if info.socket_type == "NodeSocketColor":
+                val = list(val)
+
+            current = mod.get(info.identifier)
+            if hasattr(current, "to_list"):
+                current = current.to_list()
+            if values_equal(current, val):
+                continue
+            try:
+                mod[info.identifier] = val
+                changed = True
+            except Exception as e:
+                print(f"Failed to set sheet parameter {info.name}: {e}")
+    return changed
+
+
+def restyle_sheet(sheet, params, is_relative, keep=()):
+    """Recompute the style attributes and shared inputs of every measurement
+    on a sheet from params. Only changed attributes are written; the style
+    inputs named in keep are left as they are. Returns True if anything
+    changed; the caller updates the view layer.
+    """
+    changed = apply_shared_params(sheet, params)
+    kept = {style_attribute_name(name) for name in keep}
+
+    mesh = sheet.data
+    ids = _read_point_attribute(mesh, ID_ATTRIBUTE, np.int32)
+    types = _read_point_attribute(mesh, TYPE_ATTRIBUTE, np.int32)
+    if ids is None or types is None or not len(ids):
+        return changed
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    mw = np.array(sheet.matrix_world)
+    world = co.reshape(-1, 3) @ mw[:3, :3].T + mw[:3, 3]
+
+    # Points of each measurement, in the order they were added
+    order = np.argsort(ids, kind="stable")
+    _, starts, counts = np.unique(ids[order], return_index=True, return_counts=True)
+    first_types = types[order][starts]
+
+    for tool_type, type_index in TYPE_INDEX.items():
+        count = POINT_COUNTS[tool_type]
+        selected = (counts == count) & (first_types == type_index)
+        group = bpy.data.node_groups.get(NODE_GROUP_NAMES[tool_type])
+        if group is None or not selected.any():
+            continue
+        vert_index = order[starts[selected][:, None] + np.arange(count)]
+        values = style_values(group, tool_type, world[vert_index], params, is_relative)
+
+        for name, vals in values.items():
+            if name in kept:
+                continue
+            current = _read_point_attribute(mesh, name, np.float32)
+            new = np.zeros(len(ids), dtype=np.float32) if current is None else current.copy()
+            new[vert_index.ravel()] = np.repeat(vals, count)
+            if current is not None and np.allclose(new, current):
+                continue
+            _write_point_attribute(mesh, name, "FLOAT", new, 0)
+            changed = True
+
+    if changed:
+        mesh.update()
+        sheet.update_tag()
+    return changed
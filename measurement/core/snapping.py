@@ -1,13 +1,273 @@
 # Snapping utilities for measurement tools
 
-import math
+from collections import deque
+from time import perf_counter
+
+import bpy
 import mathutils
+import numpy as np
 from bpy_extras import view3d_utils
+from mathutils.kdtree import KDTree
+
+from .evalmesh import evaluated_meshes
+from .viewcache import grid_step_for
+
+# Maximum screen distance (pixels) for snapping to geometry elements
+SNAP_RADIUS_PX = 20.0
+
+# Number of nearest candidates examined per element kind, keeps cost flat on dense meshes
+SNAP_MAX_CANDIDATES = 64
+
+# Meshes with more snap points than this build their KD-trees in timer
+# slices; lookups scan the point arrays until a kind's tree is ready
+SNAP_SYNC_POINTS = 50000
+
+# Time budget (seconds) per timer slice, and points inserted between clock checks
+BUILD_SLICE_SECONDS = 0.004
+BUILD_CHUNK = 2048
+
+SNAP_VERTEX = "VERTEX"
+SNAP_EDGE_MIDPOINT = "EDGE_MIDPOINT"
+SNAP_FACE_CENTER = "FACE_CENTER"
+
+
+def get_snap_kinds(snap_elements):
+    """Map tool setting snap elements to the element kinds used by SnapTree."""
+    kinds = set()
+    if "VERTEX" in snap_elements:
+        kinds.update((SNAP_VERTEX, SNAP_EDGE_MIDPOINT))
+    if "EDGE_MIDPOINT" in snap_elements:
+        kinds.add(SNAP_EDGE_MIDPOINT)
+    if "FACE_CENTER" in snap_elements:
+        kinds.add(SNAP_FACE_CENTER)
+    return kinds
+
+
+def pixels_per_unit(region, rv3d, loc, axis=None):
+    """Screen pixels covered by one world unit at loc, or None if off screen."""
+    if axis is None:
+        axis = mathutils.Vector((1.0, 0, 0))
+    p1 = view3d_utils.location_3d_to_region_2d(region, rv3d, loc)
+    if not p1:
+        return None
+    p2 = view3d_utils.location_3d_to_region_2d(region, rv3d, loc + axis)
+    if not p2:
+        return None
+    return (mathutils.Vector(p1) - mathutils.Vector(p2)).length
+
+
+class SnapTree:
+    """KD-trees over one mesh's vertices, edge midpoints and face centers.
+
+    Built from an EvaluatedMesh, so points are in the object space of the
+    evaluated geometry. Each kind has its own tree, so a lookup limited to
+    some kinds isn't crowded out by the others. Indices are laid out as
+    [vertices | edge midpoints | face centers].
+    """
+
+    def __init__(self, geometry):
+        co = geometry.co
+        edge_verts = geometry.edge_verts
+        midpoints = (co[edge_verts[:, 0]] + co[edge_verts[:, 1]]) * 0.5
+
+        self.points = {
+            SNAP_VERTEX: co,
+            SNAP_EDGE_MIDPOINT: midpoints,
+            SNAP_FACE_CENTER: geometry.centers,
+        }
+        self.offsets = {
+            SNAP_VERTEX: 0,
+            SNAP_EDGE_MIDPOINT: len(co),
+            SNAP_FACE_CENTER: len(co) + len(edge_verts),
+        }
+        self.num_verts = len(co)
+        self.num_edges = len(edge_verts)
+        self.edge_verts = edge_verts
+
+        self.trees = {}  # kind -> balanced KDTree
+        self._queue = deque(kind for kind, points in self.points.items() if len(points))
+        self._building = None  # (kind, KDTree, next point index)
+
+        if sum(len(p) for p in self.points.values()) <= SNAP_SYNC_POINTS:
+            self.build()
+        else:
+            _schedule_build(self)
+
+    @property
+    def is_built(self):
+        return not self._queue and self._building is None
+
+    def build(self, deadline=None):
+        """Insert points until the perf_counter() deadline, or all of them if
+        None. Returns True once every tree is balanced."""
+        while self._queue or self._building is not None:
+            if self._building is None:
+                kind = self._queue.popleft()
+                self._building = (kind, KDTree(len(self.points[kind])), 0)
+            kind, kd, start = self._building
+            points = self.points[kind]
+            stop = len(points) if deadline is None else min(len(points), start + BUILD_CHUNK)
+            for i, p in enumerate(points[start:stop].tolist(), start):
+                kd.insert(p, i)
+            if stop < len(points):
+                self._building = (kind, kd, stop)
+            else:
+                kd.balance()
+                self.trees[kind] = kd
+                self._building = None
+            if deadline is not None and perf_counter() >= deadline:
+                break
+        return self.is_built
+
+    def kind_of(self, index):
+        if index < self.num_verts:
+            return SNAP_VERTEX
+        if index < self.num_verts + self.num_edges:
+            return SNAP_EDGE_MIDPOINT
+        return SNAP_FACE_CENTER
+
+    def _nearest(self, kind, loc_local, radius_local):
+        """Yield (object-space location, index within the kind) of the points
+        of a kind within radius_local of loc_local, at most SNAP_MAX_CANDIDATES."""
+        tree = self.trees.get(kind)
+        if tree is not None:
+            for co, index, dist in tree.find_n(loc_local, SNAP_MAX_CANDIDATES):
+                if dist > radius_local:
+                    break
+                yield co, index
+            return
 
+        # Tree still being built: scan the points
+        points = self.points[kind]
+        if not len(points):
+            return
+        d2 = ((points - np.array(loc_local, dtype=points.dtype)) ** 2).sum(axis=1)
+        near = np.flatnonzero(d2 <= radius_local * radius_local)
+        if len(near) > SNAP_MAX_CANDIDATES:
+            near = near[np.argpartition(d2[near], SNAP_MAX_CANDIDATES)[:SNAP_MAX_CANDIDATES]]
+        for index in near.tolist():
+            yield mathutils.Vector(points[index].tolist()), index
 
-def apply_snapping(context, loc, region, rv3d, use_snap=None):
+    def find_nearest(self, matrix, loc, region, rv3d, coord, kinds, view=None):
+        """Return (world location, tree index) of the closest allowed element
+        within SNAP_RADIUS_PX of coord, or None.
+
+        view is an optional ViewState for the same region, used for projection.
+        """
+        if view is not None:
+            ppu = view.pixels_per_unit(loc, view.view_right)
+            project = view.project
+        else:
+            view_right = rv3d.view_rotation @ mathutils.Vector((1.0, 0, 0))
+            ppu = pixels_per_unit(region, rv3d, loc, view_right)
+
+            def project(co):
+                return view3d_utils.location_3d_to_region_2d(region, rv3d, co)
+        if not ppu or ppu < 0.00001:
+            return None
+
+        scale = min(abs(s) for s in matrix.to_scale())
+        radius_local = (SNAP_RADIUS_PX / ppu) / max(scale, 1e-9)
+        loc_local = matrix.inverted() @ loc
+        cursor = mathutils.Vector(coord)
+
+        best = None
+        best_px = SNAP_RADIUS_PX
+        for kind in kinds:
+            offset = self.offsets[kind]
+            for co, index in self._nearest(kind, loc_local, radius_local):
+                world_co = matrix @ co
+                screen_pos = project(world_co)
+                if not screen_pos:
+                    continue
+                px = (mathutils.Vector(screen_pos) - cursor).length
+                if px < best_px:
+                    best_px = px
+                    best = (world_co, offset + index)
+        return best
+
+
+_pending = deque()  # SnapTrees still being built
+_timer_registered = False
+
+
+def _schedule_build(tree):
+    global _timer_registered
+    _pending.append(tree)
+    if not _timer_registered:
+        bpy.app.timers.register(_build_slice, first_interval=0.0)
+        _timer_registered = True
+
+
+def _build_slice():
+    global _timer_registered
+    deadline = perf_counter() + BUILD_SLICE_SECONDS
+    while _pending and perf_counter() < deadline:
+        if _pending[0].build(deadline):
+            _pending.popleft()
+    if _pending:
+        return 0.01
+    _timer_registered = False
+    return None
+
+
+def get_snap_tree(geometry):
+    """Return the SnapTree of an EvaluatedMesh, building it on first use."""
+    if geometry.snap_tree is None:
+        geometry.snap_tree = SnapTree(geometry)
+    return geometry.snap_tree
+
+
+def nearest_vertex(geometry, loc_local):
+    """Return (index, object-space location) of the vertex of an EvaluatedMesh
+    nearest loc_local, or None if it has no vertices.
+
+    Uses the vertex tree of the geometry's SnapTree once it's built and
+    scans the vertex array otherwise, so no tree is built just for this.
+    """
+    snap_tree = geometry.snap_tree
+    tree = snap_tree.trees.get(SNAP_VERTEX) if snap_tree is not None else None
+    if tree is not None:
+        co, index, _ = tree.find(loc_local)
+        return index, co
+    co = geometry.co
+    if not len(co):
+        return None
+    d2 = ((co - np.array(loc_local, dtype=co.dtype)) ** 2).sum(axis=1)
+    index = int(d2.argmin())
+    return index, mathutils.Vector(co[index].tolist())
+
+
+def snap_to_geometry(obj, loc, region, rv3d, coord, snap_elements, depsgraph,
+                     matrix=None, key=None, view=None):
+    """Snap a ray hit to the nearest vertex/midpoint/face center of the
+    evaluated geometry that was hit.
+
+    For an instance, matrix is the instance's world matrix and key the
+    geometry key reported by the ray cast; both default to the object itself.
+    """
+    kinds = get_snap_kinds(snap_elements)
+    if not kinds:
+        return None
+    if key is None:
+        geometry = evaluated_meshes.get_object(obj, depsgraph)
+    else:
+        geometry = evaluated_meshes.get(key)
+    if geometry is None:
+        return None
+    if matrix is None:
+        matrix = obj.matrix_world
+    return get_snap_tree(geometry).find_nearest(
+        matrix, loc, region, rv3d, coord, kinds, view=view
+    )
+
+
+def apply_snapping(context, loc, region, rv3d, use_snap=None, view=None):
     """
     Apply snapping with adaptive grid scaling.
+
+    view is an optional ViewState for the region; its grid step is reused
+    while the view doesn't change.
     """
     if use_snap is None:
         use_snap = context.tool_settings.use_snap
@@ -20,22 +280,10 @@ def apply_snapping(context, loc, region, rv3d, use_snap=None):
     if "INCREMENT" in snap_elements:
         grid_scale = 1.0
 
-        if region and rv3d:
-            p1 = view3d_utils.location_3d_to_region_2d(region, rv3d, loc)
-            if p1:
-                p2 = view3d_utils.location_3d_to_region_2d(
-                    region, rv3d, loc + mathutils.Vector((1.0, 0, 0))
-                )
-                if p2:
-                    pixels_per_unit = (
-                        mathutils.Vector(p1) - mathutils.Vector(p2)
-                    ).length
-
-                    if pixels_per_unit > 0.00001:
-                        target_px = 30.0
-                        raw_step = target_px / pixels_per_unit
-                        exponent = math.floor(math.log10(raw_step))
-                        grid_scale = 10**exponent
+        if view is not None:
+            grid_scale = view.grid_step(loc)
+        elif region and rv3d:
+            grid_scale = grid_step_for(pixels_per_unit(region, rv3d, loc))
 
         if context.scene.unit_settings.system != "NONE":
             grid_scale *= context.scene.unit_settings.scale_length
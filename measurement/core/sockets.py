@@ -0,0 +1,126 @@
+# Compiled input socket maps for measurement node groups
+
+from collections import namedtuple
+
+from ..constants import ANGLE_REF_SOCKETS, ENUM_FALLBACKS, LENGTH_SCALED_SOCKETS
+from .handlers import depsgraph_callback, load_callback, undo_callback
+
+SocketInfo = namedtuple(
+    "SocketInfo",
+    ["name", "identifier", "socket_type", "enum_items", "length_scaled", "ref_angle"],
+)
+
+# Socket names whose values are set from enum strings
+ENUM_SOCKETS = {"Output Type", "Unit"}
+
+
+def read_enum_items(mod, identifier):
+    """Return {item identifier or name: value} for an enum modifier input."""
+    try:
+        items = mod.id_properties_ui(identifier).as_dict().get("items", [])
+    except Exception:
+        return {}
+    enum_items = {}
+    for item in items:
+        enum_items.setdefault(item[0], item[4])
+        enum_items.setdefault(item[1], item[4])
+    return enum_items
+
+
+class SocketMap:
+    """Input sockets of one node group, resolved once."""
+
+    def __init__(self, mod):
+        group = mod.node_group
+        self.group_name = group.name
+        self.inputs = []
+        self.by_name = {}
+        self._find_cache = {}
+
+        for item in group.interface.items_tree:
+            if item.item_type != "SOCKET" or item.in_out != "INPUT":
+                continue
+            enum_items = None
+            if item.socket_type == "NodeSocketMenu" or item.name in ENUM_SOCKETS:
+                enum_items = read_enum_items(mod, item.identifier)
+            info = SocketInfo(
+                item.name,
+                item.identifier,
+                item.socket_type,
+                enum_items,
+                item.name in LENGTH_SCALED_SOCKETS,
+                ANGLE_REF_SOCKETS.get(item.name),
+            )
+            self.inputs.append(info)
+            self.by_name.setdefault(item.name, info)
+
+    def find(self, keyword, valid_types):
+        """Find an input by exact name, then by substring (case-insensitive)."""
+        key = (keyword, frozenset(valid_types))
+        if key in self._find_cache:
+            return self._find_cache[key]
+
+        keyword_lower = keyword.lower()
+        candidates = [s for s in self.inputs if s.socket_type in valid_types]
+        found = next((s for s in candidates if s.name.lower() == keyword_lower), None)
+        if found is None:
+            found = next((s for s in candidates if keyword_lower in s.name.lower()), None)
+        self._find_cache[key] = found
+        return found
+
+    def enum_value(self, info, value_str, fallback_key, default_idx):
+        """Map an enum string to the index stored on the modifier."""
+        if info.enum_items and value_str in info.enum_items:
+            return info.enum_items[value_str]
+        return ENUM_FALLBACKS.get(fallback_key, {}).get(value_str, default_idx)
+
+    def enum_name(self, info, value, fallback_key, default=None):
+        """Map an enum index stored on the modifier back to its item name."""
+        fallbacks = ENUM_FALLBACKS.get(fallback_key, {})
+        names = [k for k, v in (info.enum_items or {}).items() if v == value]
+        # Prefer the names used by the preferences, then any item name
+        for name in names:
+            if name in fallbacks:
+                return name
+        if names:
+            return names[-1]
+        return next((k for k, v in fallbacks.items() if v == value), default)
+
+
+_socket_maps = {}  # node group pointer -> SocketMap
+
+
+def get_socket_map(mod):
+    """Return the compiled socket map for a modifier's node group.
+
+    Maps are dropped when the depsgraph reports the node group updated (or
+    uistate's msgbus subscription reports a socket rename), so a hit is a
+    single dictionary lookup.
+    """
+    group = mod.node_group
+    if group is None:
+        return None
+    key = group.as_pointer()
+    socket_map = _socket_maps.get(key)
+    if socket_map is None:
+        socket_map = SocketMap(mod)
+        _socket_maps[key] = socket_map
+    return socket_map
+
+
+def invalidate_socket_map(group):
+    _socket_maps.pop(group.as_pointer(), None)
+
+
+@depsgraph_callback
+def invalidate_socket_maps(scene, depsgraph):
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if getattr(id_data, "id_type", None) == "NODETREE":
+            invalidate_socket_map(id_data)
+
+
+@load_callback
+@undo_callback
+def clear_socket_maps():
+    _socket_maps.clear()
@@ -0,0 +1,126 @@
+# Active tool and preference values cached between change notifications
+#
+# The modal tools used to look up the active workspace tool on every event,
+# and the scroll handler and help overlay read the addon preferences on
+# every scroll and redraw. These values only change when the user switches
+# tools or edits the preferences, so they are cached here and dropped when
+# bpy.msgbus reports a tool change, when a preference's update callback
+# runs, or when a file is loaded.
+
+from types import SimpleNamespace
+
+import bpy
+
+from .handlers import load_callback, undo_callback
+
+# Owner of this module's msgbus subscriptions
+_owner = object()
+
+_active_tools = {}  # (workspace pointer, mode) -> tool idname or None
+_prefs = None       # SimpleNamespace of the PREF_DEFAULTS names, or None until read
+
+# Values used when the addon preferences are unavailable
+PREF_DEFAULTS = {
+    "show_help_overlay": True,
+    "help_pos_x": 20,
+    "help_pos_y": 20,
+    "angle_increment": 5,
+    "distance_increment": 0.01,
+}
+
+
+# -- Active tool --------------------------------------------------------------
+
+
+def active_tool(context):
+    """idname of the active 3D view tool of the context's workspace and mode."""
+    workspace = context.workspace
+    if workspace is None:
+        return None
+    key = (workspace.as_pointer(), context.mode)
+    if key not in _active_tools:
+        try:
+            tool = workspace.tools.from_space_view3d_mode(context.mode)
+        except Exception:
+            tool = None
+        _active_tools[key] = tool.idname if tool else None
+    return _active_tools[key]
+
+
+def invalidate_active_tool(*args):
+    _active_tools.clear()
+
+
+# -- Preferences --------------------------------------------------------------
+
+
+def prefs_snapshot(context=None):
+    """The preference values read by the modal tools and the help overlay."""
+    global _prefs
+    if _prefs is None:
+        context = context or bpy.context
+        addon = context.preferences.addons.get("measurement")
+        prefs = addon.preferences if addon else None
+        values = {
+            name: getattr(prefs, name, default) if prefs else default
+            for name, default in PREF_DEFAULTS.items()
+        }
+        _prefs = SimpleNamespace(**values)
+    return _prefs
+
+
+def invalidate_prefs(*args):
+    """Preference update callback: read the values again on next use."""
+    global _prefs
+    _prefs = None
+
+
+# -- Subscriptions ------------------------------------------------------------
+
+
+def _on_socket_renamed(*args):
+    from . import sockets
+
+    sockets.clear_socket_maps()
+
+
+def subscribe():
+    """Subscribe to the changes that invalidate the cached values.
+
+    Subscriptions are dropped when a file is loaded, so this runs again
+    from the load callback.
+    """
+    bpy.msgbus.clear_by_owner(_owner)
+    for key in ((bpy.types.WorkSpace, "tools"), (bpy.types.Window, "workspace")):
+        bpy.msgbus.subscribe_rna(
+            key=key, owner=_owner, args=(), notify=invalidate_active_tool
+        )
+    # Renaming an interface socket doesn't always cause a depsgraph update
+    socket_type = getattr(bpy.types, "NodeTreeInterfaceSocket", None)
+    if socket_type is not None:
+        bpy.msgbus.subscribe_rna(
+            key=(socket_type, "name"), owner=_owner, args=(), notify=_on_socket_renamed
+        )
+
+
+def unsubscribe():
+    bpy.msgbus.clear_by_owner(_owner)
+    clear_ui_state()
+
+
+def clear_ui_state():
+    global _prefs
+    _active_tools.clear()
+    _prefs = None
+
+
+@load_callback
+def resubscribe():
+    clear_ui_state()
+    subscribe()
+
+
+@undo_callback
+def reset_active_tool():
+    """Undo can restore another workspace or tool."""
+    _active_tools.clear()
@@ -0,0 +1,61 @@
+# Unit conversion and formatting of measured values
+
+import math
+
+# Meters per unit and display suffix for the distance units of the node groups
+LENGTH_UNITS = {
+    "Meter": (1.0, "m"),
+    "Foot": (0.3048, "ft"),
+    "Inch": (0.0254, "in"),
+}
+
+
+def length_factor(unit):
+    """Multiplier converting meters to the given unit (Foot-Inch -> inches)."""
+    if unit == "Foot-Inch":
+        return 1.0 / 0.0254
+    factor, _ = LENGTH_UNITS.get(unit, (1.0, "m"))
+    return 1.0 / factor
+
+
+def angle_factor(unit):
+    """Multiplier converting degrees to the given unit."""
+    return math.pi / 180.0 if unit == "Radian" else 1.0
+
+
+def convert_length(value, unit):
+    """Convert a length in meters to the given unit (Foot-Inch -> inches)."""
+    return value * length_factor(unit)
+
+
+def convert_angle(degrees, unit):
+    return degrees * angle_factor(unit)
+
+
+def unit_suffix(unit):
+    """Display suffix of a length or angle unit."""
+    if unit == "Foot-Inch":
+        return "in"
+    if unit == "Degree":
+        return "°"
+    if unit == "Radian":
+        return "rad"
+    return LENGTH_UNITS.get(unit, (1.0, "m"))[1]
+
+
+def format_length(value, unit="Meter", precision=2):
+    """Format a length in meters for display."""
+    if unit == "Foot-Inch":
+        total_inches = value / 0.0254
+        feet = int(total_inches // 12)
+        inches = total_inches - feet * 12
+        return f"{feet}' {inches:.{precision}f}\""
+    _, suffix = LENGTH_UNITS.get(unit, (1.0, "m"))
+    return f"{convert_length(value, unit):.{precision}f} {suffix}"
+
+
+def format_angle(degrees, unit="Degree", precision=2):
+    """Format an angle given in degrees for display."""
+    if unit == "Radian":
+        return f"{convert_angle(degrees, unit):.{precision}f} rad"
+    return f"{degrees:.{precision}f}°"
@@ -0,0 +1,188 @@
+# Per-view state reused across the events of a tool run
+#
+# Finding the WINDOW region, the rectangles of the UI regions, the inverse
+# view matrices and the adaptive grid step only depends on the view. A
+# ViewCache keeps them in a ViewState and only rebuilds it when the view
+# matrix, the region or the area changes, so mouse moves over a static view
+# skip that work. The projection helpers give the same results as
+# bpy_extras.view3d_utils.
+
+import math
+
+import mathutils
+from mathutils.geometry import intersect_line_plane, intersect_point_line
+
+# Screen size (pixels) of one step of the adaptive snapping grid
+GRID_TARGET_PX = 30.0
+
+
+def grid_step_for(ppu):
+    """Power of ten grid step closest to GRID_TARGET_PX pixels."""
+    if not ppu or ppu <= 0.00001:
+        return 1.0
+    return 10 ** math.floor(math.log10(GRID_TARGET_PX / ppu))
+
+
+def find_window_region(area):
+    return next((r for r in area.regions if r.type == "WINDOW"), None)
+
+
+def _rect(item):
+    return (item.x, item.y, item.x + item.width, item.y + item.height)
+
+
+def _inside(rect, x, y):
+    return rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]
+
+
+class ViewState:
+    """Region, matrices and derived values of one 3D view."""
+
+    def __init__(self, area, region, key):
+        rv3d = region.data
+        self.key = key
+        self.area = area
+        self.region = region
+        self.rv3d = rv3d
+        self.width = region.width
+        self.height = region.height
+        self.area_rect = _rect(area)
+        self.ui_rects = [_rect(r) for r in area.regions if r.type != "WINDOW"]
+
+        self.is_perspective = rv3d.is_perspective
+        self.is_camera = rv3d.view_perspective == "CAMERA"
+        self.perspective = rv3d.perspective_matrix.copy()
+        self.perspective_inv = self.perspective.inverted()
+        self.view_inv = rv3d.view_matrix.inverted()
+        self.view_right = rv3d.view_rotation @ mathutils.Vector((1.0, 0, 0))
+
+        # Orthographic views have the same scale at every depth
+        self._ortho_ppu = None if self.is_perspective else self._pixels_per_unit(
+            self.view_inv.translation, mathutils.Vector((1.0, 0, 0))
+        )
+        self._ortho_grid = None if self.is_perspective else grid_step_for(self._ortho_ppu)
+
+    # -- UI -----------------------------------------------------------------
+
+    def region_coord(self, event):
+        return (event.mouse_x - self.region.x, event.mouse_y - self.region.y)
+
+    def over_ui_region(self, x, y):
+        """True if window coordinates (x, y) are over a header, toolbar, sidebar..."""
+        return any(_inside(rect, x, y) for rect in self.ui_rects)
+
+    def over_ui(self, x, y):
+        return not _inside(self.area_rect, x, y) or self.over_ui_region(x, y)
+
+    # -- Projection -----------------------------------------------------------
+
+    def _ndc(self, coord):
+        return (2.0 * coord[0] / self.width) - 1.0, (2.0 * coord[1] / self.height) - 1.0
+
+    def ray_vector(self, coord):
+        """Same as view3d_utils.region_2d_to_vector_3d."""
+        if self.is_perspective:
+            dx, dy = self._ndc(coord)
+            persinv = self.perspective_inv
+            out = mathutils.Vector((dx, dy, -0.5))
+            w = out.dot(persinv[3].xyz) + persinv[3][3]
+            vector = ((persinv @ out) / w) - self.view_inv.translation
+        else:
+            vector = -self.view_inv.col[2].xyz
+        return vector.normalized()
+
+    def ray_origin(self, coord):
+        """Same as view3d_utils.region_2d_to_origin_3d."""
+        if self.is_perspective:
+            return self.view_inv.translation.copy()
+        dx, dy = self._ndc(coord)
+        persinv = self.perspective_inv
+        origin = persinv.col[0].xyz * dx + persinv.col[1].xyz * dy + persinv.translation
+        if not self.is_camera:
+            origin -= persinv.col[2].xyz
+        return origin
+
+    def location_on_plane(self, coord, depth_location):
+        """Same as view3d_utils.region_2d_to_location_3d."""
+        vector = self.ray_vector(coord)
+        origin = self.ray_origin(coord)
+        depth_location = mathutils.Vector(depth_location)
+        if self.is_perspective:
+            return intersect_line_plane(
+                origin, origin + vector, depth_location, self.view_inv.col[2].xyz, True
+            )
+        return intersect_point_line(depth_location, origin, origin + vector)[0]
+
+    def project(self, loc):
+        """Same as view3d_utils.location_3d_to_region_2d."""
+        prj = self.perspective @ mathutils.Vector((loc[0], loc[1], loc[2], 1.0))
+        if prj.w <= 0.0:
+            return None
+        half_w = self.width / 2.0
+        half_h = self.height / 2.0
+        return mathutils.Vector((half_w + half_w * (prj.x / prj.w), half_h + half_h * (prj.y / prj.w)))
+
+    def _pixels_per_unit(self, loc, axis):
+        p1 = self.project(loc)
+        p2 = self.project(loc + axis)
+        if p1 is None or p2 is None:
+            return None
+        return (p1 - p2).length
+
+    def pixels_per_unit(self, loc, axis=None):
+        """Screen pixels covered by one world unit at loc, or None if off screen."""
+        if axis is None and self._ortho_ppu is not None:
+            return self._ortho_ppu
+        if axis is None:
+            axis = mathutils.Vector((1.0, 0, 0))
+        return self._pixels_per_unit(loc, axis)
+
+    def grid_step(self, loc):
+        """Adaptive snapping grid step at loc."""
+        if self._ortho_grid is not None:
+            return self._ortho_grid
+        return grid_step_for(self.pixels_per_unit(loc))
+
+
+class ViewCache:
+    """The ViewState of the view a tool runs in, rebuilt when the view changes.
+
+    Owned by one tool run; regions aren't kept beyond it.
+    """
+
+    def __init__(self):
+        self.state = None
+
+    def get(self, context):
+        area = context.area
+        if area is None:
+            return None
+        state = self.state
+        region = context.region
+        if region is None or region.type != "WINDOW":
+            if state is not None and state.area == area:
+                region = state.region
+            else:
+                region = find_window_region(area)
+                if region is None:
+                    return None
+
+        rv3d = region.data
+        key = (
+            tuple(map(tuple, rv3d.perspective_matrix)),
+            region.x,
+            region.y,
+            region.width,
+            region.height,
+            area.x,
+            area.y,
+            area.width,
+            area.height,
+        )
+        if state is None or state.key != key:
+            state = self.state = ViewState(area, region, key)
+        return state
+
+    def invalidate(self):
+        """Force a rebuild, e.g. when UI regions may have been resized."""
+        self.state = None
@@ -2,9 +2,24 @@
 from .base import BaseDrawTool
 from .distance import MOUSE_OT_draw_distance
 from .angle import MOUSE_OT_draw_angle
+from .batch import MEASURE_OT_import_csv, menu_func_import
+from .profiling import MEASURE_OT_dump_profile
+from .replay import MEASURE_OT_save_recording
+from .nodegroups import MEASURE_OT_dedupe_nodegroups
+from .restyle import MEASURE_OT_restyle, MEASURE_OT_save_style_preset
+from .export import MEASURE_OT_export_values, menu_func_export
 
 __all__ = [
     "BaseDrawTool",
     "MOUSE_OT_draw_distance",
     "MOUSE_OT_draw_angle",
+    "MEASURE_OT_import_csv",
+    "menu_func_import",
+    "MEASURE_OT_dump_profile",
+    "MEASURE_OT_save_recording",
+    "MEASURE_OT_dedupe_nodegroups",
+    "MEASURE_OT_restyle",
+    "MEASURE_OT_save_style_preset",
+    "MEASURE_OT_export_values",
+    "menu_func_export",
 ]
@@ -3,11 +3,9 @@
 import bpy
 import bmesh
 import mathutils
+from time import perf_counter
 
-from .base import BaseDrawTool, get_prefs
-from ..constants import FLOAT_TYPES, INT_TYPES
-from ..core.nodegroup import create_wrapper_modifier, get_asset_nodegroup
-from ..core.drawing import unregister_draw_handler
+from .base import BaseDrawTool, drawing, nodegroup, raycast
 
 
 class MOUSE_OT_draw_angle(BaseDrawTool):
@@ -18,17 +16,13 @@ class MOUSE_OT_draw_angle(BaseDrawTool):
     bl_idname_tool = "my_tool.angle_tool"
     tool_type = "angle"
 
-    def get_scroll_bindings(self):
-        bindings = super().get_scroll_bindings()
-        prefs = get_prefs(bpy.context)
-        step = prefs.distance_increment if prefs else 0.01
-        bindings["CTRL"] = ("Radius", step, FLOAT_TYPES)
-        return bindings
-
-    def invoke(self, context, event):
+    def init_state(self, context):
+        super().init_state(context)
         self.phase = 0
         self.waiting_for_move = False
         self.pending_point_loc = None
+
+    def invoke(self, context, event):
         self.report({"INFO"}, "Click 3 points for angle.")
         return super().invoke(context, event)
 
@@ -36,6 +30,7 @@ class MOUSE_OT_draw_angle(BaseDrawTool):
         mesh = bpy.data.meshes.new("Angle Measurement")
         self.obj = bpy.data.objects.new("Angle Measurement", mesh)
         context.collection.objects.link(self.obj)
+        raycast.scene_raycaster.ignore(self.obj)
         bm = bmesh.new()
         v1 = bm.verts.new(loc)
         v2 = bm.verts.new(loc)
@@ -64,112 +59,119 @@ class MOUSE_OT_draw_angle(BaseDrawTool):
         bm.free()
         self.obj.data.update()
 
-    def modal(self, context, event):
+    def on_mouse_move(self, context, event):
+        loc = self.get_location(context, event)
+
+        if self.waiting_for_move and self.phase == 1 and loc:
+            dist = (mathutils.Vector(loc) - mathutils.Vector(self.pending_point_loc)).length
+            if dist > 0.001:
+                self.add_point(self.pending_point_loc)
+                # Add modifier when we have 3 points
+                target_group = nodegroup.get_asset_nodegroup("Angle Measurement")
+                if target_group:
+                    mod = nodegroup.create_wrapper_modifier(self.obj, target_group)
+                    self.begin_preview(context, mod)
+                    self.apply_session_params_to_modifier(context)
+                self.phase = 2
+                self.waiting_for_move = False
+
+        if self.drawing and self.obj:
+            prof = self.profiler
+            if prof:
+                start = perf_counter()
+            target_idx = 1 if self.phase == 1 else 2
+            self.update_geometry(loc, target_idx)
+            if prof:
+                prof.lap("mesh", start)
+            self.apply_session_params_to_modifier(context)
+
+    def handle_modal(self, context, event):
         if not context.area:
             self.cancel_op(context)
             return {"CANCELLED"}
 
-        context.area.tag_redraw()
+        # Coalesced mouse moves are delivered on timer ticks
+        if event.type == "TIMER":
+            self.handle_timer_event(context)
+            return {"PASS_THROUGH"}
 
         # 1. Pass Through Checks
         if self.is_over_ui(context, event):
             if self.drawing and event.type == "MOUSEMOVE":
                 pass
             else:
-                self.mouse_loc_3d = None
+                self.clear_preview(context)
                 return {"PASS_THROUGH"}
 
         exit_code = self.check_exit(context, event)
         if exit_code is True:
             return {"CANCELLED"}
 
-        # Handle common keys (e.g., Ctrl+Alt+H to toggle help)
-        if self.handle_common_keys(context, event):
+        if event.type == "MOUSEMOVE":
+            self.handle_move_event(context, event)
             return {"RUNNING_MODAL"}
 
-        if event.type in {
-            "MIDDLEMOUSE",
-            "WHEELUPMOUSE",
-            "WHEELDOWNMOUSE",
-            "NUMPAD_PLUS",
-            "NUMPAD_MINUS",
-        } and not (event.shift or event.ctrl or event.alt):
-            return {"PASS_THROUGH"}
+        # Any other input acts on the latest mouse position
+        self.flush_pending_move(context)
 
-        if self.handle_modal_scroll(context, event):
-            return {"RUNNING_MODAL"}
+        # Clicks, keys and scrolling from KEYMAP_REGISTRY
+        return self.dispatch_event(context, event) or {"PASS_THROUGH"}
 
-        if event.type == "BACK_SPACE" and event.value == "PRESS":
-            if self.phase == 2:
-                bm = bmesh.new()
-                bm.from_mesh(self.obj.data)
-                bm.verts.ensure_lookup_table()
-                bm.verts.remove(bm.verts[-1])
-                bm.to_mesh(self.obj.data)
-                bm.free()
-                self.obj.data.update()
-
-                # Remove modifier when going back to 2 points
-                mod = self.obj.modifiers.get("Wrap_Angle Measurement")
-                if mod:
-                    self.obj.modifiers.remove(mod)
-
-                self.phase = 1
-                if self.mouse_loc_3d:
-                     self.update_geometry(self.mouse_loc_3d, 1)
-                return {"RUNNING_MODAL"}
+    # -- KEYMAP_REGISTRY handlers ---------------------------------------------
 
-        if event.type == "MOUSEMOVE":
-            loc = self.get_location(context, event)
-
-            if self.waiting_for_move and self.phase == 1 and loc:
-                dist = (mathutils.Vector(loc) - mathutils.Vector(self.pending_point_loc)).length
-                if dist > 0.001:
-                    self.add_point(self.pending_point_loc)
-                    # Add modifier when we have 3 points
-                    target_group = get_asset_nodegroup("Angle Measurement")
-                    if target_group:
-                        create_wrapper_modifier(self.obj, target_group)
-                        self.apply_session_params_to_modifier(context)
-                    self.phase = 2
-                    self.waiting_for_move = False
-
-            if self.drawing and self.obj:
-                target_idx = 1 if self.phase == 1 else 2
-                self.update_geometry(loc, target_idx)
-                self.apply_session_params_to_modifier(context)
-            return {"RUNNING_MODAL"}
+    def remove_point(self, context, event, action):
+        if self.phase != 2:
+            return None
+        bm = bmesh.new()
+        bm.from_mesh(self.obj.data)
+        bm.verts.ensure_lookup_table()
+        bm.verts.remove(bm.verts[-1])
+        bm.to_mesh(self.obj.data)
+        bm.free()
+        self.obj.data.update()
 
-        elif event.type == "LEFTMOUSE" and event.value == "PRESS":
-            if not self.drawing:
-                for region in context.area.regions:
-                    if region.type != "WINDOW":
-                        if (
-                            region.x <= event.mouse_x <= region.x + region.width
-                            and region.y <= event.mouse_y <= region.y + region.height
-                        ):
-                            return {"PASS_THROUGH"}
-
-                loc = self.get_location(context, event)
-                if loc:
-                    self.start_point = loc
-                    self.create_angle_object(context, loc)
-                    self.drawing = True
-                    self.phase = 1
-                    if self._handle:
-                        unregister_draw_handler(self._handle)
-                        self._handle = None
-                return {"RUNNING_MODAL"}
+        # Remove modifier when going back to 2 points
+        mod = self.obj.modifiers.get("Wrap_Angle Measurement")
+        if mod:
+            self.end_preview(context)
+            self.obj.modifiers.remove(mod)
+            self.reset_written_values()
 
-            else:
-                loc = self.get_location(context, event)
-                if self.phase == 1:
-                    # self.add_point(loc) -> Delayed
-                    self.pending_point_loc = loc
-                    self.waiting_for_move = True
-                elif self.phase == 2:
-                    self.remove_draw_handlers(context)
-                    return {"FINISHED"}
-                return {"RUNNING_MODAL"}
-
-        return {"PASS_THROUGH"}
+        self.phase = 1
+        if self.mouse_loc_3d:
+             self.update_geometry(self.mouse_loc_3d, 1)
+        context.area.tag_redraw()
+        return {"RUNNING_MODAL"}
+
+    def set_vertex(self, context, event, action):
+        view = self.view_cache.get(context)
+        if view and view.over_ui_region(event.mouse_x, event.mouse_y):
+            return {"PASS_THROUGH"}
+
+        loc = self.get_location(context, event)
+        if loc:
+            self.start_point = loc
+            self.bind_point(0)
+            self.create_angle_object(context, loc)
+            self.drawing = True
+            self.phase = 1
+            if self._handle:
+                drawing.unregister_draw_handler(self._handle)
+                self._handle = None
+        context.area.tag_redraw()
+        return {"RUNNING_MODAL"}
+
+    def set_next_vertex(self, context, event, action):
+        loc = self.get_location(context, event)
+        if self.phase == 1:
+            # self.add_point(loc) -> Delayed
+            self.pending_point_loc = loc
+            self.bind_point(1)
+            self.waiting_for_move = True
+        elif self.phase == 2:
+            self.bind_point(2)
+            self.end_preview(context)
+            self.remove_draw_handlers(context)
+            self.store_measurement(context)
+            return {"FINISHED"}
+        return {"RUNNING_MODAL"}
@@ -1,18 +1,30 @@
 # Base operator class for measurement tools
 
+from time import perf_counter
+
 import bpy
-import mathutils
 from bpy.types import Operator
-from bpy_extras import view3d_utils
 
 from ..constants import FLOAT_TYPES, INT_TYPES
-from ..core.drawing import draw_callback_px, draw_help_overlay, register_draw_handler, unregister_operator_handlers
-from ..core.snapping import apply_snapping
-
-
-def get_prefs(context):
-    addon = context.preferences.addons.get("measurement")
-    return addon.preferences if addon else None
+from ..core import attach, keymap, uistate
+from ..core.viewcache import ViewCache
+from ..core.events import MoveScheduler
+from ..core.lazy import lazy_import
+from ..core.measure import actual_length, angle_info, world_points
+from ..core.params import apply_params_to_modifier, session_params_from_prefs
+from ..core.prewarm import schedule_prewarm
+from ..core.profiling import get_profiler
+from ..core.sockets import get_socket_map
+from ..preferences import get_prefs
+
+# Loaded on first tool use rather than at addon registration
+drawing = lazy_import("..core.drawing", __package__)
+nodegroup = lazy_import("..core.nodegroup", __package__)
+raycast = lazy_import("..core.raycast", __package__)
+screensnap = lazy_import("..core.screensnap", __package__)
+replay = lazy_import("..core.replay", __package__)
+sheet = lazy_import("..core.sheet", __package__)
+snapping = lazy_import("..core.snapping", __package__)
 
 
 class BaseDrawTool(Operator):
@@ -23,118 +35,213 @@ class BaseDrawTool(Operator):
     tool_type = None
 
     def invoke(self, context, event):
+        self.init_state(context)
+
+        prefs = get_prefs(context)
+        if prefs and prefs.prewarm_mode != 'OFF':
+            # Runs once per file; no-op after the first successful prewarm
+            schedule_prewarm(delay=0.0)
+
+        if context.area.type == "VIEW_3D":
+            if self.recorder:
+                self.recorder.add(event)
+            raycast.scene_raycaster.begin(context)
+            self.get_location(context, event)
+            self._handle = drawing.register_draw_handler(
+                self, drawing.draw_callback_px, "POST_VIEW"
+            )
+            self._help_handle = drawing.register_draw_handler(
+                self, drawing.draw_help_overlay, "POST_PIXEL"
+            )
+            context.window_manager.modal_handler_add(self)
+            context.area.tag_redraw()
+            return {"RUNNING_MODAL"}
+
+        self.report({"WARNING"}, "View3D not found")
+        return {"CANCELLED"}
+
+    def init_state(self, context):
+        """Reset the per-run operator state (subclasses extend this)."""
         self.obj = None
         self.start_point = None
         self.drawing = False
         self._handle = None
         self._help_handle = None
+        self._preview_handle = None
+        self.preview_mod_name = None
         self.mouse_loc_3d = None
         self.last_hit = None
+        self.reset_written_values()
         
         self.init_session_params(context)
 
-        if context.area.type == "VIEW_3D":
-            self.get_location(context, event)
-            self._handle = register_draw_handler(self, draw_callback_px, "POST_VIEW")
-            self._help_handle = register_draw_handler(self, draw_help_overlay, "POST_PIXEL")
-            context.window_manager.modal_handler_add(self)
-            context.area.tag_redraw()
-            return {"RUNNING_MODAL"}
-
-        self.report({"WARNING"}, "View3D not found")
-        return {"CANCELLED"}
+        prefs = get_prefs(context)
+        if prefs:
+            self.move_scheduler = MoveScheduler(prefs.event_scheduling, prefs.max_update_rate)
+        else:
+            self.move_scheduler = MoveScheduler()
+        # None unless enabled; timed sections check it before reading the clock
+        self.profiler = get_profiler() if prefs and prefs.profile_tools else None
+        self.recorder = (
+            replay.EventRecorder(self, context) if prefs and prefs.record_events else None
+        )
+        self.view_cache = ViewCache()
+        self.snap_mode = prefs.snap_mode if prefs else 'SURFACE'
+        # Point index -> (source, vertex index, offset); sheets can't hold bindings
+        self.attach = bool(prefs and prefs.attach_mode and prefs.storage_mode != 'SHEET')
+        self.bindings = {}
+        self.keymap = keymap.get_keymap(self.tool_type)
 
     def get_location(self, context, event):
-        region = context.region
-        rv3d = context.region_data
-
-        if region.type != "WINDOW":
-            found_r = None
-            for r in context.area.regions:
-                if r.type == "WINDOW":
-                    found_r = r
-                    break
-            if found_r:
-                region = found_r
-                rv3d = region.data
-            else:
-                return None
-
-        coord = (event.mouse_x - region.x, event.mouse_y - region.y)
+        view = self.view_cache.get(context)
+        if view is None:
+            return None
+        region = view.region
+        rv3d = view.rv3d
+
+        coord = view.region_coord(event)
         self.mouse_loc_3d = None
 
         try:
-            view_vector = view3d_utils.region_2d_to_vector_3d(region, rv3d, coord)
-            ray_origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, coord)
+            view_vector = view.ray_vector(coord)
+            ray_origin = view.ray_origin(coord)
         except Exception:
             return None
 
-        hit, loc, normal, index, obj, matrix = context.scene.ray_cast(
-            context.view_layer.depsgraph, ray_origin, view_vector
+        prof = self.profiler
+        if prof:
+            start = perf_counter()
+
+        hit, loc, normal, index, obj, matrix = raycast.scene_raycaster.ray_cast(
+            context, region, rv3d, coord, ray_origin, view_vector
         )
-        final_loc = None
+
+        if prof:
+            start = prof.lap("raycast", start)
 
         use_snap = context.tool_settings.use_snap
         if event.ctrl:
             use_snap = not use_snap
 
+        raycaster = raycast.scene_raycaster
+        snap_elements = context.tool_settings.snap_elements
+        snapped = None
+        if use_snap and self.snap_mode == 'SCREEN':
+            snapped = screensnap.snap_to_screen_grid(
+                context, view, coord, snap_elements, raycaster
+            )
+
         if hit:
             self.last_hit = (hit, loc, normal, index, obj, matrix)
-            if (
-                use_snap
-                and "VERTEX" in context.tool_settings.snap_elements
-            ):
-                if obj.type == "MESH":
-                    mw = obj.matrix_world
-                    loc_local = mw.inverted() @ loc
-                    if index is not None and index < len(obj.data.polygons):
-                        poly = obj.data.polygons[index]
-                        
-                        # Gather candidates: Vertices and Edge Midpoints
-                        candidates = []
-                        p_verts_indices = poly.vertices
-                        num_verts = len(p_verts_indices)
-                        
-                        for i in range(num_verts):
-                            v_curr = obj.data.vertices[p_verts_indices[i]].co
-                            v_next = obj.data.vertices[p_verts_indices[(i + 1) % num_verts]].co
-                            
-                            candidates.append(v_curr)          # Vertex
-                            candidates.append((v_curr + v_next) / 2) # Edge Midpoint
-
-                        nearest_co = min(candidates, key=lambda c: (c - loc_local).length)
-                        world_v = mw @ nearest_co
-                        screen_pos = view3d_utils.location_3d_to_region_2d(
-                            region, rv3d, world_v
-                        )
-                        if (
-                            screen_pos
-                            and (
-                                mathutils.Vector(screen_pos) - mathutils.Vector(coord)
-                            ).length
-                            < 20.0
-                        ):
-                            final_loc = world_v
-
-            if final_loc is None:
-                final_loc = loc
+            if use_snap and self.snap_mode == 'SURFACE':
+                result = snapping.snap_to_geometry(
+                    obj,
+                    loc,
+                    region,
+                    rv3d,
+                    coord,
+                    snap_elements,
+                    context.evaluated_depsgraph_get(),
+                    matrix=raycaster.hit_matrix,
+                    key=raycaster.hit_key,
+                    view=view,
+                )
+                if result:
+                    snapped = result[0]
         else:
             self.last_hit = None
-            final_loc = view3d_utils.region_2d_to_location_3d(
-                region, rv3d, coord, context.scene.cursor.location
+
+        if snapped is not None:
+            final_loc = snapped
+        else:
+            # Not snapped to an element: the hit or the cursor depth, on the grid
+            final_loc = loc if hit else view.location_on_plane(
+                coord, context.scene.cursor.location
+            )
+            final_loc = snapping.apply_snapping(
+                context, final_loc, region, rv3d, use_snap=use_snap, view=view
             )
 
-        if not hit or final_loc == loc:
-            final_loc = apply_snapping(context, final_loc, region, rv3d, use_snap=use_snap)
+        if prof:
+            prof.lap("snap", start)
 
         self.mouse_loc_3d = final_loc
         return final_loc
 
+    def on_mouse_move(self, context, event):
+        """Update the preview for a (possibly coalesced) mouse move."""
+        self.get_location(context, event)
+
+    def modal(self, context, event):
+        rec = self.recorder
+        if rec:
+            rec.add(event)
+        if event.type not in {"MOUSEMOVE", "INBETWEEN_MOUSEMOVE", "TIMER"}:
+            # Clicks and keys may resize or toggle UI regions, or switch
+            # tools without a msgbus notification (e.g. from a keymap)
+            self.view_cache.invalidate()
+            uistate.invalidate_active_tool()
+        prof = self.profiler
+        if not prof and not rec:
+            return self.handle_modal(context, event)
+        start = perf_counter()
+        result = self.handle_modal(context, event)
+        if prof:
+            prof.lap("modal", start)
+        if rec and result & {"FINISHED", "CANCELLED"}:
+            rec.finish(result)
+        return result
+
+    def handle_modal(self, context, event):
+        """Modal event handling, implemented by the tools."""
+        return {"PASS_THROUGH"}
+
+    def process_mouse_move(self, context, event):
+        prev_loc = self.mouse_loc_3d
+        prof = self.profiler
+        if prof:
+            start = perf_counter()
+        self.on_mouse_move(context, event)
+        if prof:
+            prof.lap("move", start)
+        # Redraw only when the preview actually moved
+        if self.mouse_loc_3d != prev_loc and context.area:
+            context.area.tag_redraw()
+
+    def handle_move_event(self, context, event):
+        """Schedule a MOUSEMOVE; process it now or once the rate limit allows."""
+        move = self.move_scheduler.push(context, event)
+        if move is not None:
+            self.process_mouse_move(context, move)
+
+    def handle_timer_event(self, context):
+        """Deliver a coalesced mouse move whose slot has come."""
+        move = self.move_scheduler.pop_due(context)
+        if move is not None:
+            self.process_mouse_move(context, move)
+
+    def flush_pending_move(self, context):
+        """Apply a deferred mouse move before acting on other input."""
+        move = self.move_scheduler.flush(context)
+        if move is not None:
+            self.process_mouse_move(context, move)
+
+    def clear_preview(self, context):
+        """Hide the cursor marker (e.g. when the mouse is over UI)."""
+        if self.mouse_loc_3d is not None:
+            self.mouse_loc_3d = None
+            context.area.tag_redraw()
+
     def remove_draw_handlers(self, context):
-        """Cleanly remove the view draw handlers."""
-        unregister_operator_handlers(self)
+        """Cleanly remove the view draw handlers and the move timer."""
+        if self.recorder:
+            # Capture the result before the object is stored or removed
+            self.recorder.set_result(self.obj)
+        self.move_scheduler.remove_timer(context)
+        drawing.unregister_operator_handlers(self)
         self._handle = None
         self._help_handle = None
+        self._preview_handle = None
         if context and context.area:
             context.area.tag_redraw()
 
@@ -153,286 +260,139 @@ class BaseDrawTool(Operator):
 
     def is_over_ui(self, context, event):
         """Check if mouse is over UI elements."""
-        area = context.area
-        if not area:
-            return True
-
-        if not (
-            area.x <= event.mouse_x <= area.x + area.width
-            and area.y <= event.mouse_y <= area.y + area.height
-        ):
+        view = self.view_cache.get(context)
+        if view is None:
             return True
-
-        for region in area.regions:
-            if region.type != "WINDOW":
-                if (
-                    region.x <= event.mouse_x <= region.x + region.width
-                    and region.y <= event.mouse_y <= region.y + region.height
-                ):
-                    return True
-        return False
+        return view.over_ui(event.mouse_x, event.mouse_y)
 
     def get_target_socket(self, keyword, valid_types):
         """Finds modifier and input socket by keyword."""
         if not self.obj:
             return None, None, None
 
-        mod = next(
-            (m for m in self.obj.modifiers if m.type == "NODES" and "Wrap" in m.name),
-            None,
-        )
+        mod = nodegroup.find_wrapper_modifier(self.obj)
         if mod and mod.node_group:
-            # 1. Try exact match first
-            for item in mod.node_group.interface.items_tree:
-                if (
-                    item.item_type == "SOCKET"
-                    and item.in_out == "INPUT"
-                    and keyword.lower() == item.name.lower()
-                    and item.socket_type in valid_types
-                ):
-                    return mod, item.identifier, item.name
-            
-            # 2. Fallback to substring match
-            for item in mod.node_group.interface.items_tree:
-                if (
-                    item.item_type == "SOCKET"
-                    and item.in_out == "INPUT"
-                    and keyword.lower() in item.name.lower()
-                    and item.socket_type in valid_types
-                ):
-                    return mod, item.identifier, item.name
+            info = get_socket_map(mod).find(keyword, valid_types)
+            if info:
+                return mod, info.identifier, info.name
         return None, None, None
 
     def init_session_params(self, context):
         prefs = get_prefs(context)
         if not prefs:
             return
-        
-        socket_to_pref = {
-            "Output Type": "default_output_type",
-            "Precision": "default_precision",
-            "Offset": "default_offset",
-            "Substitute Text": "default_substitute_text",
-            "Text Size": "default_text_size",
-            "Text Gap": "default_text_gap",
-            "Text Rotation": "default_text_rotation",
-            "Scale": "default_scale",
-            "Radius": "default_radius",
-            "Rotation": "default_rotation",
-            "Line Thickness": "default_line_thickness",
-            "Ref Line Thickness": "default_ref_line_thickness",
-            "Conn Line Thickness": "default_conn_line_thickness",
-            "Arrowhead Width": "default_arrowhead_width",
-            "Arrowhead Length": "default_arrowhead_length",
-            "Point Radius": "default_point_radius",
-            "Flip Text": "default_flip_text",
-            "Text Thickness": "default_text_thickness",
-            "Outer Angle": "default_outer_angle",
-            # Colors
-            "Arrow Color": "default_arrow_color",
-            "GP Arc Color": "default_arrow_color",
-            "Ref Line Color": "default_ref_line_color",
-            "GP Ref Line Color": "default_ref_line_color",
-            "Conn Line Color": "default_conn_line_color",
-            "GP Main Line Color": "default_conn_line_color",
-        }
-        
-        self.session_params = {}
-        for socket_name, pref_attr in socket_to_pref.items():
-            if hasattr(prefs, pref_attr):
-                val = getattr(prefs, pref_attr)
-                if hasattr(val, "to_list"):
-                    val = val.to_list()
-                elif hasattr(val, "__len__") and not isinstance(val, str):
-                    val = list(val)
-                self.session_params[socket_name] = val
-        
-        # Unit special cases
-        self.session_params["Unit_Distance"] = prefs.default_unit_distance
-        self.session_params["Unit_Angle"] = prefs.default_unit_angle
+        self.session_params = session_params_from_prefs(prefs)
 
     def get_actual_length(self):
         if not self.obj or not self.obj.data.vertices:
             return 1.0
-        verts = self.obj.data.vertices
-        if len(verts) < 2:
-            return 1.0
-        
-        v0 = self.obj.matrix_world @ verts[0].co
-        v1 = self.obj.matrix_world @ verts[1].co
-        
-        if self.tool_type == "angle" and len(verts) >= 3:
-            v2 = self.obj.matrix_world @ verts[2].co
-            d1 = (v0 - v1).length
-            d2 = (v2 - v1).length
-            return (d1 + d2) / 2.0
-        else:
-            return (v1 - v0).length
+        return actual_length(world_points(self.obj), self.tool_type)
 
     def get_angle_info(self):
         """Returns the angle (in degrees) and the shorter leg length of the angle."""
-        if not self.obj or len(self.obj.data.vertices) < 2:
+        if not self.obj:
             return 0.0, 1.0
-        
-        verts = self.obj.data.vertices
-        mw = self.obj.matrix_world
-        w0 = mw @ verts[0].co
-        w1 = mw @ verts[1].co # Corner/Vertex
-        
-        if len(verts) < 3:
-            return 0.0, (w1 - w0).length
-            
-        w2 = mw @ verts[2].co
-        
-        u = w0 - w1
-        v = w2 - w1
-        
-        u_len = u.length
-        v_len = v.length
-        
-        if u_len < 0.0001 or v_len < 0.0001:
-            return 0.0, 0.0
-            
-        import math
-        cos_angle = u.dot(v) / (u_len * v_len)
-        cos_angle = max(-1.0, min(1.0, cos_angle))
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        
-        shorter_len = min(u_len, v_len)
-        return angle_deg, shorter_len
+        return angle_info(world_points(self.obj))
+
+    def begin_preview(self, context, mod):
+        """Hide the full node group while dragging if overlay preview is enabled."""
+        prefs = get_prefs(context)
+        if not mod or not prefs or prefs.drag_preview != 'OVERLAY':
+            return
+        mod.show_viewport = False
+        self.preview_mod_name = mod.name
+        if self._preview_handle is None:
+            self._preview_handle = drawing.register_draw_handler(
+                self, drawing.draw_preview_overlay, "POST_PIXEL"
+            )
+
+    def end_preview(self, context):
+        """Swap the full node group back in once the measurement is confirmed."""
+        if self._preview_handle is not None:
+            drawing.unregister_draw_handler(self._preview_handle)
+            self._preview_handle = None
+        if self.obj and self.preview_mod_name:
+            mod = self.obj.modifiers.get(self.preview_mod_name)
+            if mod:
+                mod.show_viewport = True
+                self.obj.update_tag()
+        self.preview_mod_name = None
+
+    def bind_point(self, point_index):
+        """In attach mode, bind a placed point to the mesh under the cursor."""
+        if not self.attach:
+            return
+        target = attach.find_binding(self.last_hit, self.mouse_loc_3d)
+        if target is None:
+            self.bindings.pop(point_index, None)
+        else:
+            self.bindings[point_index] = target
+
+    def store_measurement(self, context):
+        """Save the point bindings, or move the finished measurement onto the
+        sheet in sheet storage mode."""
+        if self.obj and self.bindings:
+            attach.bind_points(self.obj, self.bindings)
+        prefs = get_prefs(context)
+        if not self.obj or not prefs or prefs.storage_mode != 'SHEET':
+            return
+        target = sheet.get_sheet(context)
+        if target is None:
+            self.report({"WARNING"}, "Measurement sheet unavailable, kept as object")
+            return
+
+        is_relative = prefs.measurement_mode == 'RELATIVE'
+        sheet.add_object(target, self.obj, self.tool_type, self.session_params, is_relative)
+        bpy.data.objects.remove(self.obj, do_unlink=True)
+        self.obj = None
 
     def apply_session_params_to_modifier(self, context):
         if not self.obj:
             return
         
-        mod = next(
-            (m for m in self.obj.modifiers if m.type == "NODES" and "Wrap" in m.name),
-            None,
-        )
+        mod = nodegroup.find_wrapper_modifier(self.obj)
         if not mod or not mod.node_group:
             return
 
         prefs = get_prefs(context)
         is_relative = prefs.measurement_mode == 'RELATIVE' if prefs else False
 
-        actual_length = max(0.001, self.get_actual_length())
-
-        scale_dependent_sockets = {
-            "Offset",
-            "Text Size",
-            "Text Gap",
-            "Radius",
-            "Line Thickness",
-            "Ref Line Thickness",
-            "Conn Line Thickness",
-            "Arrowhead Width",
-            "Arrowhead Length",
-            "Point Radius",
-            "Text Thickness",
-        }
-
-        # Reference angles for different socket groups to maintain perfect proportions
-        socket_ref_angles = {
-            "Radius": 90.0,
-            "Arrowhead Length": 90.0,
-            "Offset": 75.0,
-            "Arrowhead Width": 75.0,
-            "Line Thickness": 75.0,
-            "Ref Line Thickness": 75.0,
-            "Conn Line Thickness": 75.0,
-            "Text Thickness": 75.0,
-            "Point Radius": 75.0,
-            "Text Size": 60.0,
-            "Text Gap": 60.0,
-        }
-
-        angle_deg, shorter_len = 0.0, actual_length
-        if self.tool_type == "angle":
-            angle_deg, shorter_len = self.get_angle_info()
-
-        # Dynamic mapping of enum strings to their indices on the modifier
-        def get_enum_value(socket_name, identifier, value_str, default_idx):
-            try:
-                items = mod.id_properties_ui(identifier).as_dict().get('items', [])
-                for item in items:
-                    if item[0] == value_str or item[1] == value_str:
-                        return item[4]
-            except Exception:
-                pass
+        prof = self.profiler
+        if prof:
+            start = perf_counter()
+
+        changed = apply_params_to_modifier(
+            mod,
+            self.session_params,
+            self.tool_type,
+            world_points(self.obj),
+            is_relative,
+            written=self.get_written_values(mod),
+        )
 
-            static_maps = {
-                "Output Type": {
-                    "Grease Pencil": 2,
-                    "Mesh": 3,
-                },
-                "Unit_Distance": {
-                    "Meter": 2,
-                    "Foot": 3,
-                    "Inch": 4,
-                    "Foot-Inch": 5,
-                    "Vector": 6,
-                },
-                "Unit_Angle": {
-                    "Degree": 2,
-                    "Radian": 3,
-                }
-            }
-            return static_maps.get(socket_name, {}).get(value_str, default_idx)
-
-        for item in mod.node_group.interface.items_tree:
-            if item.item_type != "SOCKET" or item.in_out != "INPUT":
-                continue
-            
-            socket_name = item.name
-            
-            # Unit special cases
-            if socket_name == "Unit":
-                if "Distance" in mod.node_group.name:
-                    val_str = self.session_params.get("Unit_Distance", "Meter")
-                    val = get_enum_value("Unit_Distance", item.identifier, val_str, 2)
-                else:
-                    val_str = self.session_params.get("Unit_Angle", "Degree")
-                    val = get_enum_value("Unit_Angle", item.identifier, val_str, 2)
-            elif socket_name == "Output Type":
-                val_str = self.session_params.get("Output Type", "Grease Pencil")
-                val = get_enum_value("Output Type", item.identifier, val_str, 2)
-            else:
-                val = self.session_params.get(socket_name)
-
-            if val is not None:
-                # If relative mode, scale length-dependent properties
-                if is_relative and socket_name in scale_dependent_sockets:
-                    if isinstance(val, (int, float)):
-                        val = val * actual_length
-
-                # Angle-specific scaling and constraints
-                if self.tool_type == "angle":
-                    if socket_name in socket_ref_angles:
-                        ref_angle = socket_ref_angles[socket_name]
-                        min_angle = 10.0
-                        clamped_angle = max(min_angle, min(ref_angle, angle_deg))
-                        angle_scale = clamped_angle / ref_angle
-                        if isinstance(val, (int, float)):
-                            val = val * angle_scale
-                    if socket_name == "Radius":
-                        val = min(val, shorter_len)
-
-                # Handle color tuple conversion if needed
-                if item.socket_type == 'NodeSocketColor':
-                    val = list(val)
-
-                try:
-                    mod[item.identifier] = val
-                except Exception as e:
-                    print(f"Failed to set modifier parameter {socket_name}: {e}")
-
-        # Force update
-        mod.show_viewport = False
-        mod.show_viewport = True
-        context.view_layer.update()
-        if context.area:
-            context.area.tag_redraw()
+        if prof:
+            prof.lap("params", start)
+
+        if changed:
+            # ID property writes don't tag the object, so tag it here. The
+            # depsgraph then re-evaluates once before the next redraw, however
+            # many events tagged it in between.
+            self.obj.update_tag()
+            if context.area:
+                context.area.tag_redraw()
+
+    def reset_written_values(self):
+        """Forget the values written to the measurement modifier."""
+        self._written_mod = None
+        self._written_values = {}
+
+    def get_written_values(self, mod):
+        """Return {identifier: value} last written to mod by this operator."""
+        key = mod.as_pointer()
+        if self._written_mod != key:
+            self._written_mod = key
+            self._written_values = {}
+        return self._written_values
 
     def set_modifier_value(
         self, context, keyword, value, valid_types, toggle_flip=False
@@ -492,62 +452,40 @@ class BaseDrawTool(Operator):
             self.cancel_op(context)
             return True
 
-        try:
-            active = context.workspace.tools.from_space_view3d_mode(context.mode)
-            if active:
-                if active.idname != self.bl_idname_tool:
-                    self.cancel_op(context)
-                    return True
-        except Exception:
-            pass
-
-        if event.type in {"RIGHTMOUSE", "ESC"}:
+        active = uistate.active_tool(context)
+        if active and active != self.bl_idname_tool:
             self.cancel_op(context)
             return True
 
         return None
 
-    def get_scroll_bindings(self):
-        """Returns dict: { 'CTRL'|'SHIFT'|'ALT': (param_name, step, type_set) }"""
-        # Default bindings common to both tools
-        prefs = get_prefs(bpy.context)
-        angle_step = int(prefs.angle_increment) if prefs else 5
-        dist_step = prefs.distance_increment if prefs else 0.01
+    def dispatch_event(self, context, event):
+        """Run the KEYMAP_REGISTRY handler bound to the event.
 
-        return {
-             "SHIFT": ("Text Rotation", angle_step, INT_TYPES),
-             "ALT": ("Offset", dist_step, FLOAT_TYPES),
-        }
-
-    def handle_modal_scroll(self, context, event):
-        if not self.drawing:
-            return False
-
-        is_scroll_up = (
-            event.type in {"WHEELUPMOUSE", "NUMPAD_PLUS"} and event.value == "PRESS"
-        )
-        is_scroll_down = (
-            event.type in {"WHEELDOWNMOUSE", "NUMPAD_MINUS"} and event.value == "PRESS"
-        )
-
-        if is_scroll_up or is_scroll_down:
-            direction = 1 if is_scroll_up else -1
-            bindings = self.get_scroll_bindings()
-
-            target = None
-            if event.ctrl:
-                target = bindings.get("CTRL")
-            elif event.shift:
-                target = bindings.get("SHIFT")
-            elif event.alt:
-                target = bindings.get("ALT")
+        Returns the handler's modal result, or None if no binding matches
+        or the handler doesn't apply in the current state.
+        """
+        action = self.keymap.lookup(event, "drawing" if self.drawing else "idle")
+        if action is None:
+            return None
+        return getattr(self, action.handler)(context, event, action)
 
-            if target:
-                param, step, valid_types = target
-                self.adjust_parameter(context, param, step * direction, valid_types)
-                return True
+    def cancel_tool(self, context, event, action):
+        self.cancel_op(context)
+        return {"CANCELLED"}
 
-        return False
+    def adjust_param(self, context, event, action):
+        """Scroll binding: step the bound input by its preference increment."""
+        if not self.drawing:
+            return None
+        param, step_pref, type_name = action.binding["param"]
+        step = getattr(uistate.prefs_snapshot(context), step_pref)
+        if type_name == "INT":
+            step, valid_types = int(step), INT_TYPES
+        else:
+            valid_types = FLOAT_TYPES
+        self.adjust_parameter(context, param, step * action.args[0], valid_types)
+        return {"RUNNING_MODAL"}
 
     def toggle_help_overlay(self, context):
         """Toggle the help overlay visibility."""
@@ -560,11 +498,6 @@ class BaseDrawTool(Operator):
             state = "shown" if prefs.show_help_overlay else "hidden"
             self.report({"INFO"}, f"Help overlay {state}")
 
-    def handle_common_keys(self, context, event):
-        """Handle common keybindings shared across tools. Returns True if handled."""
-        # Ctrl+Alt+H: Toggle help overlay
-        if (event.type == "H" and event.value == "PRESS" 
-            and event.ctrl and event.alt and not event.shift):
-            self.toggle_help_overlay(context)
-            return True
-        return False
+    def toggle_help(self, context, event, action):
+        self.toggle_help_overlay(context)
+        return {"RUNNING_MODAL"}
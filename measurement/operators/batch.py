@@ -0,0 +1,43 @@
+# Batch import operator for measurements
+
+from bpy.props import IntProperty, StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ImportHelper
+
+from ..constants import CSV_CHUNK_SIZE
+from ..core.lazy import lazy_import
+
+batch = lazy_import("..core.batch", __package__)
+
+
+class MEASURE_OT_import_csv(Operator, ImportHelper):
+    """Create distance/angle measurements from a CSV file of points"""
+
+    bl_idname = "measure.import_csv"
+    bl_label = "Import Measurements (CSV)"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filename_ext = ".csv"
+    filter_glob: StringProperty(default="*.csv", options={"HIDDEN"})
+
+    chunk_size: IntProperty(
+        name="Chunk Size",
+        description="Number of rows read before measurements are created",
+        default=CSV_CHUNK_SIZE,
+        min=1,
+    )
+
+    def execute(self, context):
+        try:
+            count = batch.import_measurements_csv(
+                context, self.filepath, chunk_size=self.chunk_size
+            )
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not read {self.filepath}: {e}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Created {count} measurements")
+        return {"FINISHED"}
+
+
+def menu_func_import(self, context):
+    self.layout.operator(MEASURE_OT_import_csv.bl_idname, text="Measurements (.csv)")
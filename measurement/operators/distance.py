@@ -4,11 +4,9 @@ import bpy
 import bmesh
 import math
 import mathutils
+from time import perf_counter
 
-from .base import BaseDrawTool, get_prefs
-from ..constants import FLOAT_TYPES, INT_TYPES
-from ..core.nodegroup import create_wrapper_modifier, get_asset_nodegroup
-from ..core.drawing import unregister_draw_handler
+from .base import BaseDrawTool, drawing, nodegroup, raycast
 
 
 class MOUSE_OT_draw_distance(BaseDrawTool):
@@ -19,15 +17,11 @@ class MOUSE_OT_draw_distance(BaseDrawTool):
     bl_idname_tool = "my_tool.distance_tool"
     tool_type = "distance"
 
-    def get_scroll_bindings(self):
-        bindings = super().get_scroll_bindings()
-        prefs = get_prefs(bpy.context)
-        step = int(prefs.angle_increment) if prefs else 5
-        bindings["CTRL"] = ("Rotation", step, INT_TYPES)
-        return bindings
+    def init_state(self, context):
+        super().init_state(context)
+        self.waiting_for_move = False
 
     def invoke(self, context, event):
-        self.waiting_for_move = False
         self.report({"INFO"}, "Click start. Ctrl snap. Esc cancel.")
         return super().invoke(context, event)
 
@@ -35,6 +29,7 @@ class MOUSE_OT_draw_distance(BaseDrawTool):
         mesh = bpy.data.meshes.new("Distance Measurement")
         self.obj = bpy.data.objects.new("Distance Measurement", mesh)
         context.collection.objects.link(self.obj)
+        raycast.scene_raycaster.ignore(self.obj)
         bm = bmesh.new()
         v1 = bm.verts.new(loc)
         v2 = bm.verts.new(loc)
@@ -43,9 +38,10 @@ class MOUSE_OT_draw_distance(BaseDrawTool):
         bm.free()
         bpy.ops.object.select_all(action="DESELECT")
         self.obj.select_set(True)
-        target_group = get_asset_nodegroup("Distance Measurement")
+        target_group = nodegroup.get_asset_nodegroup("Distance Measurement")
         if target_group:
-            create_wrapper_modifier(self.obj, target_group)
+            mod = nodegroup.create_wrapper_modifier(self.obj, target_group)
+            self.begin_preview(context, mod)
             self.apply_session_params_to_modifier(context)
         context.view_layer.objects.active = self.obj
 
@@ -96,99 +92,87 @@ class MOUSE_OT_draw_distance(BaseDrawTool):
             toggle_flip=True,
         )
 
-    def modal(self, context, event):
+    def on_mouse_move(self, context, event):
+        loc = self.get_location(context, event)
+
+        if self.waiting_for_move and loc:
+            dist = (mathutils.Vector(loc) - mathutils.Vector(self.start_point)).length
+            if dist > 0.001:
+                self.create_line_object(context, self.start_point)
+                self.waiting_for_move = False
+                self.drawing = True
+                if self._handle:
+                    drawing.unregister_draw_handler(self._handle)
+                    self._handle = None
+
+        if self.drawing and self.obj and loc:
+            prof = self.profiler
+            if prof:
+                start = perf_counter()
+            inv = self.obj.matrix_world.inverted()
+            local_loc = inv @ loc
+            self.obj.data.vertices[1].co = local_loc
+            self.obj.data.update()
+            if prof:
+                prof.lap("mesh", start)
+            self.apply_session_params_to_modifier(context)
+
+    def handle_modal(self, context, event):
         if not context.area:
             self.cancel_op(context)
             return {"CANCELLED"}
 
-        context.area.tag_redraw()
+        # Coalesced mouse moves are delivered on timer ticks
+        if event.type == "TIMER":
+            self.handle_timer_event(context)
+            return {"PASS_THROUGH"}
 
         # 1. Pass Through Checks (UI, Outside Area)
         if self.is_over_ui(context, event):
             if self.drawing and event.type == "MOUSEMOVE":
                 pass
             else:
-                self.mouse_loc_3d = None
+                self.clear_preview(context)
                 return {"PASS_THROUGH"}
 
-        # 2. Tool Switch/Key Cancel
+        # 2. Tool Switch / Mode Change
         exit_code = self.check_exit(context, event)
         if exit_code is True:
             return {"CANCELLED"}
 
-        # Handle common keys (e.g., Ctrl+Alt+H to toggle help)
-        if self.handle_common_keys(context, event):
-            return {"RUNNING_MODAL"}
-
-        # Navigation
-        if event.type in {
-            "MIDDLEMOUSE",
-            "WHEELUPMOUSE",
-            "WHEELDOWNMOUSE",
-            "NUMPAD_PLUS",
-            "NUMPAD_MINUS",
-        } and not (event.shift or event.ctrl or event.alt):
-            return {"PASS_THROUGH"}
-
-        # Parameter Adjustment Logic
-        if self.handle_modal_scroll(context, event):
-            return {"RUNNING_MODAL"}
-
-        if event.type in {
-            "MIDDLEMOUSE",
-            "WHEELUPMOUSE",
-            "WHEELDOWNMOUSE",
-            "NUMPAD_PLUS",
-            "NUMPAD_MINUS",
-        }:
-            return {"PASS_THROUGH"}
-
         if event.type == "MOUSEMOVE":
-            loc = self.get_location(context, event)
-            
-            if self.waiting_for_move and loc:
-                dist = (mathutils.Vector(loc) - mathutils.Vector(self.start_point)).length
-                if dist > 0.001:
-                    self.create_line_object(context, self.start_point)
-                    self.waiting_for_move = False
-                    self.drawing = True
-                    if self._handle:
-                        unregister_draw_handler(self._handle)
-                        self._handle = None
-
-            if self.drawing and self.obj and loc:
-                inv = self.obj.matrix_world.inverted()
-                local_loc = inv @ loc
-                self.obj.data.vertices[1].co = local_loc
-                self.obj.data.update()
-                self.apply_session_params_to_modifier(context)
+            self.handle_move_event(context, event)
             return {"RUNNING_MODAL"}
 
-        elif event.type == "LEFTMOUSE" and event.value == "PRESS":
-            if not self.drawing:
-                for region in context.area.regions:
-                    if region.type != "WINDOW":
-                        if (
-                            region.x <= event.mouse_x <= region.x + region.width
-                            and region.y <= event.mouse_y <= region.y + region.height
-                        ):
-                            return {"PASS_THROUGH"}
-                loc = self.get_location(context, event)
-                if loc:
-                    self.start_point = loc
-                    self.waiting_for_move = True
-                return {"RUNNING_MODAL"}
-            else:
-                self.remove_draw_handlers(context)
-                return {"FINISHED"}
+        # Any other input acts on the latest mouse position
+        self.flush_pending_move(context)
 
-        elif event.type == "E" and event.value == "PRESS":
-            if self.drawing:
-                self.align_to_geometry(context)
-                return {"RUNNING_MODAL"}
+        # Clicks, keys and scrolling from KEYMAP_REGISTRY
+        return self.dispatch_event(context, event) or {"PASS_THROUGH"}
 
-        elif event.type in {"RIGHTMOUSE", "ESC"}:
-            self.cancel_op(context)
-            return {"CANCELLED"}
+    # -- KEYMAP_REGISTRY handlers ---------------------------------------------
 
-        return {"PASS_THROUGH"}
+    def set_start_point(self, context, event, action):
+        view = self.view_cache.get(context)
+        if view and view.over_ui_region(event.mouse_x, event.mouse_y):
+            return {"PASS_THROUGH"}
+        loc = self.get_location(context, event)
+        if loc:
+            self.start_point = loc
+            self.bind_point(0)
+            self.waiting_for_move = True
+        context.area.tag_redraw()
+        return {"RUNNING_MODAL"}
+
+    def confirm_endpoint(self, context, event, action):
+        self.bind_point(1)
+        self.end_preview(context)
+        self.remove_draw_handlers(context)
+        self.store_measurement(context)
+        return {"FINISHED"}
+
+    def align_endpoint(self, context, event, action):
+        if not self.drawing:
+            return None
+        self.align_to_geometry(context)
+        return {"RUNNING_MODAL"}
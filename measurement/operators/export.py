@@ -0,0 +1,60 @@
+# Operator exporting measured values to CSV or JSON
+
+from bpy.props import EnumProperty, StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+
+from ..core.lazy import lazy_import
+
+export = lazy_import("..core.export", __package__)
+
+
+class MEASURE_OT_export_values(Operator, ExportHelper):
+    """Write the measured length or angle of every measurement to a CSV or JSON file"""
+
+    bl_idname = "measure.export_values"
+    bl_label = "Export Measured Values"
+
+    filename_ext = ".csv"
+    filter_glob: StringProperty(default="*.csv;*.json", options={"HIDDEN"})
+
+    file_format: EnumProperty(
+        name="Format",
+        items=[
+            ('CSV', "CSV", "Write one row per measurement"),
+            ('JSON', "JSON", "Write a list of measurement records"),
+        ],
+        default='CSV',
+    )
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('SCENE', "Scene", "Export every measurement in the scene"),
+            ('SELECTED', "Selected", "Export the selected measurements"),
+        ],
+        default='SCENE',
+    )
+
+    def check(self, context):
+        # Keep the extension in sync with the chosen format
+        self.filename_ext = ".json" if self.file_format == 'JSON' else ".csv"
+        return ExportHelper.check(self, context)
+
+    def execute(self, context):
+        try:
+            count = export.export_values(
+                context,
+                self.filepath,
+                file_format=self.file_format,
+                selected_only=self.scope == 'SELECTED',
+            )
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not write {self.filepath}: {e}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Exported {count} measured values")
+        return {"FINISHED"}
+
+
+def menu_func_export(self, context):
+    self.layout.operator(MEASURE_OT_export_values.bl_idname, text="Measured Values (.csv/.json)")
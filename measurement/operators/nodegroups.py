@@ -0,0 +1,23 @@
+# Operator merging duplicate measurement node groups
+
+import bpy
+from bpy.types import Operator
+
+from ..core.lazy import lazy_import
+
+nodegroup = lazy_import("..core.nodegroup", __package__)
+
+
+class MEASURE_OT_dedupe_nodegroups(Operator):
+    """Point all measurements at one copy of each measurement node group and remove the duplicates"""
+
+    bl_idname = "measure.dedupe_nodegroups"
+    bl_label = "Merge Duplicate Node Groups"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        before = len(bpy.data.node_groups)
+        merged = nodegroup.dedupe_nodegroups()
+        removed = before - len(bpy.data.node_groups)
+        self.report({"INFO"}, f"Merged {merged} duplicate node groups, removed {removed}")
+        return {"FINISHED"}
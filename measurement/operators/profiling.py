@@ -0,0 +1,54 @@
+# Operator writing the tool profiling statistics to disk
+
+from bpy.props import BoolProperty, EnumProperty, StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+
+from ..core.lazy import lazy_import
+
+profiling = lazy_import("..core.profiling", __package__)
+
+
+class MEASURE_OT_dump_profile(Operator, ExportHelper):
+    """Write the measurement tool timing statistics to a CSV or JSON file"""
+
+    bl_idname = "measure.dump_profile"
+    bl_label = "Dump Profile"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json;*.csv", options={"HIDDEN"})
+
+    file_format: EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "Write statistics as JSON"),
+            ('CSV', "CSV", "Write one row per phase"),
+        ],
+        default='JSON',
+    )
+
+    reset: BoolProperty(
+        name="Reset",
+        description="Clear the statistics after writing them",
+        default=False,
+    )
+
+    def check(self, context):
+        # Keep the extension in sync with the chosen format
+        self.filename_ext = ".csv" if self.file_format == 'CSV' else ".json"
+        return ExportHelper.check(self, context)
+
+    def execute(self, context):
+        profiler = profiling.get_profiler()
+        if not profiler.phases:
+            self.report({"WARNING"}, "No profiling samples; enable Profile Tools and draw a measurement")
+            return {"CANCELLED"}
+        try:
+            profiler.dump(self.filepath)
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not write {self.filepath}: {e}")
+            return {"CANCELLED"}
+        if self.reset:
+            profiler.clear()
+        self.report({"INFO"}, f"Wrote profile to {self.filepath}")
+        return {"FINISHED"}
@@ -0,0 +1,40 @@
+# Operator saving recorded tool event streams
+
+from bpy.props import BoolProperty, StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+
+from ..core.lazy import lazy_import
+
+replay = lazy_import("..core.replay", __package__)
+
+
+class MEASURE_OT_save_recording(Operator, ExportHelper):
+    """Save the most recent recorded tool event stream for headless replay"""
+
+    bl_idname = "measure.save_recording"
+    bl_label = "Save Event Recording"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    clear: BoolProperty(
+        name="Clear",
+        description="Forget the recordings kept in memory after saving",
+        default=False,
+    )
+
+    def execute(self, context):
+        recordings = replay.get_recordings()
+        if not recordings:
+            self.report({"WARNING"}, "No recordings; enable Record Events and draw a measurement")
+            return {"CANCELLED"}
+        try:
+            replay.save_recording(recordings[-1], self.filepath)
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not write {self.filepath}: {e}")
+            return {"CANCELLED"}
+        if self.clear:
+            recordings.clear()
+        self.report({"INFO"}, f"Saved recording to {self.filepath}")
+        return {"FINISHED"}
@@ -0,0 +1,108 @@
+# Operators restyling existing measurements and saving style presets
+
+import bpy
+from bpy.props import BoolProperty, EnumProperty, StringProperty
+from bpy.types import Operator
+from bpy_extras.io_utils import ExportHelper
+
+from ..core.lazy import lazy_import
+from ..preferences import get_prefs
+
+batch = lazy_import("..core.batch", __package__)
+restyle = lazy_import("..core.restyle", __package__)
+
+
+class MEASURE_OT_restyle(Operator):
+    """Apply the preference defaults or a style preset to existing measurements"""
+
+    bl_idname = "measure.restyle"
+    bl_label = "Restyle Measurements"
+    bl_options = {"REGISTER", "UNDO"}
+
+    scope: EnumProperty(
+        name="Scope",
+        items=[
+            ('SCENE', "Scene", "Restyle every measurement in the scene"),
+            ('SELECTED', "Selected", "Restyle the selected measurements"),
+        ],
+        default='SCENE',
+    )
+
+    source: EnumProperty(
+        name="Source",
+        items=[
+            ('PREFERENCES', "Preferences", "Use the current preference defaults"),
+            ('PRESET', "Preset", "Use a saved style preset"),
+        ],
+        default='PREFERENCES',
+    )
+
+    preset_path: StringProperty(
+        name="Preset",
+        description="Style preset written by Save Style Preset",
+        subtype='FILE_PATH',
+    )
+
+    include_placement: BoolProperty(
+        name="Include Placement",
+        description="Also reset Rotation, Text Rotation, Offset and Radius, which are adjusted per measurement while drawing",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "scope", expand=True)
+        layout.prop(self, "source", expand=True)
+        if self.source == 'PRESET':
+            layout.prop(self, "preset_path")
+        layout.prop(self, "include_placement")
+
+    def execute(self, context):
+        params = is_relative = None
+        if self.source == 'PRESET':
+            path = bpy.path.abspath(self.preset_path)
+            try:
+                params, is_relative = restyle.load_style_preset(path)
+            except (OSError, ValueError) as e:
+                self.report({"ERROR"}, f"Could not read preset {path}: {e}")
+                return {"CANCELLED"}
+
+        objects = list(
+            restyle.iter_measurement_objects(context, selected_only=self.scope == 'SELECTED')
+        )
+        if not objects:
+            self.report({"WARNING"}, "No measurements to restyle")
+            return {"CANCELLED"}
+
+        changed = restyle.restyle_measurements(
+            context, params, objects=objects, is_relative=is_relative,
+            include_placement=self.include_placement,
+        )
+        self.report({"INFO"}, f"Restyled {changed} of {len(objects)} measurements")
+        return {"FINISHED"}
+
+
+class MEASURE_OT_save_style_preset(Operator, ExportHelper):
+    """Save the current preference defaults as a measurement style preset"""
+
+    bl_idname = "measure.save_style_preset"
+    bl_label = "Save Style Preset"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    def execute(self, context):
+        if get_prefs(context) is None:
+            self.report({"ERROR"}, "Measurement preferences unavailable")
+            return {"CANCELLED"}
+        params, is_relative = batch.resolve_params(context)
+        try:
+            restyle.save_style_preset(self.filepath, params, is_relative)
+        except OSError as e:
+            self.report({"ERROR"}, f"Could not write {self.filepath}: {e}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Saved style preset to {self.filepath}")
+        return {"FINISHED"}
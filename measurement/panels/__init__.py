@@ -0,0 +1,4 @@
+# Panels module initialization
+from .values import VIEW3D_PT_measurement_values
+
+__all__ = ["VIEW3D_PT_measurement_values"]
@@ -0,0 +1,35 @@
+# Sidebar panel listing the current measured values
+
+from bpy.types import Panel
+
+from ..core.lazy import lazy_import
+
+livevalues = lazy_import("..core.livevalues", __package__)
+units = lazy_import("..core.units", __package__)
+
+# Rows drawn before the list is cut off
+MAX_ROWS = 100
+
+
+class VIEW3D_PT_measurement_values(Panel):
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Measure"
+    bl_label = "Measured Values"
+
+    def draw(self, context):
+        layout = self.layout
+        values = livevalues.live_values(context)
+        if not values:
+            layout.label(text="No measurements")
+            return
+
+        col = layout.column(align=True)
+        for value in values[:MAX_ROWS]:
+            row = col.row()
+            icon = "DRIVER_DISTANCE" if value.type == "distance" else "DRIVER_ROTATIONAL_DIFFERENCE"
+            row.label(text=value.name, icon=icon)
+            row.label(text=f"{value.value:.3f} {units.unit_suffix(value.unit)}")
+        if len(values) > MAX_ROWS:
+            layout.label(text=f"... {len(values) - MAX_ROWS} more")
+        layout.operator("measure.export_values")
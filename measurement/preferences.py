@@ -3,6 +3,18 @@
 import bpy
 
 
+def get_prefs(context):
+    addon = context.preferences.addons.get("measurement")
+    return addon.preferences if addon else None
+
+
+def _invalidate_ui_state(self, context):
+    # Imported here: core.uistate is loaded after the preferences
+    from .core import uistate
+
+    uistate.invalidate_prefs()
+
+
 class MeasureToolPreferences(bpy.types.AddonPreferences):
     bl_idname = "measurement"
 
@@ -10,6 +22,7 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         name="Show Help Overlay",
         description="Display keyboard shortcuts overlay in viewport",
         default=True,
+        update=_invalidate_ui_state,
     )
 
     help_pos_x: bpy.props.IntProperty(
@@ -18,6 +31,7 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         default=20,
         min=0,
         max=1000,
+        update=_invalidate_ui_state,
     )
 
     help_pos_y: bpy.props.IntProperty(
@@ -26,6 +40,7 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         default=20,
         min=0,
         max=1000,
+        update=_invalidate_ui_state,
     )
 
     angle_increment: bpy.props.FloatProperty(
@@ -34,6 +49,7 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         default=15.0,
         min=0.1,
         max=90.0,
+        update=_invalidate_ui_state,
     )
 
     distance_increment: bpy.props.FloatProperty(
@@ -43,6 +59,95 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         min=0.001,
         max=1.0,
         precision=4,
+        update=_invalidate_ui_state,
+    )
+
+    event_scheduling: bpy.props.EnumProperty(
+        name="Event Scheduling",
+        description="How mouse move events are processed while drawing",
+        items=[
+            ('IMMEDIATE', "Immediate", "Ray cast and update the measurement on every mouse move event"),
+            ('COALESCED', "Coalesced", "Merge bursts of mouse moves into the latest position and update at most Max Update Rate times per second"),
+        ],
+        default='IMMEDIATE',
+    )
+
+    max_update_rate: bpy.props.IntProperty(
+        name="Max Update Rate",
+        description="Maximum number of ray casts and geometry node updates per second in coalesced mode",
+        default=60,
+        min=1,
+        max=1000,
+    )
+
+    drag_preview: bpy.props.EnumProperty(
+        name="Drag Preview",
+        description="How the measurement is displayed while it is being drawn",
+        items=[
+            ('FULL', "Full", "Evaluate the full measurement node group on every update"),
+            ('OVERLAY', "Overlay", "Draw a lightweight line and value overlay while dragging; the full node group is shown on confirm"),
+        ],
+        default='FULL',
+    )
+
+    snap_mode: bpy.props.EnumProperty(
+        name="Snap Mode",
+        description="How points snap to vertices and edge midpoints",
+        items=[
+            ('SURFACE', "Surface", "Snap to the elements of the surface under the cursor"),
+            ('SCREEN', "Screen", "Snap to the nearest element on screen, including wire edges and points with no face under the cursor"),
+        ],
+        default='SURFACE',
+    )
+
+    nodegroup_link_mode: bpy.props.EnumProperty(
+        name="Node Groups",
+        description="How the measurement node groups are brought into a file",
+        items=[
+            ('APPEND', "Append", "Append a local copy of the node groups into each file"),
+            ('LINK', "Link", "Link the node groups from the library once and merge any appended copies into the link"),
+        ],
+        default='APPEND',
+    )
+
+    library_path: bpy.props.StringProperty(
+        name="Library",
+        description="Library .blend file the node groups are linked from (the bundled measurement.blend if empty)",
+        subtype='FILE_PATH',
+        default="",
+    )
+
+    prewarm_mode: bpy.props.EnumProperty(
+        name="Prewarm",
+        description="When to load and evaluate the measurement node groups ahead of the first measurement",
+        items=[
+            ('ENABLE', "On Enable", "Shortly after the addon is enabled or a file is loaded"),
+            ('TOOL', "On Tool Use", "When a measurement tool is first used in the viewport"),
+            ('OFF', "Off", "Load the node groups on the first measurement"),
+        ],
+        default='TOOL',
+    )
+
+    profile_tools: bpy.props.BoolProperty(
+        name="Profile Tools",
+        description="Time the phases of the drawing tools (ray cast, snapping, mesh and modifier writes) and show them in the help overlay",
+        default=False,
+    )
+
+    record_events: bpy.props.BoolProperty(
+        name="Record Events",
+        description="Record the events sent to the drawing tools so they can be saved and replayed headlessly",
+        default=False,
+    )
+
+    storage_mode: bpy.props.EnumProperty(
+        name="Storage",
+        description="How finished measurements are stored",
+        items=[
+            ('OBJECTS', "Separate Objects", "Each measurement is its own object with its own modifier"),
+            ('SHEET', "Measurement Sheet", "Measurements are added to one sheet object evaluated by a single modifier; menu, color and text inputs are shared by the sheet"),
+        ],
+        default='OBJECTS',
     )
 
     measurement_mode: bpy.props.EnumProperty(
@@ -55,6 +160,12 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         default='ABSOLUTE',
     )
 
+    attach_mode: bpy.props.BoolProperty(
+        name="Attach to Geometry",
+        description="Bind measurement points placed on a mesh to the nearest vertex of its evaluated geometry, so the measurement follows the mesh when it moves, is edited or is deformed by modifiers (separate object storage only)",
+        default=False,
+    )
+
     default_output_type: bpy.props.EnumProperty(
         name="Output Type",
         description="Default output type for measurements",
@@ -281,10 +392,35 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         row.prop(self, "angle_increment")
         row.prop(self, "distance_increment")
 
+        box_perf = layout.box()
+        box_perf.label(text="Performance:")
+        row = box_perf.row()
+        row.prop(self, "event_scheduling", expand=True)
+        sub = row.row()
+        sub.enabled = self.event_scheduling == 'COALESCED'
+        sub.prop(self, "max_update_rate")
+        box_perf.prop(self, "drag_preview", expand=True)
+        box_perf.prop(self, "snap_mode", expand=True)
+        box_perf.prop(self, "storage_mode", expand=True)
+        box_perf.prop(self, "prewarm_mode", expand=True)
+        row = box_perf.row()
+        row.prop(self, "nodegroup_link_mode", expand=True)
+        row.operator("measure.dedupe_nodegroups")
+        sub = box_perf.row()
+        sub.enabled = self.nodegroup_link_mode == 'LINK'
+        sub.prop(self, "library_path")
+        row = box_perf.row()
+        row.prop(self, "profile_tools")
+        row.operator("measure.dump_profile")
+        row = box_perf.row()
+        row.prop(self, "record_events")
+        row.operator("measure.save_recording")
+
         # Dynamic Scaling Mode
         box_mode = layout.box()
         box_mode.label(text="Measurement Mode:")
         box_mode.prop(self, "measurement_mode", expand=True)
+        box_mode.prop(self, "attach_mode")
 
         # Modifier Defaults
         box_defaults = layout.box()
@@ -339,3 +475,6 @@ class MeasureToolPreferences(bpy.types.AddonPreferences):
         col_colors.prop(self, "default_ref_line_color")
         col_colors.prop(self, "default_conn_line_color")
 
+        row = box_defaults.row()
+        row.operator("measure.restyle")
+        row.operator("measure.save_style_preset")
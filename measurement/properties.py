@@ -0,0 +1,31 @@
+# Property groups stored on measurement objects
+
+import bpy
+
+
+class MeasureBinding(bpy.types.PropertyGroup):
+    """A measurement point attached to a vertex of another object."""
+
+    point_index: bpy.props.IntProperty(
+        name="Point",
+        description="Vertex of the measurement that follows the source",
+        min=0,
+    )
+
+    source: bpy.props.PointerProperty(
+        name="Source",
+        description="Object the point is attached to",
+        type=bpy.types.Object,
+    )
+
+    vertex_index: bpy.props.IntProperty(
+        name="Source Vertex",
+        description="Vertex of the source object the point follows",
+        min=0,
+    )
+
+    offset: bpy.props.FloatVectorProperty(
+        name="Offset",
+        description="Offset from the source vertex, in the source's local space",
+        size=3,
+    )
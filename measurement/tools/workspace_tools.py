@@ -12,6 +12,10 @@ DISTANCE_ICON_PATH = os.path.join(ICONS_DIR, "distance")
 ANGLE_ICON_PATH = os.path.join(ICONS_DIR, "angle")
 
 
+def draw_snap_settings(context, layout, tool):
+    layout.prop(context.scene, "measure_snap_target")
+
+
 class DistanceTool(WorkSpaceTool):
     bl_space_type = "VIEW_3D"
     bl_context_mode = "OBJECT"
@@ -22,6 +26,9 @@ class DistanceTool(WorkSpaceTool):
     bl_widget = None
     bl_keymap = (("mouse.draw_distance", {"type": "MOUSEMOVE", "value": "ANY"}, None),)
 
+    def draw_settings(context, layout, tool):
+        draw_snap_settings(context, layout, tool)
+
 
 class AngleTool(WorkSpaceTool):
     bl_space_type = "VIEW_3D"
@@ -31,3 +38,6 @@ class AngleTool(WorkSpaceTool):
     bl_description = "Measure angle by clicking 3 points"
     bl_icon = ANGLE_ICON_PATH
     bl_keymap = (("mouse.draw_angle", {"type": "MOUSEMOVE", "value": "ANY"}, None),)
+
+    def draw_settings(context, layout, tool):
+        draw_snap_settings(context, layout, tool)
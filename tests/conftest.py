@@ -0,0 +1,22 @@
+# Lets the tests import the addon's Blender-independent modules
+#
+# measurement/__init__.py registers the addon with bpy, so outside Blender
+# the package is set up from its directory without running it. Tests for
+# modules that need bpy, mathutils or numpy skip themselves when those
+# aren't available.
+
+import sys
+import types
+from pathlib import Path
+
+ADDON_DIR = Path(__file__).resolve().parent.parent / "measurement"
+
+if "measurement" not in sys.modules:
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        package = types.ModuleType("measurement")
+        package.__path__ = [str(ADDON_DIR)]
+        sys.modules["measurement"] = package
+    else:
+        sys.path.insert(0, str(ADDON_DIR.parent))
@@ -0,0 +1,74 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from measurement.core.blendfile import (
+    BlendFileError,
+    list_asset_node_groups,
+    read_node_trees,
+)
+
+BLEND_PATH = Path(__file__).resolve().parent.parent / "measurement" / "measurement.blend"
+ASSET_GROUPS = {"Distance Measurement", "Angle Measurement"}
+
+
+def _assets(trees):
+    return {tree.name for tree in trees if tree.is_asset}
+
+
+def test_bundled_file_lists_measurement_assets():
+    trees = read_node_trees(BLEND_PATH)
+    assert ASSET_GROUPS <= _assets(trees)
+    assert all(
+        tree.idname == "GeometryNodeTree" for tree in trees if tree.name in ASSET_GROUPS
+    )
+    assert ASSET_GROUPS <= set(list_asset_node_groups(BLEND_PATH))
+
+
+def test_internal_node_groups_are_not_assets():
+    trees = read_node_trees(BLEND_PATH)
+    names = {tree.name for tree in trees}
+    assert "Measure Distance" in names
+    assert "Measure Distance" not in _assets(trees)
+
+
+def test_gzip_compressed_file(tmp_path):
+    path = tmp_path / "compressed.blend"
+    path.write_bytes(gzip.compress(BLEND_PATH.read_bytes()))
+    assert _assets(read_node_trees(path)) == _assets(read_node_trees(BLEND_PATH))
+
+
+@pytest.mark.parametrize("fraction", [0.0, 0.5, 0.999])
+def test_truncated_file_raises(tmp_path, fraction):
+    data = BLEND_PATH.read_bytes()
+    path = tmp_path / "truncated.blend"
+    path.write_bytes(data[: max(12, int(len(data) * fraction))])
+    with pytest.raises(BlendFileError):
+        list_asset_node_groups(path)
+
+
+def test_truncated_before_endb_raises(tmp_path):
+    # Cut exactly at a block boundary: every block header is intact
+    data = BLEND_PATH.read_bytes()
+    endb = data.rindex(b"ENDB")
+    path = tmp_path / "no_endb.blend"
+    path.write_bytes(data[:endb])
+    with pytest.raises(BlendFileError):
+        list_asset_node_groups(path)
+
+
+@pytest.mark.parametrize("content", [b"", b"BLEND", b"not a blend file at all"])
+def test_non_blend_file_raises(tmp_path, content):
+    path = tmp_path / "other.blend"
+    path.write_bytes(content)
+    with pytest.raises(BlendFileError):
+        list_asset_node_groups(path)
+
+
+def test_truncated_gzip_file_raises(tmp_path):
+    compressed = gzip.compress(BLEND_PATH.read_bytes())
+    path = tmp_path / "truncated_gzip.blend"
+    path.write_bytes(compressed[: len(compressed) // 2])
+    with pytest.raises(BlendFileError):
+        list_asset_node_groups(path)
@@ -0,0 +1,31 @@
+from measurement.core.idvalues import values_equal
+
+
+def test_values_equal_float32_round_trip():
+    # 0.1 stored as an IDProperty float reads back as float32
+    assert values_equal(0.1, 0.10000000149011612)
+    assert not values_equal(0.1, 0.1001)
+
+
+def test_values_equal_near_zero():
+    assert values_equal(0.0, 1e-8)
+    assert not values_equal(0.0, 1e-5)
+
+
+def test_values_equal_int_and_float():
+    assert values_equal(5, 5.0)
+    assert not values_equal(5, 6.0)
+
+
+def test_values_equal_sequences():
+    assert values_equal([1.0, 0.5, 0.25, 1.0], (1.0, 0.5000000001, 0.25, 1.0))
+    assert not values_equal([1.0, 0.5, 0.25], [1.0, 0.5, 0.25, 1.0])
+    assert not values_equal([1.0, 0.5], [1.0, 0.6])
+
+
+def test_values_equal_other_types():
+    assert values_equal("Meter", "Meter")
+    assert not values_equal("Meter", "Foot")
+    assert not values_equal(None, 1.0)
+    assert not values_equal("1.0", 1.0)
+    assert values_equal(None, None)
@@ -0,0 +1,166 @@
+from types import SimpleNamespace
+
+import pytest
+
+from measurement.constants import KEYMAP_REGISTRY
+from measurement.core import keymap
+from measurement.core.keymap import EVENT_VALUES, MOD_ALT, MOD_CTRL, MOD_SHIFT, ToolKeymap
+
+
+def event(type, value="PRESS", ctrl=False, shift=False, alt=False):
+    return SimpleNamespace(type=type, value=value, ctrl=ctrl, shift=shift, alt=alt)
+
+
+def handler(keymap_, ev, phase="idle"):
+    action = keymap_.lookup(ev, phase)
+    return action.handler if action else None
+
+
+REGISTRY = [
+    {"key": "LMB", "mods": "", "desc": "Start", "tools": ["t"], "phase": "idle",
+     "events": [("LEFTMOUSE", "PRESS")], "any_mods": True, "handler": "start"},
+    {"key": "LMB", "mods": "", "desc": "Confirm", "tools": ["t"], "phase": "drawing",
+     "events": [("LEFTMOUSE", "PRESS")], "any_mods": True, "handler": "confirm"},
+    {"key": "Esc", "mods": "", "desc": "Cancel", "tools": ["t"],
+     "events": [("ESC", "ANY")], "handler": "cancel"},
+    {"key": "H", "mods": "Ctrl+Alt", "desc": "Help", "tools": ["t"],
+     "events": [("H", "PRESS")], "handler": "help"},
+    {"key": "Scroll", "mods": "Shift", "desc": "Scroll", "tools": ["t"],
+     "events": [("WHEELUPMOUSE", "PRESS", 1), ("WHEELDOWNMOUSE", "PRESS", -1)],
+     "handler": "scroll"},
+    {"key": "X", "mods": "", "desc": "Any phase", "tools": ["t"],
+     "events": [("X", "PRESS")], "handler": "any_phase"},
+    {"key": "X", "mods": "", "desc": "Drawing only", "tools": ["t"], "phase": "drawing",
+     "events": [("X", "PRESS")], "handler": "drawing_only"},
+    {"key": "Mouse Move", "mods": "", "desc": "Help only", "tools": ["t"]},
+    {"key": "Y", "mods": "", "desc": "Other tool", "tools": ["other"],
+     "events": [("Y", "PRESS")], "handler": "other"},
+]
+
+
+@pytest.fixture
+def tool():
+    return ToolKeymap("t", REGISTRY)
+
+
+def test_parse_mods():
+    assert keymap.parse_mods("") == 0
+    assert keymap.parse_mods("Ctrl") == MOD_CTRL
+    assert keymap.parse_mods("Ctrl+Alt") == MOD_CTRL | MOD_ALT
+    assert keymap.parse_mods("Shift + Alt") == MOD_SHIFT | MOD_ALT
+    with pytest.raises(KeyError):
+        keymap.parse_mods("Hyper")
+
+
+def test_modifier_mask():
+    assert keymap.modifier_mask(event("A")) == 0
+    assert keymap.modifier_mask(event("A", ctrl=True, alt=True)) == MOD_CTRL | MOD_ALT
+    assert keymap.modifier_mask(event("A", shift=True)) == MOD_SHIFT
+
+
+def test_exact_modifiers(tool):
+    assert handler(tool, event("H", ctrl=True, alt=True)) == "help"
+    assert handler(tool, event("H", ctrl=True)) is None
+    assert handler(tool, event("H", ctrl=True, alt=True, shift=True)) is None
+    assert handler(tool, event("H")) is None
+
+
+def test_any_mods(tool):
+    for ctrl in (False, True):
+        for shift in (False, True):
+            for alt in (False, True):
+                ev = event("LEFTMOUSE", ctrl=ctrl, shift=shift, alt=alt)
+                assert handler(tool, ev) == "start"
+
+
+def test_any_value(tool):
+    for value in EVENT_VALUES:
+        assert handler(tool, event("ESC", value)) == "cancel"
+    # "ANY" expands values, not modifiers
+    assert handler(tool, event("ESC", ctrl=True)) is None
+
+
+def test_value_must_match(tool):
+    assert handler(tool, event("LEFTMOUSE", "RELEASE")) is None
+    assert handler(tool, event("H", "RELEASE", ctrl=True, alt=True)) is None
+
+
+def test_phase(tool):
+    assert handler(tool, event("LEFTMOUSE"), "idle") == "start"
+    assert handler(tool, event("LEFTMOUSE"), "drawing") == "confirm"
+    # No action for an unknown phase and none without a phase
+    assert handler(tool, event("LEFTMOUSE"), "other") is None
+
+
+def test_phase_fallback(tool):
+    assert handler(tool, event("X"), "drawing") == "drawing_only"
+    assert handler(tool, event("X"), "idle") == "any_phase"
+    assert handler(tool, event("ESC"), "drawing") == "cancel"
+
+
+def test_event_args(tool):
+    up = tool.lookup(event("WHEELUPMOUSE", shift=True))
+    down = tool.lookup(event("WHEELDOWNMOUSE", shift=True))
+    assert (up.handler, up.args) == ("scroll", (1,))
+    assert (down.handler, down.args) == ("scroll", (-1,))
+    assert up.binding["desc"] == "Scroll"
+    assert tool.lookup(event("WHEELUPMOUSE")) is None
+
+
+def test_unbound_and_other_tools(tool):
+    assert handler(tool, event("MIDDLEMOUSE")) is None
+    assert handler(tool, event("MOUSEMOVE", "NOTHING")) is None
+    assert handler(tool, event("Y")) is None
+
+
+def test_help_rows(tool):
+    rows = [(b["key"], b["mods"], b["desc"]) for b in tool.help]
+    # One row per key + modifiers, first description wins, help-only entries kept
+    assert rows == [
+        ("LMB", "", "Start"),
+        ("Esc", "", "Cancel"),
+        ("H", "Ctrl+Alt", "Help"),
+        ("Scroll", "Shift", "Scroll"),
+        ("X", "", "Any phase"),
+        ("Mouse Move", "", "Help only"),
+    ]
+
+
+def test_first_entry_wins_per_phase():
+    registry = [
+        {"key": "A", "mods": "", "desc": "First", "tools": ["t"],
+         "events": [("A", "PRESS")], "handler": "first"},
+        {"key": "A", "mods": "", "desc": "Second", "tools": ["t"],
+         "events": [("A", "PRESS")], "handler": "second"},
+    ]
+    assert handler(ToolKeymap("t", registry), event("A")) == "first"
+
+
+@pytest.mark.parametrize("tool_type", ["distance", "angle"])
+def test_registry_compiles(tool_type):
+    tool = ToolKeymap(tool_type, KEYMAP_REGISTRY)
+    assert tool.table
+    for phases in tool.table.values():
+        for action in phases.values():
+            assert tool_type in action.binding["tools"]
+    assert handler(tool, event("ESC", "RELEASE")) == "cancel_tool"
+    assert handler(tool, event("RIGHTMOUSE", ctrl=True)) == "cancel_tool"
+    assert handler(tool, event("H", ctrl=True, alt=True)) == "toggle_help"
+    scroll = tool.lookup(event("NUMPAD_MINUS", ctrl=True), "drawing")
+    assert (scroll.handler, scroll.args) == ("adjust_param", (-1,))
+
+
+def test_registry_phases():
+    distance = ToolKeymap("distance", KEYMAP_REGISTRY)
+    assert handler(distance, event("LEFTMOUSE", ctrl=True), "idle") == "set_start_point"
+    assert handler(distance, event("LEFTMOUSE"), "drawing") == "confirm_endpoint"
+    angle = ToolKeymap("angle", KEYMAP_REGISTRY)
+    assert handler(angle, event("BACK_SPACE"), "drawing") == "remove_point"
+    assert handler(angle, event("E")) is None
+
+
+def test_compiled_keymaps_shared():
+    keymap.compile_keymaps()
+    compiled = keymap.get_keymap("distance")
+    assert keymap.get_keymap("distance") is compiled
+    assert keymap.get_keymap("angle").tool_type == "angle"
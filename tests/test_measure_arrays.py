@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+measure_arrays = pytest.importorskip("measurement.core.measure_arrays")
+
+
+def test_measure_lengths():
+    points = np.array([
+        [(0.0, 0.0, 0.0), (3.0, 4.0, 0.0)],
+        [(1.0, 1.0, 1.0), (1.0, 1.0, 1.0)],
+    ])
+    assert measure_arrays.measure_lengths(points) == pytest.approx([5.0, 0.0])
+
+
+def test_measure_angles():
+    points = np.array([
+        [(1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 2.0, 0.0)],  # right angle
+        [(1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 1.0, 0.0)],  # 45 degrees
+        [(1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (-3.0, 0.0, 0.0)],  # straight
+        [(2.0, 2.0, 2.0), (1.0, 1.0, 1.0), (2.0, 2.0, 2.0)],  # same direction
+    ])
+    angles = measure_arrays.measure_angles(points)
+    assert angles == pytest.approx([90.0, 45.0, 180.0, 0.0], abs=1e-6)
+
+
+def test_measure_angles_degenerate_legs():
+    short = measure_arrays.MIN_LEG_LENGTH * 0.5
+    points = np.array([
+        [(0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 1.0, 0.0)],  # zero first leg
+        [(1.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)],  # zero second leg
+        [(short, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 1.0, 0.0)],  # below the minimum
+        [(0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)],  # all coincident
+    ])
+    angles = measure_arrays.measure_angles(points)
+    assert np.all(np.isfinite(angles))
+    assert angles == pytest.approx([0.0, 0.0, 0.0, 0.0])
+
+
+def test_measure_angles_clips_rounding():
+    # Nearly parallel legs whose cosine may round above 1
+    points = np.array([[(1e6, 1.0, 0.0), (0.0, 0.0, 0.0), (1e6, 1.0, 0.0)]])
+    angles = measure_arrays.measure_angles(points)
+    assert np.isfinite(angles[0])
+    assert angles[0] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_measure_angles_empty():
+    assert measure_arrays.measure_angles(np.empty((0, 3, 3))).shape == (0,)
+    assert measure_arrays.measure_lengths(np.empty((0, 2, 3))).shape == (0,)
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("mathutils")
+screensnap = pytest.importorskip("measurement.core.screensnap")
+
+from measurement.core.snapping import (  # noqa: E402
+    SNAP_EDGE_MIDPOINT,
+    SNAP_FACE_CENTER,
+    SNAP_RADIUS_PX,
+    SNAP_VERTEX,
+)
+
+BUCKET = screensnap.BUCKET_PX
+SIZE = 200
+VERTICES = {SNAP_VERTEX}
+
+# Orthographic-like view: world x, y in [-1, 1] cover the region, w = 1
+FLAT = np.eye(4)
+# w = z, so points along the view axis project to the same pixel
+DEPTH = np.array([
+    (1.0, 0.0, 0.0, 0.0),
+    (0.0, 1.0, 0.0, 0.0),
+    (0.0, 0.0, 1.0, 0.0),
+    (0.0, 0.0, 1.0, 0.0),
+])
+
+
+def at(sx, sy, z=0.0):
+    """World point projecting to region pixel (sx, sy) with the FLAT view."""
+    return (sx / (SIZE / 2) - 1.0, sy / (SIZE / 2) - 1.0, z)
+
+
+def geometry(co=(), edges=(), centers=()):
+    return SimpleNamespace(
+        co=np.array(co, dtype=np.float32).reshape(-1, 3),
+        edge_verts=np.array(edges, dtype=np.int32).reshape(-1, 2),
+        centers=np.array(centers, dtype=np.float32).reshape(-1, 3),
+    )
+
+
+def make_grid(geometries, kinds=VERTICES, perspective=FLAT):
+    view = SimpleNamespace(perspective=perspective, width=SIZE, height=SIZE)
+    items = [(None, np.eye(4), g) for g in geometries]
+    return screensnap.ScreenSnapGrid(view, items, kinds)
+
+
+def assert_world(found, expected):
+    assert found is not None
+    assert tuple(found) == pytest.approx(expected, abs=1e-5)
+
+
+def test_empty_grid():
+    grid = make_grid([])
+    assert len(grid) == 0
+    assert grid.find((100, 100)) is None
+
+
+def test_geometry_without_points():
+    grid = make_grid([geometry()])
+    assert len(grid) == 0
+    assert grid.find((100, 100)) is None
+
+
+def test_nearest_point_within_radius():
+    grid = make_grid([geometry([at(50, 50), at(60, 50), at(150, 150)])])
+    assert_world(grid.find((57, 50)), at(60, 50))
+    assert_world(grid.find((52, 51)), at(50, 50))
+
+
+def test_nothing_within_radius():
+    grid = make_grid([geometry([at(50, 50)])])
+    assert grid.find((50 + SNAP_RADIUS_PX + 1, 50)) is None
+    assert grid.find((150, 150)) is None
+
+
+def test_point_in_neighbor_bucket():
+    # Cursor and point on either side of a bucket edge, in x and in y
+    edge = 2 * BUCKET
+    grid = make_grid([geometry([at(edge + 1, 50)])])
+    assert_world(grid.find((edge - 1, 50)), at(edge + 1, 50))
+
+    grid = make_grid([geometry([at(50, edge - 1)])])
+    assert_world(grid.find((50, edge + 1)), at(50, edge - 1))
+
+    # Diagonal neighbor
+    grid = make_grid([geometry([at(edge + 1, edge + 1)])])
+    assert_world(grid.find((edge - 1, edge - 1)), at(edge + 1, edge + 1))
+
+
+def test_neighbor_bucket_outside_radius():
+    edge = 2 * BUCKET
+    grid = make_grid([geometry([at(edge + BUCKET - 1, 50)])])
+    assert grid.find((edge - BUCKET + 1, 50)) is None
+
+
+def test_point_just_outside_region():
+    # Within the snap margin left of the region, still found from inside
+    grid = make_grid([geometry([at(-5, 50)])])
+    assert_world(grid.find((3, 50)), at(-5, 50))
+
+
+def test_points_outside_margin_dropped():
+    grid = make_grid([geometry([at(-SNAP_RADIUS_PX - 5, 50), at(SIZE + SNAP_RADIUS_PX + 5, 50)])])
+    assert len(grid) == 0
+
+
+def test_closest_to_viewer_on_tie():
+    grid = make_grid([geometry([(0.0, 0.0, 2.0), (0.0, 0.0, 1.0)])], perspective=DEPTH)
+    assert_world(grid.find((100, 100)), (0.0, 0.0, 1.0))
+
+
+def test_points_behind_view_dropped():
+    grid = make_grid([geometry([(0.0, 0.0, -1.0)])], perspective=DEPTH)
+    assert len(grid) == 0
+    assert grid.find((100, 100)) is None
+
+
+def test_several_geometries():
+    grid = make_grid([geometry([at(20, 20)]), geometry([at(180, 180)])])
+    assert len(grid) == 2
+    assert_world(grid.find((178, 181)), at(180, 180))
+
+
+def test_element_kinds():
+    mesh = geometry(
+        co=[at(30, 100), at(90, 100)],
+        edges=[(0, 1)],
+        centers=[at(150, 150)],
+    )
+    faces = make_grid([mesh], {SNAP_FACE_CENTER})
+    assert len(faces) == 1
+    assert faces.find((30, 100)) is None
+    assert_world(faces.find((150, 150)), at(150, 150))
+
+    midpoints = make_grid([mesh], {SNAP_EDGE_MIDPOINT})
+    assert len(midpoints) == 1
+    assert midpoints.find((30, 100)) is None
+    assert_world(midpoints.find((61, 100)), at(60, 100))
+
+    everything = make_grid([mesh], {SNAP_VERTEX, SNAP_EDGE_MIDPOINT, SNAP_FACE_CENTER})
+    assert len(everything) == 4
+    assert_world(everything.find((32, 100)), at(30, 100))